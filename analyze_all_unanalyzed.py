@@ -5,6 +5,9 @@ import json
 import time
 from pathlib import Path
 from clickbait_verifier.analyzer import GPTAnalyzer
+from clickbait_verifier.core.index import record_report_file
+from clickbait_verifier.core.jsonio import read_json
+from clickbait_verifier.core.reanalysis import needs_analysis, retire_stale
 
 def main():
     print("🚀 Analiza GPT wszystkich niezanalizowanych artykułów")
@@ -19,7 +22,9 @@ def main():
     analysis_dir = Path("reports/analysis")
     
     scraped_files = list(scraped_dir.glob("scraped_*.json"))
-    existing_analyses = {f.stem.replace('analysis_', ''): f for f in analysis_dir.glob("analysis_*.json")}
+    # analyses flagged needs_reanalysis (article revised since) do not count
+    existing_analyses = {f.stem.replace('analysis_', ''): f for f in analysis_dir.glob("analysis_*.json")
+                         if not needs_analysis(read_json(str(f)))}
     
     print(f"📊 Wszystkich scraped: {len(scraped_files)}")
     print(f"📊 Istniejących analiz: {len(existing_analyses)}")
@@ -85,9 +90,11 @@ def main():
                     # Save analysis
                     article_id = article.get('id', scraped_file.stem.replace('scraped_', ''))
                     analysis_file = analysis_dir / f"analysis_{article_id}.json"
+                    retire_stale(analysis_file)
                     
                     with open(analysis_file, 'w', encoding='utf-8') as f:
                         json.dump(result, f, ensure_ascii=False, indent=2)
+                    record_report_file(analysis_file, result)
                     
                     score = result.get('score', 0)
                     label = result.get('label', 'unknown')
@@ -7,6 +7,8 @@ import time
 from pathlib import Path
 from datetime import datetime, timezone
 from clickbait_verifier.analyzer import GPTAnalyzer
+from clickbait_verifier.core.index import record_report_file
+from clickbait_verifier.core.reanalysis import needs_analysis, retire_stale
 
 def analyze_todays_articles():
     """Analyze articles scraped today with GPT."""
@@ -34,14 +36,18 @@ def analyze_todays_articles():
     analysis_dir = Path('reports/analysis')
     analysis_dir.mkdir(exist_ok=True)
     
-    # Find existing analyses
+    # Find existing analyses (stale ones belong to revised articles)
     existing = set()
+    stale = set()
     if analysis_dir.exists():
         for f in analysis_dir.glob('analysis_*.json'):
             try:
                 with open(f, 'r', encoding='utf-8') as file:
                     data = json.load(file)
-                    existing.add(str(data.get('id')))
+                    if needs_analysis(data):
+                        stale.add(str(data.get('id')))
+                    else:
+                        existing.add(str(data.get('id')))
             except: 
                 pass
     
@@ -59,6 +65,14 @@ def analyze_todays_articles():
                 todays_files.append(file)
         except ValueError:
             pass  # Skip files with invalid timestamp format
+
+    # Older articles revised since their analysis (clickbait_verifier/revisit.py) keep their id
+    names = {f.name for f in todays_files}
+    for aid in sorted(stale - existing):
+        path = scraped_dir / f'scraped_{aid}.json'
+        if path.name not in names and path.exists():
+            todays_files.append(path)
+            names.add(path.name)
     
     to_analyze = []
     seen_titles = set()  # Track titles to avoid duplicates
@@ -116,9 +130,11 @@ def analyze_todays_articles():
                 if result:
                     # Save analysis
                     analysis_path = analysis_dir / f'analysis_{aid}.json'
+                    retire_stale(analysis_path)
                     
                     with open(analysis_path, 'w', encoding='utf-8') as f:
                         json.dump(result, f, ensure_ascii=False, indent=2)
+                    record_report_file(analysis_path, result)
                     
                     score = result.get('score', 0)
                     label = result.get('label', 'unknown')
@@ -1,19 +1,101 @@
 """
 Simple FastAPI server for Android app
 Serves analyzed articles from reports/analysis/ folder
+
+Article JSON is precomputed by the corpus index when an analysis is written
+(see clickbait_verifier/core/projections.py); handlers only splice it together.
+
+Handlers are async and never touch reports/ themselves: the article list and
+validators come from an in-memory snapshot that a background task refreshes
+(the directory scan runs in a worker thread, once per INDEX_SYNC_INTERVAL_S),
+so request concurrency is not capped by Starlette's threadpool. Reads that do
+hit the SQLite index (search, change log, uncached details) run in a worker
+thread too: the index lock may be held by a running sync.
 """
-from fastapi import FastAPI, Query
-from fastapi.middleware.cors import CORSMiddleware
-from pathlib import Path
+import asyncio
 import json
-import os
+from contextlib import asynccontextmanager
+from email.utils import formatdate, parsedate_to_datetime
 from typing import List, Dict, Any
-from datetime import datetime
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
 
-app = FastAPI(title="Clickbait Verifier API")
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+
+from clickbait_verifier.core.images import THUMB_DIR
+from clickbait_verifier.core.index import get_index
+from clickbait_verifier.core.projections import THUMB_URL_PREFIX
+
+# Rescan reports/ at most this often; polls in between only read the snapshot
+INDEX_SYNC_INTERVAL_S = 2.0
+
+# Detail JSON kept in memory per snapshot (detail rows carry full article text)
+DETAIL_CACHE_SIZE = 512
+
+
+class ArticleSnapshot:
+    """Immutable view of the indexed corpus served to request handlers"""
+
+    def __init__(self, version: str, modified_at: float, cards: List[str]):
+        self.version = version
+        self.etag = f'W/"{version}"'
+        self.last_modified = formatdate(modified_at, usegmt=True)
+        self.cards = cards
+        self.details: Dict[str, str] = {}
+
+    def detail(self, article_id: str) -> str | None:
+        """Return detail JSON, reading the index row on first access (blocking on a miss)"""
+        detail = self.details.get(article_id)
+        if detail is None:
+            detail = get_index().get_detail(article_id)
+            if detail is not None:
+                if len(self.details) >= DETAIL_CACHE_SIZE:
+                    self.details.clear()
+                self.details[article_id] = detail
+        return detail
+
+
+_snapshot: ArticleSnapshot | None = None
+
+
+def refresh_snapshot() -> ArticleSnapshot:
+    """Sync the index with reports/ and rebuild the snapshot if the corpus changed (blocking)"""
+    global _snapshot
+    index = get_index()
+    index.sync()
+    version, modified_at = index.version()
+    if _snapshot is None or _snapshot.version != version:
+        _snapshot = ArticleSnapshot(version, modified_at, index.list_cards(limit=None))
+    return _snapshot
+
+
+def current_snapshot() -> ArticleSnapshot:
+    """Return the latest snapshot (built synchronously only before the refresher has run)"""
+    return _snapshot or refresh_snapshot()
+
+
+async def refresh_snapshot_periodically():
+    while True:
+        try:
+            await asyncio.to_thread(refresh_snapshot)
+        except Exception as e:
+            print(f"Error refreshing article index: {e}")
+        await asyncio.sleep(INDEX_SYNC_INTERVAL_S)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(refresh_snapshot)
+    task = asyncio.create_task(refresh_snapshot_periodically())
+    try:
+        yield
+    finally:
+        task.cancel()
+
+
+app = FastAPI(title="Clickbait Verifier API", lifespan=lifespan)
 
 # Enable CORS for Android emulator
 app.add_middleware(
@@ -22,198 +104,143 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified"],
 )
 
-def fetch_image_from_url(url: str) -> str | None:
-    """Try to retrieve image URL from page meta tags (og:image, twitter:image)"""
-    try:
-        headers = {"User-Agent": "Mozilla/5.0 (compatible)"}
-        resp = requests.get(url, headers=headers, timeout=6)
-        if resp.status_code != 200:
-            return None
-        soup = BeautifulSoup(resp.text, "lxml")
-        # Try common meta tags
-        meta_props = ["og:image", "twitter:image", "image", "og:image:url"]
-        for prop in meta_props:
-            m = soup.find("meta", property=prop) or soup.find("meta", attrs={"name": prop})
-            if m:
-                val = m.get("content") or m.get("value")
-                if val:
-                    return urljoin(resp.url, val)
-        return None
-    except Exception as e:
-        print(f"Error fetching image from {url}: {e}")
-        return None
-
-def load_analysis_files(limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
-    """Load analysis JSON files from reports/analysis/ directory"""
-    analysis_dir = Path("reports/analysis")
-    
-    if not analysis_dir.exists():
-        return []
-    
-    articles = []
-    
-    # Get all JSON files sorted by modification time (newest first)
-    # Filter out duplicates (files with _1, _2, etc. suffix)
-    all_files = analysis_dir.glob("analysis_*.json")
-    filtered_files = [f for f in all_files if not any(f.stem.endswith(f"_{i}") for i in range(1, 100))]
-    json_files = sorted(
-        filtered_files,
-        key=lambda x: x.stat().st_mtime,
-        reverse=True
-    )
-
-    # apply offset and limit (limit==0 => return all starting from offset)
-    if limit and limit > 0:
-        json_files = json_files[offset: offset + limit]
-    else:
-        json_files = json_files[offset:]
-    
-    for json_file in json_files:
+# Locally generated article thumbnails (see "thumbnailUrl" in article JSON)
+app.mount(THUMB_URL_PREFIX.rstrip("/"), StaticFiles(directory=THUMB_DIR, check_dir=False), name="thumbs")
+
+# Compress JSON payloads (article lists with content snippets compress ~5x)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: str) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the current validators"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # weak comparison: ignore W/ prefixes on both sides
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                # Extract relevant fields - use 'score' field from JSON
-                score = float(data.get("score", data.get("clickbait_score", 0)))
-                suggestions = data.get("suggestions", {})
-                article_id = json_file.stem.replace("analysis_", "")
-                article_url = data.get("url", "")
-                
-                # Try to load image from scraped file
-                image_url = None
-                # First try by ID
-                scraped_file = Path(f"reports/scraped/scraped_{article_id}.json")
-                if not scraped_file.exists() and article_url:
-                    # If not found by ID, search by URL
-                    scraped_dir = Path("reports/scraped")
-                    for scraped_path in scraped_dir.glob("scraped_*.json"):
-                        try:
-                            with open(scraped_path, 'r', encoding='utf-8') as sf:
-                                scraped_data = json.load(sf)
-                                if scraped_data.get('url') == article_url:
-                                    scraped_file = scraped_path
-                                    break
-                        except Exception:
-                            continue
-                
-                if scraped_file.exists():
-                    try:
-                        with open(scraped_file, 'r', encoding='utf-8') as sf:
-                            scraped_data = json.load(sf)
-                            # Check for image_url field first (new format)
-                            image_url = scraped_data.get('image_url') or scraped_data.get('lead_image_url') or scraped_data.get('image')
-                            # Fallback to meta tags
-                            if not image_url:
-                                meta = scraped_data.get('meta', {})
-                                if isinstance(meta, dict):
-                                    image_url = meta.get('og:image') or meta.get('twitter:image')
-                    except Exception:
-                        pass
-                
-                # Fallback to placeholder (don't fetch from URL - too slow!)
-                if not image_url:
-                    source_name = data.get("source", "nieznane").lower()
-                    image_url = f"https://via.placeholder.com/400x250/5E35B1/FFFFFF?text={source_name.upper()}"
-                
-                article = {
-                    "id": article_id,
-                    "title": data.get("title", "Brak tytułu"),
-                    "url": data.get("url", ""),
-                    "source": data.get("source", "nieznane"),
-                    "imageUrl": image_url,
-                    "publishedAt": data.get("published", data.get("date", "")),
-                    "content": data.get("content", "")[:500] + "...",  # First 500 chars
-                    "analysis": {
-                        "clickbaitScore": score,
-                        "hasClickbait": score > 50,
-                        "emotionalTone": data.get("emotional_tone", "neutral"),
-                        "sensationalism": data.get("sensationalism_level", data.get("label", "low")),
-                        "summary": data.get("summary", data.get("content", "")[:200] + "..."),  # Short article summary
-                        "reasoning": "\n".join(data.get("rationale_user_friendly", data.get("rationale", ["Brak uzasadnienia"]))),
-                        "manipulationTechniques": data.get("manipulation_techniques", data.get("signals", {}).get("title_hits", [])),
-                        "factualBasis": data.get("factual_basis", "nieznana"),
-                        "suggestedTitle": suggestions.get("rewrite_title_neutral", None)
-                    }
-                }
-                articles.append(article)
-        except Exception as e:
-            print(f"Error loading {json_file}: {e}")
-            continue
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def conditional_json(request: Request, snapshot: ArticleSnapshot, build_payload, blocking: bool = False) -> Response:
+    """Return 304 when the client copy is current, otherwise the JSON payload with validators
     
-    return articles
+    build_payload may return a dict or an already serialized JSON string. With
+    blocking=True it reads the index and is run in a worker thread.
+    """
+    etag, last_modified = snapshot.etag, snapshot.last_modified
+    headers = {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": "no-cache"}
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    payload = await asyncio.to_thread(build_payload) if blocking else build_payload()
+    if isinstance(payload, str):
+        return Response(content=payload, media_type="application/json", headers=headers)
+    return JSONResponse(payload, headers=headers)
+
+
+def articles_json(fields: Dict[str, Any], articles: List[str]) -> str:
+    """Serialize fields plus an "articles" array spliced from precomputed JSON strings"""
+    head = json.dumps(fields, ensure_ascii=False)[:-1]
+    sep = ", " if fields else ""
+    return f'{head}{sep}"articles": [{", ".join(articles)}]}}'
 
 @app.get("/")
-def read_root():
+async def read_root():
     """Health check endpoint"""
     return {
         "status": "ok",
         "message": "Clickbait Verifier API is running",
         "endpoints": [
             "/api/articles",
-            "/api/articles/{article_id}"
+            "/api/articles/changes?since=<cursor>",
+            "/api/articles/{article_id}",
+            "/api/search?q=..."
         ]
     }
 
 @app.get("/api/articles")
-def get_articles(limit: int = Query(default=50, ge=0, le=200), offset: int = Query(default=0, ge=0)):
+async def get_articles(request: Request, limit: int = Query(default=50, ge=0, le=200), offset: int = Query(default=0, ge=0)):
     """
     Get list of analyzed articles
     
     Parameters:
     - limit: Maximum number of articles to return (1-200)
+    
+    Responses carry a weak ETag derived from the index version; send it back in
+    If-None-Match to get an empty 304 when nothing changed.
     """
-    articles = load_analysis_files(limit=limit, offset=offset)
+    snapshot = current_snapshot()
     
-    return {
-        "articles": articles,
-        "total": len(articles),
-        "limit": limit
-    }
+    def build_payload():
+        articles = snapshot.cards[offset:offset + limit] if limit else snapshot.cards[offset:]
+        return articles_json({"total": len(articles), "limit": limit}, articles)
+    
+    return await conditional_json(request, snapshot, build_payload)
+
+@app.get("/api/search")
+async def search_articles(request: Request, q: str = Query(..., min_length=1), limit: int = Query(default=20, ge=1, le=100), offset: int = Query(default=0, ge=0)):
+    """
+    Full-text search over title, content and analysis summary
+    
+    Parameters:
+    - q: Search query (diacritics optional, e.g. "lodz" matches "Łódź")
+    - limit: Maximum number of articles to return (1-100)
+    - offset: Number of hits to skip
+    """
+    def build_payload():
+        index = get_index()
+        hits = index.search(q, limit=limit, offset=offset, analyzed_only=True)
+        articles = index.get_cards([hit["id"] for hit in hits])
+        return articles_json({"query": q, "total": len(articles), "limit": limit}, articles)
+    
+    return await conditional_json(request, current_snapshot(), build_payload, blocking=True)
+
+@app.get("/api/articles/changes")
+async def get_article_changes(request: Request, since: str | None = Query(default=None), limit: int = Query(default=100, ge=1, le=500)):
+    """
+    Delta sync: articles added or re-analysed after a cursor, plus tombstones
+    
+    Parameters:
+    - since: Cursor returned by the previous call (omit for a full initial sync)
+    - limit: Maximum number of change-log entries to return (1-500)
+    
+    If "reset" is true the cursor was unknown (e.g. the server index was
+    rebuilt) and the client should drop its local copy before applying the
+    result. Keep calling with the returned cursor while "hasMore" is true.
+    """
+    def build_payload():
+        index = get_index()
+        changes = index.changes_since(since, limit=limit)
+        articles = index.get_cards(changes["upserts"])
+        return articles_json({
+            "cursor": changes["cursor"],
+            "reset": changes["reset"],
+            "hasMore": changes["has_more"],
+            "deleted": changes["deletes"]
+        }, articles)
+    
+    return await conditional_json(request, current_snapshot(), build_payload, blocking=True)
 
 @app.get("/api/articles/{article_id}")
-def get_article(article_id: str):
+async def get_article(request: Request, article_id: str):
     """Get single article by ID"""
-    analysis_file = Path(f"reports/analysis/analysis_{article_id}.json")
+    snapshot = current_snapshot()
+    detail = snapshot.details.get(article_id)
+    if detail is None:
+        detail = await asyncio.to_thread(snapshot.detail, article_id)
     
-    if not analysis_file.exists():
+    if detail is None:
         return {"error": "Article not found"}, 404
     
-    try:
-        with open(analysis_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        score = float(data.get("score", data.get("clickbait_score", 0)))
-        suggestions = data.get("suggestions", {})
-        
-        # Generate placeholder image based on source
-        source_name = data.get("source", "nieznane").lower()
-        placeholder_url = f"https://via.placeholder.com/400x250/5E35B1/FFFFFF?text={source_name.upper()}"
-            
-        return {
-            "id": article_id,
-            "title": data.get("title", "Brak tytułu"),
-            "url": data.get("url", ""),
-            "source": data.get("source", "nieznane"),
-            "imageUrl": data.get("image_url", placeholder_url),
-            "publishedAt": data.get("published", data.get("date", "")),
-            "content": data.get("content", ""),
-            "analysis": {
-                "clickbaitScore": score,
-                "hasClickbait": score > 50,
-                "emotionalTone": data.get("emotional_tone", "neutral"),
-                "sensationalism": data.get("sensationalism_level", data.get("label", "low")),
-                "summary": data.get("summary", "\n".join(data.get("rationale_user_friendly", ["Brak podsumowania"]))),
-                "reasoning": "\n".join(data.get("rationale", data.get("reasoning", ["Brak uzasadnienia"]))),
-                "manipulationTechniques": data.get("manipulation_techniques", data.get("signals", {}).get("title_hits", [])),
-                "factualBasis": data.get("factual_basis", "nieznana"),
-                "suggestedTitle": suggestions.get("rewrite_title_neutral", None),
-                # editorNotes intentionally omitted from list response
-            }
-        }
-    except Exception as e:
-        return {"error": str(e)}, 500
+    return await conditional_json(request, snapshot, lambda: detail)
 
 if __name__ == "__main__":
     import uvicorn
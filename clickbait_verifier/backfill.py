@@ -0,0 +1,266 @@
+"""Parallel metadata backfill for scraped articles.
+
+A backfill job fills missing fields (see BACKFILL_FIELDS) in
+reports/scraped/scraped_<id>.json from the article page:
+
+- pages are loaded with bounded concurrency (thread pool, fixed in-flight window);
+- updates are written to the store in batches: changed files are rewritten
+  atomically and re-indexed in one corpus-index transaction per batch;
+- every processed id is appended to a checkpoint file once its batch is
+  durable, so an interrupted job resumes where it stopped.
+
+The HTML source is pluggable (`html_loader`); the default reads the raw HTML
+archive (core/archive.py) and only fetches pages that are not archived.
+
+Usage (CLI wrapper): python scripts/backfill_metadata.py --fields image_url,published
+"""
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from .content_extractor import load_extractor_for_source
+from .core.archive import HtmlArchive, archive_response, get_archive
+from .core.fetcher import BROWSER_HEADERS, decode_html, fetch_bytes, header_value
+from .core.index import REPORTS_DIR, article_id_from_path, get_index
+from .core.jsonio import write_json_atomic
+from .scraper import _format_datetime_for_json, extract_content_and_title
+
+BACKFILL_FIELDS = ('image_url', 'published', 'site_name', 'summary')
+# fields found in <head> meta tags; jobs limited to these fetch only the head
+HEAD_FIELDS = ('image_url', 'site_name', 'summary')
+
+# meta tags tried in order for the fields that do not need the full extractor
+_META_FIELDS = {
+    'site_name': ('og:site_name', 'application-name'),
+    'summary': ('og:description', 'description', 'twitter:description'),
+}
+
+def extract_metadata(html: str, source: Optional[str], fields: Iterable[str]) -> Dict[str, Optional[str]]:
+    """Extract the requested BACKFILL_FIELDS from article HTML.
+
+    image_url/published use the same extractor as the scraper; site_name and
+    summary come from meta tags.
+    """
+    fields = set(fields)
+    result: Dict[str, Optional[str]] = {}
+    if fields & {'image_url', 'published'}:
+        extractor = load_extractor_for_source(source) if source else None
+        _, _, published, image_url = extract_content_and_title(html, extractor)
+        result['image_url'] = image_url
+        result['published'] = _format_datetime_for_json(published)
+    if fields & set(_META_FIELDS):
+        soup = BeautifulSoup(html, 'lxml')
+        for field, keys in _META_FIELDS.items():
+            if field not in fields:
+                continue
+            for key in keys:
+                m = soup.find('meta', property=key) or soup.find('meta', attrs={'name': key})
+                if m and m.get('content') and m.get('content').strip():
+                    result[field] = m.get('content').strip()
+                    break
+    return {f: result.get(f) for f in fields}
+
+
+def fetch_article_html(url: str, record: dict, archive: Optional[HtmlArchive] = None,
+                       revalidate: bool = False, head_only: bool = False) -> Optional[str]:
+    """Default html_loader: archived page when available, otherwise a GET.
+
+    With `revalidate`, an archived page is re-checked with a conditional GET
+    (If-None-Match / If-Modified-Since from the stored headers) and reused on
+    304. With `head_only`, fetches stop after </head> (enough for meta-tag
+    fields); such partial pages are not archived. Fetches use plain requests
+    (no Playwright; this runs on worker threads); full responses are archived
+    when archiving is enabled.
+    """
+    page = archive.get(url) if archive is not None else None
+    if page is not None and not revalidate:
+        return page.html
+    headers = dict(BROWSER_HEADERS)
+    if page is not None:
+        etag = header_value(page['headers'], 'ETag')
+        modified = header_value(page['headers'], 'Last-Modified')
+        if etag:
+            headers['If-None-Match'] = etag
+        if modified:
+            headers['If-Modified-Since'] = modified
+    r, body, complete = fetch_bytes(url, headers=headers, timeout=10, head_only=head_only)
+    if r.status_code == 304 and page is not None:
+        return page.html
+    r.raise_for_status()
+    html, enc = decode_html(body, r.headers.get('Content-Type'), r.url)
+    if complete:
+        archive_response(url, body, headers=r.headers, status=r.status_code, encoding=enc, archive=archive)
+    return html
+
+
+class BackfillJob:
+    """Fill missing metadata fields across reports/scraped in parallel, resumably."""
+
+    def __init__(self, fields: Iterable[str], reports_dir: Optional[str] = None, workers: int = 8,
+                 batch_size: int = 50, overwrite: bool = False, name: str = 'metadata',
+                 html_loader: Optional[Callable[[str, dict], Optional[str]]] = None,
+                 revalidate: bool = False):
+        """
+        Args:
+            fields: Subset of BACKFILL_FIELDS to fill.
+            reports_dir: Reports directory (default: repository reports/).
+            workers: Maximum number of pages loaded concurrently.
+            batch_size: Number of processed articles per store write/checkpoint.
+            overwrite: Replace existing values instead of only filling missing ones.
+            name: Job name; selects the checkpoint file reports/backfill/<name>.jsonl.
+            html_loader: Callable (url, record) -> html; defaults to fetch_article_html
+                over the reports directory's HTML archive.
+            revalidate: Re-check archived pages with conditional GETs (default loader only).
+        """
+        self.fields = [f for f in fields]
+        unknown = set(self.fields) - set(BACKFILL_FIELDS)
+        if unknown or not self.fields:
+            raise ValueError(f"fields must be a non-empty subset of {BACKFILL_FIELDS}, got {self.fields}")
+        self.reports_dir = os.path.abspath(reports_dir or REPORTS_DIR)
+        self.scraped_dir = os.path.join(self.reports_dir, 'scraped')
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.overwrite = overwrite
+        if html_loader is None:
+            archive = get_archive(self.reports_dir)
+            head_only = set(self.fields) <= set(HEAD_FIELDS)
+            html_loader = lambda url, record: fetch_article_html(url, record, archive, revalidate, head_only)
+        self.html_loader = html_loader
+        self.checkpoint_path = os.path.join(self.reports_dir, 'backfill', f'{name}.jsonl')
+
+    # -- checkpoint ------------------------------------------------------------
+
+    def load_checkpoint(self, retry_failed: bool = False) -> Dict[str, str]:
+        """Return {article_id: status} for ids already processed by this job."""
+        done: Dict[str, str] = {}
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line after a crash
+                    done[str(entry.get('id'))] = entry.get('status')
+        except FileNotFoundError:
+            pass
+        if retry_failed:
+            done = {k: v for k, v in done.items() if v != 'failed'}
+        return done
+
+    def reset_checkpoint(self):
+        try:
+            os.remove(self.checkpoint_path)
+        except FileNotFoundError:
+            pass
+
+    def _append_checkpoint(self, entries: List[Tuple[str, str]]):
+        os.makedirs(os.path.dirname(self.checkpoint_path), exist_ok=True)
+        with open(self.checkpoint_path, 'a', encoding='utf-8') as f:
+            for article_id, status in entries:
+                f.write(json.dumps({'id': article_id, 'status': status}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    # -- selection -------------------------------------------------------------
+
+    def candidates(self, limit: Optional[int] = None, retry_failed: bool = False) -> List[Tuple[str, dict]]:
+        """Scraped files (newest first) that lack a requested field and are not checkpointed."""
+        done = self.load_checkpoint(retry_failed)
+        try:
+            entries = [e for e in os.scandir(self.scraped_dir) if article_id_from_path(e.name)[0] == 'scraped']
+        except FileNotFoundError:
+            return []
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        todo = []
+        for e in entries:
+            _, article_id = article_id_from_path(e.name)
+            if article_id in done:
+                continue
+            try:
+                with open(e.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception:
+                continue
+            if not data.get('url'):
+                continue
+            if not self.overwrite and all(data.get(field) for field in self.fields):
+                continue
+            todo.append((e.path, data))
+            if limit and len(todo) >= limit:
+                break
+        return todo
+
+    # -- run -------------------------------------------------------------------
+
+    def _process(self, path: str, data: dict) -> Dict[str, str]:
+        html = self.html_loader(data['url'], data)
+        if not html:
+            return {}
+        found = extract_metadata(html, data.get('source'), self.fields)
+        return {
+            field: value for field, value in found.items()
+            if value and data.get(field) != value and (self.overwrite or not data.get(field))
+        }
+
+    def _flush(self, updated: List[Tuple[str, dict]], processed: List[Tuple[str, str]]):
+        for path, data in updated:
+            write_json_atomic(path, data)
+        if updated:
+            get_index(self.reports_dir).index_files(updated)
+        self._append_checkpoint(processed)
+        updated.clear()
+        processed.clear()
+
+    def run(self, limit: Optional[int] = None, retry_failed: bool = False,
+            progress: Optional[Callable[[str], None]] = print) -> Dict[str, int]:
+        """Process all candidates; returns counts per status (updated/unchanged/failed)."""
+        todo = self.candidates(limit, retry_failed)
+        stats = {'total': len(todo), 'updated': 0, 'unchanged': 0, 'failed': 0}
+        if progress:
+            progress(f"Backfill {','.join(self.fields)}: {len(todo)} articles, {self.workers} workers")
+        updated: List[Tuple[str, dict]] = []
+        processed: List[Tuple[str, str]] = []
+        pending = {}
+        queue = iter(todo)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='backfill') as ex:
+            try:
+                while True:
+                    # keep a bounded window of in-flight pages
+                    while len(pending) < self.workers * 2:
+                        item = next(queue, None)
+                        if item is None:
+                            break
+                        pending[ex.submit(self._process, *item)] = item
+                    if not pending:
+                        break
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        path, data = pending.pop(fut)
+                        _, article_id = article_id_from_path(path)
+                        try:
+                            changes = fut.result()
+                        except Exception as e:
+                            status = 'failed'
+                            if progress:
+                                progress(f"[FAIL] {os.path.basename(path)}: {e}")
+                        else:
+                            status = 'updated' if changes else 'unchanged'
+                            if changes:
+                                data.update(changes)
+                                updated.append((path, data))
+                        stats[status] += 1
+                        processed.append((article_id, status))
+                    if len(processed) >= self.batch_size:
+                        self._flush(updated, processed)
+                        if progress:
+                            done = stats['updated'] + stats['unchanged'] + stats['failed']
+                            progress(f"  {done}/{stats['total']} (updated {stats['updated']}, failed {stats['failed']})")
+            finally:
+                # on interruption drop queued work; finished results are still saved
+                for fut in pending:
+                    fut.cancel()
+                self._flush(updated, processed)
+        return stats
@@ -0,0 +1,315 @@
+"""Compressed archive of raw fetched pages (optional).
+
+Only extracted text ends up in reports/scraped, so improving the extractor
+used to mean re-fetching every page. When archiving is enabled
+(CLICKBAIT_ARCHIVE_HTML=1) the scraper also stores each fetched response here,
+and re-extraction, backfills and extraction benchmarks can run offline.
+
+Layout under reports/archive/:
+
+- ``seg-<timestamp>-<pid>.bin``: append-only segment files, one writer process
+  per segment, rolled over at SEGMENT_MAX_BYTES. Each record is
+  ``MAGIC | u32 header length | u32 body length | header JSON | body`` where the
+  header holds url, fetched_at, status, response headers, the charset used to
+  decode the body and the codec of the compressed body.
+- ``index.sqlite3``: offset index (url hash -> segment, offset, length plus the
+  header fields). The newest record for a URL wins. The index is derived data:
+  `rebuild_index()` recreates it by scanning the segments.
+
+Bodies are compressed with zstandard when installed, zlib otherwise; the codec
+is stored per record so archives written with either stay readable.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+import zlib
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # zlib fallback
+    zstandard = None
+
+from .index import REPORTS_DIR
+
+ARCHIVE_DIRNAME = 'archive'
+INDEX_FILENAME = 'index.sqlite3'
+SEGMENT_MAX_BYTES = 256 * 1024 * 1024
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 6
+# Set to '1' to archive every page fetched by the scraper
+ARCHIVE_ENV = 'CLICKBAIT_ARCHIVE_HTML'
+
+_MAGIC = b'CBA1'
+_PREFIX = struct.Struct('>4sII')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    fetched_at TEXT,
+    status INTEGER,
+    headers TEXT,
+    encoding TEXT
+);
+"""
+
+
+def archive_enabled() -> bool:
+    """True when the scraper should archive fetched pages."""
+    return os.environ.get(ARCHIVE_ENV, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def _compress(body: bytes):
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    return 'zlib', zlib.compress(body, ZLIB_LEVEL)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError('Archive record is zstd-compressed; install zstandard to read it')
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == 'none':
+        return data
+    raise ValueError(f'Unknown archive codec: {codec}')
+
+
+class ArchivedPage(dict):
+    """A stored response: url, fetched_at, status, headers, encoding, body (bytes).
+
+    `html` decodes the body with the charset the fetcher used.
+    """
+
+    @property
+    def html(self) -> str:
+        return self['body'].decode(self.get('encoding') or 'utf-8', errors='replace')
+
+
+def read_record(path: str, offset: int, length: int) -> ArchivedPage:
+    """Read and decode one record from a segment file."""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        raw = f.read(length)
+    magic, header_len, body_len = _PREFIX.unpack_from(raw)
+    if magic != _MAGIC or _PREFIX.size + header_len + body_len != len(raw):
+        raise ValueError(f'Corrupt archive record at {os.path.basename(path)}:{offset}')
+    header = json.loads(raw[_PREFIX.size:_PREFIX.size + header_len].decode('utf-8'))
+    body = _decompress(header.pop('codec', 'none'), raw[_PREFIX.size + header_len:])
+    return ArchivedPage(header, body=body)
+
+
+class HtmlArchive:
+    """Append-only, compressed store of raw page responses keyed by URL hash."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.normpath(root or os.path.join(REPORTS_DIR, ARCHIVE_DIRNAME))
+        self.index_path = os.path.join(self.root, INDEX_FILENAME)
+        self._lock = threading.RLock()
+        self._conn = None
+        self._segment = None
+        self._segment_size = 0
+
+    # -- index -------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.root, exist_ok=True)
+            conn = sqlite3.connect(self.index_path, check_same_thread=False, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def segments(self) -> List[str]:
+        """Segment file names, oldest first."""
+        try:
+            return sorted(n for n in os.listdir(self.root) if n.startswith('seg-') and n.endswith('.bin'))
+        except FileNotFoundError:
+            return []
+
+    def rebuild_index(self) -> int:
+        """Recreate the offset index by scanning all segments; returns the page count."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute('DELETE FROM pages')
+            for name in self.segments():
+                path = os.path.join(self.root, name)
+                with open(path, 'rb') as f:
+                    offset = 0
+                    while True:
+                        prefix = f.read(_PREFIX.size)
+                        if len(prefix) < _PREFIX.size:
+                            break  # end of segment (or a torn final write)
+                        magic, header_len, body_len = _PREFIX.unpack(prefix)
+                        if magic != _MAGIC:
+                            break
+                        header_raw = f.read(header_len)
+                        if len(header_raw) < header_len:
+                            break
+                        f.seek(body_len, os.SEEK_CUR)
+                        length = _PREFIX.size + header_len + body_len
+                        if offset + length > os.path.getsize(path):
+                            break
+                        self._index_record(conn, json.loads(header_raw.decode('utf-8')), name, offset, length)
+                        offset += length
+            conn.commit()
+            return conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+
+    @staticmethod
+    def _index_record(conn, header: Dict, segment: str, offset: int, length: int):
+        conn.execute(
+            'INSERT OR REPLACE INTO pages(url_hash, url, segment, offset, length, fetched_at, status, headers, encoding) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (url_hash(header['url']), header['url'], segment, offset, length, header.get('fetched_at'),
+             header.get('status'), json.dumps(header.get('headers') or {}, ensure_ascii=False), header.get('encoding')),
+        )
+
+    # -- write -------------------------------------------------------------------
+
+    def _open_segment(self, needed: int):
+        if self._segment is not None and self._segment_size + needed > SEGMENT_MAX_BYTES:
+            self._segment.close()
+            self._segment = None
+        if self._segment is None:
+            os.makedirs(self.root, exist_ok=True)
+            name = f"seg-{datetime.now().strftime('%Y%m%d%H%M%S')}-{os.getpid()}.bin"
+            self._segment = open(os.path.join(self.root, name), 'ab')
+            self._segment_size = self._segment.tell()
+        return self._segment
+
+    def put(self, url: str, body, headers: Optional[Dict] = None, status: int = 200,
+            encoding: Optional[str] = None, fetched_at: Optional[str] = None):
+        """Store a response for `url` (replaces the previous version in the index).
+
+        Args:
+            url: Requested URL (archive key).
+            body: Raw response bytes, or already-decoded HTML (stored as UTF-8).
+            headers: Response headers (ETag/Last-Modified enable conditional fetches).
+            status: HTTP status code.
+            encoding: Charset the fetcher used to decode `body`.
+            fetched_at: ISO timestamp (default: now).
+        """
+        if isinstance(body, str):
+            body, encoding = body.encode('utf-8'), 'utf-8'
+        codec, data = _compress(body)
+        header = {
+            'url': url,
+            'fetched_at': fetched_at or datetime.now().isoformat(),
+            'status': status,
+            'headers': dict(headers or {}),
+            'encoding': encoding,
+            'codec': codec,
+        }
+        header_raw = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        record = _PREFIX.pack(_MAGIC, len(header_raw), len(data)) + header_raw + data
+        with self._lock:
+            f = self._open_segment(len(record))
+            offset = self._segment_size
+            f.write(record)
+            f.flush()
+            self._segment_size += len(record)
+            conn = self._connect()
+            self._index_record(conn, header, os.path.basename(f.name), offset, len(record))
+            conn.commit()
+
+    # -- read --------------------------------------------------------------------
+
+    def _entry(self, url: str) -> Optional[sqlite3.Row]:
+        with self._lock:
+            if self._conn is None and not os.path.exists(self.index_path):
+                return None  # nothing archived yet; do not create the directory
+            return self._connect().execute('SELECT * FROM pages WHERE url_hash = ?', (url_hash(url),)).fetchone()
+
+    def __contains__(self, url: str) -> bool:
+        return self._entry(url) is not None
+
+    def get(self, url: str) -> Optional[ArchivedPage]:
+        """Return the newest stored response for `url`, or None."""
+        row = self._entry(url)
+        if row is None:
+            return None
+        try:
+            return read_record(os.path.join(self.root, row['segment']), row['offset'], row['length'])
+        except (OSError, ValueError):
+            return None
+
+    def headers(self, url: str) -> Optional[Dict]:
+        """Stored response headers for `url` without reading the body."""
+        row = self._entry(url)
+        return json.loads(row['headers'] or '{}') if row else None
+
+    def entries(self) -> List[Dict]:
+        """Index rows (url, segment, offset, length, ...) in on-disk order.
+
+        Pass them to `read_record()` to read pages from worker processes
+        without sharing the archive object.
+        """
+        with self._lock:
+            rows = self._connect().execute('SELECT * FROM pages ORDER BY segment, offset').fetchall()
+        return [
+            dict(r, path=os.path.join(self.root, r['segment']), headers=json.loads(r['headers'] or '{}'))
+            for r in rows
+        ]
+
+    def iter_pages(self) -> Iterator[ArchivedPage]:
+        """Yield every archived page (newest version per URL) in on-disk order."""
+        for e in self.entries():
+            try:
+                yield read_record(e['path'], e['offset'], e['length'])
+            except (OSError, ValueError):
+                continue
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+
+
+_archives: Dict[str, HtmlArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(reports_dir: Optional[str] = None) -> HtmlArchive:
+    """Return the shared HtmlArchive of a reports directory."""
+    key = os.path.normpath(os.path.abspath(os.path.join(reports_dir or REPORTS_DIR, ARCHIVE_DIRNAME)))
+    with _archives_lock:
+        archive = _archives.get(key)
+        if archive is None:
+            archive = _archives[key] = HtmlArchive(key)
+        return archive
+
+
+def archive_response(url: str, body, headers: Optional[Dict] = None, status: int = 200,
+                     encoding: Optional[str] = None, archive: Optional[HtmlArchive] = None):
+    """Archive a fetched page if archiving is enabled.
+
+    Best-effort, like `record_report_file`: archive errors never fail a fetch.
+    """
+    if not archive_enabled():
+        return
+    try:
+        (archive if archive is not None else get_archive()).put(url, body, headers=headers, status=status, encoding=encoding)
+    except Exception as e:
+        print(f"HTML archive: could not store {url}: {e}")
@@ -0,0 +1,69 @@
+"""Persistent crawler state (reports/crawl.sqlite3).
+
+Things the scraper learns about hosts and URLs between runs - which fetch
+method works per host, and similar per-host policy - live in one small SQLite
+file next to the reports. Unlike the corpus index this is not derived from
+reports/, but losing it only costs re-learning: every table is a cache or a
+statistic, so the file can be deleted at any time.
+
+Feature modules keep their own tables and create them with `ensure_schema`.
+"""
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+from .index import REPORTS_DIR
+
+DB_FILENAME = 'crawl.sqlite3'
+
+
+class CrawlState:
+    """Shared, thread-safe SQLite connection for crawler state tables."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.lock = threading.RLock()
+        self._conn = None
+        self._schemas = set()
+
+    def connect(self) -> sqlite3.Connection:
+        with self.lock:
+            if self._conn is None:
+                os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+                conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+                conn.row_factory = sqlite3.Row
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                self._conn = conn
+            return self._conn
+
+    def ensure_schema(self, schema: str) -> sqlite3.Connection:
+        """Create a feature module's tables (once per process) and return the connection."""
+        conn = self.connect()
+        with self.lock:
+            if schema not in self._schemas:
+                conn.executescript(schema)
+                self._schemas.add(schema)
+        return conn
+
+    def close(self):
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._schemas.clear()
+
+
+_states: Dict[str, CrawlState] = {}
+_states_lock = threading.Lock()
+
+
+def get_crawl_state(reports_dir: Optional[str] = None) -> CrawlState:
+    """Return the shared CrawlState of a reports directory."""
+    path = os.path.normpath(os.path.abspath(os.path.join(reports_dir or REPORTS_DIR, DB_FILENAME)))
+    with _states_lock:
+        state = _states.get(path)
+        if state is None:
+            state = _states[path] = CrawlState(path)
+        return state
@@ -0,0 +1,57 @@
+"""Wall-clock budgets for a block of crawling work.
+
+`with deadline(seconds):` sets a per-thread deadline. The fetch layer reads it:
+request timeouts are capped to the time left, politeness waits that would
+overrun it and requests started after it raise DeadlineExceeded. Work still
+outstanding when the budget runs out is therefore cancelled instead of
+stalling the rest of the run.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the current thread's deadline has passed."""
+
+
+_local = threading.local()
+
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """Run the block with a budget of `seconds` (None or <= 0: no budget; nested budgets only shrink)."""
+    previous = getattr(_local, 'at', None)
+    at = time.monotonic() + seconds if seconds and seconds > 0 else None
+    _local.at = min(a for a in (previous, at) if a is not None) if (previous or at) else None
+    try:
+        yield
+    finally:
+        _local.at = previous
+
+
+def remaining() -> Optional[float]:
+    """Seconds left on the current thread's deadline, or None without one."""
+    at = getattr(_local, 'at', None)
+    return None if at is None else at - time.monotonic()
+
+
+def check():
+    """Raise DeadlineExceeded if the current deadline has passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded('source time budget exhausted')
+
+
+def cap_timeout(timeout: float) -> float:
+    """`timeout` limited to the time left (raises DeadlineExceeded when none is left)."""
+    check()
+    left = remaining()
+    return timeout if left is None else max(0.1, min(timeout, left))
+
+
+def timed_out(timeout: float, capped: float, error: Exception):
+    """Re-raise a timeout `error` as DeadlineExceeded when it only fired because `cap_timeout` shortened it."""
+    if capped < timeout:
+        raise DeadlineExceeded('source time budget exhausted') from error
@@ -0,0 +1,170 @@
+"""Adaptive fetch-method selection per host for `fetch_method: auto`.
+
+Plain `auto` always tried requests first and fell back to Playwright, so a
+JS-only source paid a wasted HTTP round trip before every render. This module
+keeps per-host, per-method statistics (success rate, extracted content length,
+latency - exponentially weighted) in the crawl state database and picks the
+method that has been working for the host:
+
+- a host starts on requests. Short pages and empty extractions count as
+  failures. Once requests has at least MIN_ATTEMPTS outcomes and its success
+  rate drops below GOOD_SUCCESS_RATE, the host switches to Playwright, if
+  available;
+- a host on Playwright re-probes requests every REPROBE_EVERY fetches or
+  REPROBE_AFTER_S seconds and switches back when the probe succeeds.
+
+Every switch is printed with its reason.
+"""
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .crawl_state import CrawlState, get_crawl_state
+
+METHODS = ('requests', 'playwright')
+EWMA_ALPHA = 0.3
+GOOD_SUCCESS_RATE = 0.6
+# Outcomes needed before a host is switched away from requests
+MIN_ATTEMPTS = 3
+# Extracted article text shorter than this counts as a failed fetch
+MIN_CONTENT_CHARS = 200
+REPROBE_EVERY = 20
+REPROBE_AFTER_S = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fetch_method_stats (
+    host TEXT NOT NULL,
+    method TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    success_rate REAL NOT NULL,
+    content_chars REAL,
+    latency_s REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (host, method)
+);
+CREATE TABLE IF NOT EXISTS fetch_method_choice (
+    host TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    since_probe INTEGER NOT NULL DEFAULT 0,
+    probed_at REAL NOT NULL,
+    reason TEXT
+);
+"""
+
+
+def host_of(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _ewma(old: Optional[float], new: Optional[float]) -> Optional[float]:
+    if new is None:
+        return old
+    return new if old is None else old + EWMA_ALPHA * (new - old)
+
+
+class FetchMethodPolicy:
+    """Per-host fetch-method statistics and the `auto` choice derived from them."""
+
+    def __init__(self, state: CrawlState):
+        self.state = state
+
+    def _conn(self):
+        return self.state.ensure_schema(_SCHEMA)
+
+    def choose(self, url: str, playwright_available: bool = True) -> Tuple[str, str]:
+        """Return (method, reason) to try first for `url` in auto mode."""
+        if not playwright_available:
+            return 'requests', 'playwright unavailable'
+        host = host_of(url)
+        with self.state.lock:
+            row = self._conn().execute('SELECT * FROM fetch_method_choice WHERE host = ?', (host,)).fetchone()
+        if row is None or row['method'] == 'requests':
+            return 'requests', row['reason'] if row else 'no history'
+        if row['since_probe'] >= REPROBE_EVERY or time.time() - row['probed_at'] >= REPROBE_AFTER_S:
+            return 'requests', 're-probe'
+        return row['method'], row['reason'] or ''
+
+    def record(self, url: str, method: str, ok: bool, latency_s: Optional[float] = None,
+               content_chars: Optional[int] = None, playwright_available: bool = True):
+        """Record one outcome and switch the host's method when the numbers say so.
+
+        Args:
+            url: Fetched URL (statistics are per host).
+            method: 'requests' or 'playwright'.
+            ok: Whether the fetch produced a usable page/article.
+            latency_s: Fetch duration, if measured.
+            content_chars: Extracted article length, if known.
+            playwright_available: Whether switching to Playwright is possible.
+        """
+        host = host_of(url)
+        now = time.time()
+        with self.state.lock:
+            conn = self._conn()
+            row = conn.execute('SELECT * FROM fetch_method_stats WHERE host = ? AND method = ?',
+                               (host, method)).fetchone()
+            if row is None:
+                stats = {'attempts': 1, 'success_rate': 1.0 if ok else 0.0,
+                         'content_chars': content_chars, 'latency_s': latency_s}
+            else:
+                stats = {'attempts': row['attempts'] + 1,
+                         'success_rate': _ewma(row['success_rate'], 1.0 if ok else 0.0),
+                         'content_chars': _ewma(row['content_chars'], content_chars),
+                         'latency_s': _ewma(row['latency_s'], latency_s)}
+            conn.execute(
+                'INSERT OR REPLACE INTO fetch_method_stats(host, method, attempts, success_rate, content_chars, '
+                'latency_s, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (host, method, stats['attempts'], stats['success_rate'], stats['content_chars'],
+                 stats['latency_s'], now),
+            )
+            choice = conn.execute('SELECT * FROM fetch_method_choice WHERE host = ?', (host,)).fetchone()
+            current = choice['method'] if choice else 'requests'
+            switch_to, reason = None, None
+            if method == 'requests' and current == 'requests' and not ok and playwright_available \
+                    and stats['attempts'] >= MIN_ATTEMPTS and stats['success_rate'] < GOOD_SUCCESS_RATE:
+                switch_to = 'playwright'
+                reason = (f"requests success rate {stats['success_rate']:.2f} < {GOOD_SUCCESS_RATE}"
+                          + (f", avg content {stats['content_chars']:.0f} chars" if stats['content_chars'] is not None else ''))
+            elif method == 'requests' and current == 'playwright' and ok:
+                switch_to, reason = 'requests', 're-probe with requests succeeded'
+            if switch_to:
+                print(f"Fetch method for {host}: {current} -> {switch_to} ({reason})")
+                conn.execute(
+                    'INSERT OR REPLACE INTO fetch_method_choice(host, method, since_probe, probed_at, reason) '
+                    'VALUES (?, ?, 0, ?, ?)', (host, switch_to, now, reason))
+            elif choice is not None and current == 'playwright':
+                if method == 'requests':  # failed probe: stay on Playwright, restart the probe clock
+                    conn.execute('UPDATE fetch_method_choice SET since_probe = 0, probed_at = ? WHERE host = ?',
+                                 (now, host))
+                else:
+                    conn.execute('UPDATE fetch_method_choice SET since_probe = since_probe + 1 WHERE host = ?',
+                                 (host,))
+            elif choice is None:
+                conn.execute(
+                    'INSERT INTO fetch_method_choice(host, method, since_probe, probed_at, reason) '
+                    'VALUES (?, ?, 0, ?, ?)', (host, 'requests', now, 'default'))
+            conn.commit()
+
+    def stats(self, host: Optional[str] = None) -> List[Dict]:
+        """Per host/method statistics joined with the current choice."""
+        sql = ('SELECT s.*, c.method AS chosen, c.reason FROM fetch_method_stats s '
+               'LEFT JOIN fetch_method_choice c ON c.host = s.host')
+        params = ()
+        if host:
+            sql += ' WHERE s.host = ?'
+            params = (host_of(host if '//' in host else '//' + host),)
+        with self.state.lock:
+            rows = self._conn().execute(sql + ' ORDER BY s.host, s.method', params).fetchall()
+        return [dict(r) for r in rows]
+
+
+_policies: Dict[str, FetchMethodPolicy] = {}
+
+
+def get_fetch_policy(reports_dir: Optional[str] = None) -> FetchMethodPolicy:
+    """Return the shared FetchMethodPolicy of a reports directory."""
+    state = get_crawl_state(reports_dir)
+    policy = _policies.get(state.db_path)
+    if policy is None:
+        policy = _policies[state.db_path] = FetchMethodPolicy(state)
+    return policy
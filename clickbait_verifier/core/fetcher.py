@@ -1,7 +1,244 @@
+import codecs
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
 import requests
 
+from .deadlines import cap_timeout, check as check_deadline, timed_out
+from .politeness import get_politeness, parse_retry_after
+from .robots import get_robots
+
+# Pages are read in streamed chunks and cut off at MAX_PAGE_BYTES; head-only
+# reads stop at </head> (or <body>) and never read more than HEAD_MAX_BYTES
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+HEAD_MAX_BYTES = 256 * 1024
+CHUNK_BYTES = 16 * 1024
+_HEAD_END_RE = re.compile(rb'</head\s*>|<body[\s>]', re.I)
+# A 429/503 is retried once when the host asks for at most this long a pause
+MAX_RETRY_WAIT_S = 60
+
+# Request headers for article and listing pages (a desktop browser)
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9,pl;q=0.8'
+}
+
+# Bytes inspected for <meta charset> and fed to statistical detection
+META_SNIFF_BYTES = 4096
+DETECT_SNIFF_BYTES = 64 * 1024
+# A declared charset is kept despite stray invalid bytes until this share of
+# the sample's non-ASCII characters fails to decode
+MAX_INVALID_RATIO = 0.1
+# The sources are Polish: statistical detection only weighs the Central
+# European codepages, and windows-1250 is the fallback (it decodes every byte)
+DETECT_CANDIDATES = ['cp1250', 'iso8859_2']
+FALLBACK_ENCODING = 'cp1250'
+# Bytes of ą Ą ś Ś ź Ź, which are the letters the two Polish codepages place differently
+_ISO8859_2_LETTERS = re.compile(rb'[\xb1\xa1\xb6\xa6\xbc\xac]')
+_CP1250_LETTERS = re.compile(rb'[\xb9\xa5\x9c\x8c\x9f\x8f]')
+# Declared labels that prove nothing: they decode any byte string and are the
+# default of misconfigured servers, so a Polish page "in latin-1" is usually cp1250
+WEAK_DECLARATIONS = ('iso8859-1', 'cp1252')
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+_CT_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+
+# host -> encoding found by statistical detection (tried first next time)
+_host_encodings: Dict[str, str] = {}
+_host_lock = threading.Lock()
+
+
+def header_value(headers: Optional[Dict], name: str) -> Optional[str]:
+    """Case-insensitive lookup in a plain dict of response headers (e.g. from the HTML archive)."""
+    name = name.lower()
+    return next((v for k, v in (headers or {}).items() if k.lower() == name), None)
+
 
 def fetch(url, timeout=10):
-    r = requests.get(url, timeout=timeout)
+    r, body, _ = fetch_bytes(url, timeout=timeout)
     r.raise_for_status()
-    return r.text
+    return decode_html(body, r.headers.get('Content-Type'), r.url)[0]
+
+
+def fetch_bytes(url: str, headers: Optional[Dict] = None, timeout: float = 10,
+                max_bytes: int = MAX_PAGE_BYTES, head_only: bool = False,
+                polite: bool = True) -> Tuple[requests.Response, bytes, bool]:
+    """Stream a response body, stopping at `max_bytes` (or after </head> with `head_only`).
+
+    Metadata consumers (og:image, og:title, description) only need the head,
+    which is usually a few KB of a several-hundred-KB page.
+
+    Timeouts are capped to the current deadline (core/deadlines.py).
+    With `polite` the URL must be allowed by robots.txt (core/robots.py, raises
+    RobotsDisallowed otherwise), the request is paced by the per-host
+    politeness controller (core/politeness.py), and a 429/503 with a short
+    Retry-After is retried once.
+
+    Returns:
+        (response, body, complete); complete is False when reading stopped
+        early. Check the status yourself (the body of an error page is read too).
+    """
+    if not polite:
+        return _stream(url, headers, timeout, max_bytes, head_only)
+    get_robots().check(url)
+    controller = get_politeness()
+    for attempt in range(2):
+        with controller.slot(url) as outcome:
+            r, body, complete = _stream(url, headers, timeout, max_bytes, head_only)
+            outcome['status'] = r.status_code
+            outcome['retry_after'] = parse_retry_after(r.headers.get('Retry-After'))
+        if r.status_code not in (429, 503) or attempt or controller.wait_time(url) > MAX_RETRY_WAIT_S:
+            break
+    return r, body, complete
+
+
+def _stream(url, headers, timeout, max_bytes, head_only):
+    limit = min(max_bytes, HEAD_MAX_BYTES) if head_only else max_bytes
+    capped = cap_timeout(timeout)
+    try:
+        r = requests.get(url, headers=headers, timeout=capped, stream=True)
+    except requests.Timeout as e:
+        timed_out(timeout, capped, e)
+        raise
+    with r:
+        buf = bytearray()
+        complete = True
+        for chunk in _iter_chunks(r, timeout, capped):
+            check_deadline()  # a slow trickle must not outlive the source budget
+            searched = max(0, len(buf) - 16)
+            buf += chunk
+            if head_only:
+                m = _HEAD_END_RE.search(buf, searched)
+                if m:
+                    del buf[m.end():]
+                    complete = False
+                    break
+            if len(buf) >= limit:
+                del buf[limit:]
+                complete = False
+                break
+    return r, bytes(buf), complete
+
+
+def _iter_chunks(r, timeout, capped):
+    try:
+        yield from r.iter_content(CHUNK_BYTES)
+    except requests.ConnectionError as e:  # a read timeout surfaces as ConnectionError here
+        timed_out(timeout, capped, e)
+        raise
+
+
+def _codec_name(label) -> Optional[str]:
+    """Normalize a charset label ('UTF8', 'iso-8859-2') to a Python codec name, or None."""
+    if not label:
+        return None
+    if isinstance(label, bytes):
+        label = label.decode('ascii', errors='ignore')
+    try:
+        return codecs.lookup(label.strip().lower()).name
+    except LookupError:
+        return None
+
+
+def _decodes(body: bytes, encoding: str) -> bool:
+    """True if the start of `body` is valid in `encoding` (a cut multibyte char at the end is fine)."""
+    try:
+        codecs.getincrementaldecoder(encoding)(errors='strict').decode(body[:DETECT_SNIFF_BYTES], final=False)
+        return True
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+
+def _mostly_decodes(body: bytes, encoding: str) -> bool:
+    """True if at most MAX_INVALID_RATIO of the non-ASCII characters at the start of `body` are invalid."""
+    try:
+        text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(
+            body[:DETECT_SNIFF_BYTES], final=False)
+    except LookupError:
+        return False
+    invalid = text.count('\ufffd')
+    if not invalid:
+        return True
+    non_ascii = sum(1 for ch in text if ch > '\x7f')
+    return invalid <= MAX_INVALID_RATIO * non_ascii
+
+
+def detect_encoding(body: bytes, content_type: Optional[str] = None, url: Optional[str] = None) -> str:
+    """Pick the charset of an HTML response without scanning the whole body.
+
+    Order: BOM, Content-Type charset, <meta charset> in the first few KB, strict
+    UTF-8, then statistical detection on a bounded prefix (cached per host).
+    A declared charset survives a few stray invalid bytes (they decode to
+    U+FFFD); it is dropped only when a meaningful share of the sample is invalid.
+    A declared latin-1/windows-1252 is only a hint: a UTF-8 body resolves to
+    UTF-8 (the Polish mojibake case), anything else is checked by statistical
+    detection against the Polish codepages, falling back to cp1250 or iso-8859-2.
+    """
+    for bom, encoding in _BOMS:
+        if body.startswith(bom):
+            return encoding
+
+    declared = None
+    if content_type:
+        m = _CT_CHARSET_RE.search(content_type)
+        declared = _codec_name(m.group(1)) if m else None
+    if not declared:
+        m = _META_CHARSET_RE.search(body[:META_SNIFF_BYTES])
+        declared = _codec_name(m.group(1)) if m else None
+    if declared in WEAK_DECLARATIONS:
+        if _decodes(body, 'utf-8'):
+            return 'utf-8'
+        sample = body[:DETECT_SNIFF_BYTES]
+        return _detect_statistically(sample, [declared] + DETECT_CANDIDATES) or _fallback_encoding(sample)
+    if declared:
+        if _mostly_decodes(body, declared):
+            return declared
+
+    if _decodes(body, 'utf-8'):
+        return 'utf-8'
+
+    host = urlparse(url).netloc.lower() if url else None
+    with _host_lock:
+        cached = _host_encodings.get(host) if host else None
+    if cached and _decodes(body, cached):
+        return cached
+    sample = body[:DETECT_SNIFF_BYTES]
+    encoding = _detect_statistically(sample) or _fallback_encoding(sample)
+    if host:
+        with _host_lock:
+            _host_encodings[host] = encoding
+    return encoding
+
+
+def _detect_statistically(sample: bytes, candidates: Optional[List[str]] = None) -> Optional[str]:
+    try:
+        from charset_normalizer import from_bytes
+        best = from_bytes(sample, cp_isolation=candidates or DETECT_CANDIDATES).best()
+        return _codec_name(best.encoding) if best else None
+    except ImportError:
+        pass
+    try:
+        import chardet
+        return _codec_name(chardet.detect(sample).get('encoding'))
+    except ImportError:
+        return None
+
+
+def _fallback_encoding(sample: bytes) -> str:
+    """iso-8859-2 if the sample spells Polish letters its way, else FALLBACK_ENCODING."""
+    if len(_ISO8859_2_LETTERS.findall(sample)) > len(_CP1250_LETTERS.findall(sample)):
+        return 'iso8859-2'
+    return FALLBACK_ENCODING
+
+
+def decode_html(body: bytes, content_type: Optional[str] = None, url: Optional[str] = None) -> Tuple[str, str]:
+    """Decode an HTML response body; returns (text, encoding used)."""
+    encoding = detect_encoding(body, content_type, url)
+    return body.decode(encoding, errors='replace'), encoding
@@ -0,0 +1,202 @@
+"""Persistent lead-image cache and background thumbnailer.
+
+The lead image of an article is resolved once per article URL (the scraped
+og:image, or failing that a fetch of the article page) and downscaled into a
+local JPEG under clickbait_verifier/static/thumbs/. Results are stored in the
+corpus index (`images` table), so the feed and the API only read local data
+and never wait for third-party servers.
+
+Work is queued with `schedule_image()` and runs on a small background thread
+pool. Pillow is optional: without it only the resolved image URL is cached.
+"""
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, Optional
+from urllib.parse import urljoin
+
+try:
+    from PIL import Image
+except ImportError:  # thumbnails are skipped, image URLs are still cached
+    Image = None
+
+from .fetcher import decode_html, fetch_bytes
+from .index import get_index
+
+THUMB_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', 'static', 'thumbs'))
+THUMB_SIZE = (480, 300)
+THUMB_QUALITY = 80
+MAX_IMAGE_BYTES = 8 * 1024 * 1024
+FETCH_TIMEOUT_S = 6
+# Lookups that found no image are retried after this many seconds
+RETRY_AFTER_S = 24 * 3600
+BACKGROUND_WORKERS = 2
+
+_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible)"}
+_META_PROPS = ["og:image", "twitter:image", "image", "og:image:url"]
+
+_executor: Optional[ThreadPoolExecutor] = None
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def extract_page_image(html: str, base_url: str) -> Optional[str]:
+    """Pick a representative image URL from page HTML (meta tags, image_src, largest <img>)."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+    for prop in _META_PROPS:
+        m = soup.find("meta", property=prop) or soup.find("meta", attrs={"name": prop})
+        if m:
+            val = m.get("content") or m.get("value")
+            if val:
+                return urljoin(base_url, val)
+
+    link = soup.find("link", rel=lambda x: x and "image_src" in x)
+    if link and link.get("href"):
+        return urljoin(base_url, link["href"])
+
+    # pick a large image from <img> elements (heuristic)
+    imgs = [img for img in soup.find_all("img", src=True) if not img["src"].startswith("data:")]
+    if not imgs:
+        return None
+    best, best_area = None, 0
+    for img in imgs:
+        try:
+            area = int(img.get("width")) * int(img.get("height"))
+        except (TypeError, ValueError):
+            area = 0
+        if area > best_area:
+            best, best_area = img["src"], area
+    return urljoin(base_url, best or imgs[0]["src"])
+
+
+def resolve_page_image(page_url: str) -> Optional[str]:
+    """Fetch an article page and return its lead image URL, or None.
+
+    Reads only the page head first (meta tags); the capped full page is
+    fetched only when the head has no image.
+    """
+    try:
+        resp, body, complete = fetch_bytes(page_url, headers=_HEADERS, timeout=FETCH_TIMEOUT_S, head_only=True)
+        if resp.status_code != 200:
+            return None
+        html, _ = decode_html(body, resp.headers.get('Content-Type'), resp.url)
+        image = extract_page_image(html, resp.url)
+        if image or complete:
+            return image
+        resp, body, _ = fetch_bytes(page_url, headers=_HEADERS, timeout=FETCH_TIMEOUT_S)
+        if resp.status_code != 200:
+            return None
+        html, _ = decode_html(body, resp.headers.get('Content-Type'), resp.url)
+        return extract_page_image(html, resp.url)
+    except Exception:
+        return None
+
+
+def thumb_name(page_url: str) -> str:
+    """Stable thumbnail file name for an article URL."""
+    return hashlib.sha1(page_url.encode('utf-8')).hexdigest()[:20] + '.jpg'
+
+
+def thumb_path(name: str) -> str:
+    return os.path.join(THUMB_DIR, name)
+
+
+def make_thumbnail(image_url: str, name: str) -> Optional[str]:
+    """Download an image and store a downscaled JPEG as THUMB_DIR/<name>.
+
+    Returns:
+        The file name, or None if Pillow is missing or the image is unusable.
+    """
+    if Image is None:
+        return None
+    import requests
+
+    try:
+        with requests.get(image_url, headers=_HEADERS, timeout=FETCH_TIMEOUT_S, stream=True) as resp:
+            if resp.status_code != 200:
+                return None
+            buf = BytesIO()
+            for chunk in resp.iter_content(64 * 1024):
+                buf.write(chunk)
+                if buf.tell() > MAX_IMAGE_BYTES:
+                    return None
+        buf.seek(0)
+        with Image.open(buf) as img:
+            img.draft('RGB', THUMB_SIZE)  # cheap JPEG downscale while decoding
+            img = img.convert('RGB')
+            img.thumbnail(THUMB_SIZE)
+            os.makedirs(THUMB_DIR, exist_ok=True)
+            tmp = thumb_path(name) + '.tmp'
+            img.save(tmp, 'JPEG', quality=THUMB_QUALITY, optimize=True)
+        os.replace(tmp, thumb_path(name))
+        return name
+    except Exception:
+        return None
+
+
+def lookup_image(page_url: str, reports_dir: Optional[str] = None) -> Optional[Dict]:
+    """Return the cached entry (image_url, thumb, checked_at) for an article URL, or None."""
+    if not page_url:
+        return None
+    return get_index(reports_dir).get_image(page_url)
+
+
+def process_image(page_url: str, image_url: Optional[str] = None, reports_dir: Optional[str] = None) -> Optional[Dict]:
+    """Resolve, thumbnail and cache the lead image of one article (blocking).
+
+    Args:
+        page_url: Article URL (cache key).
+        image_url: Lead image already known from scraping, if any.
+        reports_dir: Reports directory whose index holds the cache.
+
+    Returns:
+        The cache entry after processing.
+    """
+    index = get_index(reports_dir)
+    cached = index.get_image(page_url)
+    if cached:
+        if cached['thumb'] and os.path.exists(thumb_path(cached['thumb'])):
+            return cached
+        if not image_url and time.time() - cached['checked_at'] < RETRY_AFTER_S:
+            if not cached['image_url'] or Image is None:
+                return cached
+        image_url = image_url or cached['image_url']
+    image_url = image_url or resolve_page_image(page_url)
+    thumb = make_thumbnail(image_url, thumb_name(page_url)) if image_url else None
+    index.record_image(page_url, image_url, thumb)
+    return index.get_image(page_url)
+
+
+def _run(page_url, image_url, reports_dir):
+    try:
+        process_image(page_url, image_url, reports_dir)
+    except Exception as e:
+        print(f"Image cache: failed for {page_url}: {e}")
+    finally:
+        with _pending_lock:
+            _pending.discard(page_url)
+
+
+def schedule_image(page_url: Optional[str], image_url: Optional[str] = None,
+                   reports_dir: Optional[str] = None) -> bool:
+    """Queue `process_image` on the background pool; returns False if already queued.
+
+    Queued work finishes before the interpreter exits, so CLI scrapers leave
+    complete thumbnails behind.
+    """
+    global _executor
+    if not page_url:
+        return False
+    with _pending_lock:
+        if page_url in _pending:
+            return False
+        _pending.add(page_url)
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix='thumbnailer')
+    _executor.submit(_run, page_url, image_url, reports_dir)
+    return True
@@ -0,0 +1,935 @@
+"""SQLite index over the reports/ corpus.
+
+The JSON files in reports/scraped and reports/analysis remain the source of
+truth. This module keeps a derived index next to them (reports/index.sqlite3)
+that can be deleted and rebuilt at any time with `CorpusIndex.sync()`.
+
+Writers call `record_report_file(path)` right after saving a report so the
+index is updated incrementally; readers call `sync()` which only re-reads files
+whose mtime/size changed since the last run (and forgets removed files).
+"""
+import json
+import os
+from datetime import datetime
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from .jsonio import read_json
+from .projections import THUMB_URL_PREFIX, build_card, build_detail, scraped_image_url
+from .urls import url_key
+
+REPORTS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'reports'))
+DB_FILENAME = 'index.sqlite3'
+# Bump when tables change; an index with an older version is dropped and
+# rebuilt from reports/ on the next connect.
+SCHEMA_VERSION = 6
+
+# Only canonical report files are indexed; suffixed duplicates such as
+# analysis_<id>_1.json are ignored (same convention as api_server).
+_REPORT_FILE_RE = re.compile(r'^(scraped|analysis)_(\d+)\.json$')
+_REPORT_DIRS = ('scraped', 'analysis')
+
+_TOKEN_RE = re.compile(r'\w+', re.U)
+
+# Dashboard "warto się przyjrzeć" band: mild label or a borderline score.
+REVIEW_SCORE_MIN = 30
+REVIEW_SCORE_MAX = 49
+_REVIEW_WHERE = f"(label = 'mild' OR (score >= {REVIEW_SCORE_MIN} AND score <= {REVIEW_SCORE_MAX}))"
+
+# Common Polish inflectional endings (after diacritic folding), longest first.
+# Stripping them lets 'wyborach' match 'wybory' via prefix search.
+_PL_SUFFIXES = sorted([
+    'owego', 'owemu', 'owych', 'owymi', 'ami', 'ach', 'ego', 'emu', 'owi', 'ych', 'ymi', 'imi',
+    'iej', 'ej', 'ow', 'om', 'ie', 'a', 'e', 'i', 'o', 'u', 'y',
+], key=len, reverse=True)
+_MIN_STEM = 4
+
+# Extra folds for letters that have no Unicode decomposition.
+_FOLD_MAP = str.maketrans({'ł': 'l', 'Ł': 'l', 'ø': 'o', 'đ': 'd', 'ß': 'ss'})
+
+
+def fold_text(s: Optional[str]) -> str:
+    """Lowercase text and strip diacritics ('Łódź' -> 'lodz')."""
+    if not s:
+        return ''
+    s = str(s).translate(_FOLD_MAP).lower()
+    s = unicodedata.normalize('NFKD', s)
+    return ''.join(ch for ch in s if not unicodedata.combining(ch))
+
+
+def tokenize(s: Optional[str]) -> List[str]:
+    """Split text into folded word tokens."""
+    return _TOKEN_RE.findall(fold_text(s))
+
+
+def stem_token(token: str) -> str:
+    """Very light Polish stemmer: drop one inflectional suffix if a usable stem remains."""
+    for suf in _PL_SUFFIXES:
+        if token.endswith(suf) and len(token) - len(suf) >= _MIN_STEM:
+            return token[:-len(suf)]
+    return token
+
+
+def article_id_from_path(path: str):
+    """Return (kind, article_id) for a canonical report file, else (None, None)."""
+    m = _REPORT_FILE_RE.match(os.path.basename(path))
+    if not m:
+        return None, None
+    return m.group(1), m.group(2)
+
+
+def _article_day(fetched_at, published, mtime_ns) -> str:
+    """Return 'YYYY-MM-DD' for an article (fetched_at, then published, then analysis mtime)."""
+    for value in (fetched_at, published):
+        if not value:
+            continue
+        try:
+            return datetime.fromisoformat(str(value)).strftime('%Y-%m-%d')
+        except ValueError:
+            try:
+                return datetime.strptime(str(value)[:10], '%Y-%m-%d').strftime('%Y-%m-%d')
+            except ValueError:
+                continue
+    if mtime_ns:
+        return datetime.fromtimestamp(mtime_ns / 1e9).strftime('%Y-%m-%d')
+    return ''
+
+
+def _to_float(val) -> Optional[float]:
+    try:
+        return float(val) if val is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    article_id TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    source TEXT,
+    title TEXT,
+    url TEXT,
+    url_key TEXT,
+    published TEXT,
+    fetched_at TEXT,
+    content TEXT,
+    image_url TEXT,
+    scraped_path TEXT,
+    analysis_path TEXT,
+    score REAL,
+    label TEXT,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_url ON articles(url);
+CREATE INDEX IF NOT EXISTS idx_articles_url_key ON articles(url_key);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    article_id TEXT NOT NULL,
+    op TEXT NOT NULL,
+    changed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_changes_article ON changes(article_id);
+CREATE TABLE IF NOT EXISTS projections (
+    article_id TEXT PRIMARY KEY,
+    sort_key INTEGER NOT NULL,
+    card TEXT NOT NULL,
+    detail TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_projections_sort ON projections(sort_key DESC);
+CREATE TABLE IF NOT EXISTS images (
+    url TEXT PRIMARY KEY,
+    image_url TEXT,
+    thumb TEXT,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS article_stats (
+    article_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    day TEXT NOT NULL,
+    label TEXT NOT NULL,
+    score REAL
+);
+CREATE INDEX IF NOT EXISTS idx_article_stats_score ON article_stats(score DESC);
+CREATE INDEX IF NOT EXISTS idx_article_stats_review ON article_stats(score DESC) WHERE {review_where};
+CREATE TABLE IF NOT EXISTS label_counts (
+    source TEXT NOT NULL,
+    day TEXT NOT NULL,
+    label TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    scored INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    PRIMARY KEY (source, day, label)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_SCHEMA = _SCHEMA.replace('{review_where}', _REVIEW_WHERE)
+
+_SCRAPED_COLUMNS = ('source', 'title', 'url', 'url_key', 'published', 'fetched_at', 'content', 'image_url', 'scraped_path')
+_ANALYSIS_COLUMNS = ('analysis_path', 'score', 'label', 'summary')
+
+
+class CorpusIndex:
+    """Derived SQLite index (metadata + full-text search) over reports/."""
+
+    def __init__(self, reports_dir: Optional[str] = None, db_path: Optional[str] = None):
+        self.reports_dir = os.path.normpath(reports_dir or REPORTS_DIR)
+        self.db_path = db_path or os.path.join(self.reports_dir, DB_FILENAME)
+        self._lock = threading.RLock()
+        self._conn = None
+        self._last_sync = 0.0
+        self.has_fts = False
+
+    # -- connection / schema -------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            if conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                self._drop_all(conn)
+            conn.executescript(_SCHEMA)
+            try:
+                conn.execute(
+                    'CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5('
+                    'article_id UNINDEXED, title, content, summary, tokenize="unicode61")'
+                )
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: keep the folded text in a plain table
+                # and fall back to LIKE queries.
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS articles_fts '
+                    '(article_id TEXT PRIMARY KEY, title TEXT, content TEXT, summary TEXT)'
+                )
+                self.has_fts = False
+            # generation changes whenever the index is rebuilt from scratch, so
+            # version strings from a deleted index are never reused
+            conn.execute('INSERT OR IGNORE INTO meta(key, value) VALUES (?, ?)', ('generation', uuid.uuid4().hex[:8]))
+            conn.execute('INSERT OR IGNORE INTO meta(key, value) VALUES (?, ?)', ('version', '0'))
+            conn.execute('INSERT OR IGNORE INTO meta(key, value) VALUES (?, ?)', ('modified_at', str(time.time())))
+            conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _drop_all(conn):
+        tables = [r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' AND name NOT LIKE 'articles_fts_%'"
+        )]
+        for name in tables:
+            conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+        conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _rel_path(self, path: str) -> str:
+        """Key files by '<dir>/<name>' so the index does not depend on cwd."""
+        parent = os.path.basename(os.path.dirname(os.path.abspath(path)))
+        return f"{parent}/{os.path.basename(path)}"
+
+    def _abs_path(self, rel: str) -> str:
+        return os.path.join(self.reports_dir, *rel.split('/'))
+
+    def _log_change(self, conn, article_id):
+        """Append an 'upsert' or 'delete' entry for an analyzed article to the change log.
+
+        Only articles that have (or had) an analysis are visible to API clients, so
+        scraped-only changes are not logged. Older entries for the same article are
+        dropped, keeping the log proportional to the corpus plus tombstones.
+        """
+        row = conn.execute('SELECT analysis_path FROM articles WHERE id=?', (article_id,)).fetchone()
+        if row is not None and row['analysis_path'] is not None:
+            op = 'upsert'
+        else:
+            prev = conn.execute(
+                'SELECT op FROM changes WHERE article_id=? ORDER BY seq DESC LIMIT 1', (article_id,)
+            ).fetchone()
+            if prev is None or prev['op'] != 'upsert':
+                return
+            op = 'delete'
+        conn.execute('DELETE FROM changes WHERE article_id=?', (article_id,))
+        conn.execute(
+            'INSERT INTO changes(article_id, op, changed_at) VALUES (?,?,?)',
+            (article_id, op, time.time()),
+        )
+
+    def _touch(self, conn):
+        """Bump the collection version after any change to the indexed corpus."""
+        conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version'")
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'modified_at'", (str(time.time()),))
+
+    # -- writes ---------------------------------------------------------------
+
+    def index_file(self, path: str, data: Optional[dict] = None) -> Optional[str]:
+        """Index (or re-index) a single scraped/analysis report file.
+
+        Args:
+            path: Path to the JSON report.
+            data: Already loaded JSON content (avoids re-reading the file).
+
+        Returns:
+            Article id that was updated, or None when the file is not a report.
+        """
+        kind, article_id = article_id_from_path(path)
+        if not kind:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return self.remove_file(path)
+        if data is None:
+            data = read_json(path)
+        if data is None:
+            return None
+        with self._lock:
+            conn = self._connect()
+            self._index_file(conn, self._rel_path(path), kind, article_id, st, data)
+            conn.commit()
+        return article_id
+
+    def index_files(self, items: List[Tuple[str, Optional[dict]]]) -> int:
+        """Index several report files in one transaction (batch writers, backfills).
+
+        Args:
+            items: (path, data) pairs; data may be None to read the file.
+
+        Returns:
+            Number of files indexed.
+        """
+        done = 0
+        with self._lock:
+            conn = self._connect()
+            for path, data in items:
+                kind, article_id = article_id_from_path(path)
+                if not kind:
+                    continue
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    self._remove_file(conn, self._rel_path(path))
+                    continue
+                if data is None:
+                    data = read_json(path)
+                if data is None:
+                    continue
+                self._index_file(conn, self._rel_path(path), kind, article_id, st, data)
+                done += 1
+            conn.commit()
+        return done
+
+    def _index_file(self, conn, rel, kind, article_id, st, data):
+        conn.execute(
+            'INSERT INTO files(path, kind, article_id, mtime_ns, size) VALUES (?,?,?,?,?) '
+            'ON CONFLICT(path) DO UPDATE SET kind=excluded.kind, article_id=excluded.article_id, '
+            'mtime_ns=excluded.mtime_ns, size=excluded.size',
+            (rel, kind, article_id, st.st_mtime_ns, st.st_size),
+        )
+        if kind == 'scraped':
+            values = {
+                'source': data.get('source'),
+                'title': data.get('title'),
+                'url': data.get('url'),
+                # canonical_url is set by the scraper from <link rel=canonical> / redirects
+                'url_key': url_key(data.get('canonical_url') or data.get('url')),
+                'published': data.get('published'),
+                'fetched_at': data.get('fetched_at'),
+                'content': data.get('content') or '',
+                'image_url': scraped_image_url(data),
+                'scraped_path': rel,
+            }
+        else:
+            values = {
+                'analysis_path': rel,
+                'score': _to_float(data.get('score', data.get('clickbait_score'))),
+                'label': data.get('label'),
+                'summary': data.get('summary'),
+            }
+        self._upsert_article(conn, article_id, values)
+        # analyses carry their own copy of title/source/url; use it when the
+        # scraped file is missing
+        if kind == 'analysis':
+            conn.execute(
+                'UPDATE articles SET title=COALESCE(title, ?), source=COALESCE(source, ?), url=COALESCE(url, ?), '
+                'url_key=COALESCE(url_key, ?) WHERE id=?',
+                (data.get('title'), data.get('source'), data.get('url'), url_key(data.get('url')), article_id),
+            )
+        self._refresh_fts(conn, article_id)
+        self._refresh_projection(conn, article_id, data if kind == 'analysis' else None)
+        self._refresh_stats(conn, article_id)
+        self._log_change(conn, article_id)
+        self._touch(conn)
+
+    def _upsert_article(self, conn, article_id, values: Dict):
+        cols = list(values.keys())
+        placeholders = ','.join('?' for _ in cols)
+        updates = ','.join(f'{c}=excluded.{c}' for c in cols)
+        conn.execute(
+            f'INSERT INTO articles(id,{",".join(cols)}) VALUES (?,{placeholders}) '
+            f'ON CONFLICT(id) DO UPDATE SET {updates}',
+            [article_id] + [values[c] for c in cols],
+        )
+
+    def _refresh_fts(self, conn, article_id):
+        conn.execute('DELETE FROM articles_fts WHERE article_id=?', (article_id,))
+        row = conn.execute('SELECT title, content, summary FROM articles WHERE id=?', (article_id,)).fetchone()
+        if row is None:
+            return
+        conn.execute(
+            'INSERT INTO articles_fts(article_id, title, content, summary) VALUES (?,?,?,?)',
+            (article_id, fold_text(row['title']), fold_text(row['content']), fold_text(row['summary'])),
+        )
+
+    def _refresh_projection(self, conn, article_id, analysis: Optional[dict] = None):
+        """Materialize the API card/detail JSON for an analyzed article."""
+        row = conn.execute(
+            'SELECT a.analysis_path, a.url, a.image_url, f.mtime_ns FROM articles a '
+            'LEFT JOIN files f ON f.path = a.analysis_path WHERE a.id=?',
+            (article_id,),
+        ).fetchone()
+        if row is None or row['analysis_path'] is None:
+            conn.execute('DELETE FROM projections WHERE article_id=?', (article_id,))
+            return
+        if analysis is None:
+            analysis = read_json(self._abs_path(row['analysis_path']))
+        image_url = row['image_url']
+        if not image_url and row['url']:
+            # scraped file may have been saved under a different id
+            other = conn.execute(
+                'SELECT image_url FROM articles WHERE url=? AND image_url IS NOT NULL LIMIT 1', (row['url'],)
+            ).fetchone()
+            image_url = other['image_url'] if other else None
+        cached = conn.execute('SELECT image_url, thumb FROM images WHERE url=?', (row['url'],)).fetchone()
+        thumbnail_url = None
+        if cached is not None:
+            image_url = image_url or cached['image_url']
+            thumbnail_url = f"{THUMB_URL_PREFIX}{cached['thumb']}" if cached['thumb'] else None
+        try:
+            card = json.dumps(build_card(article_id, analysis, image_url, thumbnail_url), ensure_ascii=False)
+            detail = json.dumps(build_detail(article_id, analysis, image_url, thumbnail_url), ensure_ascii=False)
+        except Exception:
+            # malformed analysis (e.g. missing score): not served, same as before
+            conn.execute('DELETE FROM projections WHERE article_id=?', (article_id,))
+            return
+        conn.execute(
+            'INSERT INTO projections(article_id, sort_key, card, detail) VALUES (?,?,?,?) '
+            'ON CONFLICT(article_id) DO UPDATE SET sort_key=excluded.sort_key, card=excluded.card, detail=excluded.detail',
+            (article_id, row['mtime_ns'] or 0, card, detail),
+        )
+
+    def _refresh_stats(self, conn, article_id):
+        """Keep article_stats and the label_counts rollup in step with an article row.
+
+        The rollup is adjusted by the difference between the old and new
+        (source, day, label, score) of the article, so dashboards never rescan.
+        """
+        row = conn.execute(
+            'SELECT a.source, a.published, a.fetched_at, a.analysis_path, a.score, a.label, f.mtime_ns '
+            'FROM articles a LEFT JOIN files f ON f.path = a.analysis_path WHERE a.id=?',
+            (article_id,),
+        ).fetchone()
+        new = None
+        if row is not None and row['analysis_path'] is not None:
+            new = (
+                row['source'] or 'unknown',
+                _article_day(row['fetched_at'], row['published'], row['mtime_ns']),
+                row['label'] or '-',
+                row['score'],
+            )
+        old = conn.execute(
+            'SELECT source, day, label, score FROM article_stats WHERE article_id=?', (article_id,)
+        ).fetchone()
+        old = tuple(old) if old is not None else None
+        if old == new:
+            return
+        if old is not None:
+            scored, score = (1, old[3]) if old[3] is not None else (0, 0.0)
+            conn.execute(
+                'UPDATE label_counts SET n = n - 1, scored = scored - ?, score_sum = score_sum - ? '
+                'WHERE source=? AND day=? AND label=?',
+                (scored, score) + old[:3],
+            )
+            conn.execute('DELETE FROM label_counts WHERE n <= 0 AND source=? AND day=? AND label=?', old[:3])
+            conn.execute('DELETE FROM article_stats WHERE article_id=?', (article_id,))
+        if new is not None:
+            scored, score = (1, new[3]) if new[3] is not None else (0, 0.0)
+            conn.execute(
+                'INSERT INTO article_stats(article_id, source, day, label, score) VALUES (?,?,?,?,?)',
+                (article_id,) + new,
+            )
+            conn.execute(
+                'INSERT INTO label_counts(source, day, label, n, scored, score_sum) VALUES (?,?,?,1,?,?) '
+                'ON CONFLICT(source, day, label) DO UPDATE SET n = n + 1, '
+                'scored = scored + excluded.scored, score_sum = score_sum + excluded.score_sum',
+                new[:3] + (scored, score),
+            )
+
+    def record_image(self, url: str, image_url: Optional[str], thumb: Optional[str]):
+        """Store the resolved lead image / thumbnail for an article URL (see core.images).
+
+        Projections of articles with that URL are rebuilt so API clients pick
+        up the thumbnail through the usual ETag / change-log mechanisms.
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT INTO images(url, image_url, thumb, checked_at) VALUES (?,?,?,?) '
+                'ON CONFLICT(url) DO UPDATE SET image_url=excluded.image_url, thumb=excluded.thumb, '
+                'checked_at=excluded.checked_at',
+                (url, image_url, thumb, time.time()),
+            )
+            ids = [r['id'] for r in conn.execute(
+                'SELECT id FROM articles WHERE url=? AND analysis_path IS NOT NULL', (url,)
+            )]
+            for article_id in ids:
+                self._refresh_projection(conn, article_id)
+                self._log_change(conn, article_id)
+            if ids:
+                self._touch(conn)
+            conn.commit()
+
+    def get_image(self, url: str) -> Optional[Dict]:
+        """Return the cached image entry (image_url, thumb, checked_at) for an article URL."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute('SELECT image_url, thumb, checked_at FROM images WHERE url=?', (url,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def remove_file(self, path: str) -> Optional[str]:
+        """Forget a report file that was deleted from disk."""
+        with self._lock:
+            conn = self._connect()
+            article_id = self._remove_file(conn, self._rel_path(path))
+            conn.commit()
+        return article_id
+
+    def _remove_file(self, conn, rel) -> Optional[str]:
+        row = conn.execute('SELECT kind, article_id FROM files WHERE path=?', (rel,)).fetchone()
+        if row is None:
+            return None
+        kind, article_id = row['kind'], row['article_id']
+        conn.execute('DELETE FROM files WHERE path=?', (rel,))
+        cleared = _SCRAPED_COLUMNS if kind == 'scraped' else _ANALYSIS_COLUMNS
+        conn.execute(
+            f'UPDATE articles SET {",".join(c + "=NULL" for c in cleared)} WHERE id=?',
+            (article_id,),
+        )
+        conn.execute(
+            'DELETE FROM articles WHERE id=? AND scraped_path IS NULL AND analysis_path IS NULL',
+            (article_id,),
+        )
+        self._refresh_fts(conn, article_id)
+        self._refresh_projection(conn, article_id)
+        self._refresh_stats(conn, article_id)
+        self._log_change(conn, article_id)
+        self._touch(conn)
+        return article_id
+
+    def sync(self, max_age: float = 0.0) -> int:
+        """Bring the index up to date with reports/ on disk.
+
+        Only files whose (mtime, size) changed are re-read, so a no-op sync costs
+        one directory scan.
+
+        Args:
+            max_age: Skip the scan entirely if the last sync is younger than this
+                many seconds (lets hot request paths poll cheaply).
+
+        Returns:
+            Number of files (re)indexed or removed.
+        """
+        if max_age and time.monotonic() - self._last_sync < max_age:
+            return 0
+        on_disk = {}
+        for sub in _REPORT_DIRS:
+            d = os.path.join(self.reports_dir, sub)
+            try:
+                entries = list(os.scandir(d))
+            except FileNotFoundError:
+                continue
+            for e in entries:
+                if _REPORT_FILE_RE.match(e.name):
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    on_disk[f'{sub}/{e.name}'] = st
+
+        changed = 0
+        with self._lock:
+            conn = self._connect()
+            known = {r['path']: (r['mtime_ns'], r['size']) for r in conn.execute('SELECT path, mtime_ns, size FROM files')}
+            for rel in known.keys() - on_disk.keys():
+                self._remove_file(conn, rel)
+                changed += 1
+            # scraped before analysis so analysis rows find their article
+            for rel in sorted(on_disk, key=lambda r: (not r.startswith('scraped/'), r)):
+                st = on_disk[rel]
+                if known.get(rel) == (st.st_mtime_ns, st.st_size):
+                    continue
+                data = read_json(self._abs_path(rel))
+                if data is None:
+                    continue
+                kind, article_id = article_id_from_path(rel)
+                self._index_file(conn, rel, kind, article_id, st, data)
+                changed += 1
+            conn.commit()
+        self._last_sync = time.monotonic()
+        return changed
+
+    def version(self):
+        """Return (version, modified_at) describing the current corpus state.
+
+        version is an opaque string that changes whenever any indexed file is
+        added, changed or removed; modified_at is the UNIX time of that change.
+        """
+        with self._lock:
+            conn = self._connect()
+            meta = dict(conn.execute("SELECT key, value FROM meta WHERE key IN ('generation', 'version', 'modified_at')"))
+        return f"{meta['generation']}-{meta['version']}", float(meta['modified_at'])
+
+    def list_cards(self, limit: Optional[int] = 50, offset: int = 0) -> List[str]:
+        """Return precomputed card JSON strings, newest analysis first."""
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                'SELECT card FROM projections ORDER BY sort_key DESC LIMIT ? OFFSET ?',
+                (-1 if not limit else limit, offset),
+            ).fetchall()
+        return [r['card'] for r in rows]
+
+    def get_cards(self, article_ids: List[str]) -> List[str]:
+        """Return precomputed card JSON strings for the given ids (input order, missing skipped)."""
+        if not article_ids:
+            return []
+        with self._lock:
+            conn = self._connect()
+            placeholders = ','.join('?' for _ in article_ids)
+            found = dict(conn.execute(
+                f'SELECT article_id, card FROM projections WHERE article_id IN ({placeholders})',
+                list(article_ids),
+            ).fetchall())
+        return [found[i] for i in article_ids if i in found]
+
+    def get_detail(self, article_id: str) -> Optional[str]:
+        """Return the precomputed detail JSON string for an article, or None."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute('SELECT detail FROM projections WHERE article_id=?', (str(article_id),)).fetchone()
+        return row['detail'] if row else None
+
+    def changes_since(self, cursor: Optional[str] = None, limit: int = 100) -> Dict:
+        """Read the change log after a cursor returned by a previous call.
+
+        Args:
+            cursor: Opaque cursor ('<generation>-<seq>'); None/empty or a cursor
+                from an older index generation restarts from the beginning.
+            limit: Maximum number of log entries to return.
+
+        Returns:
+            Dict with 'upserts' and 'deletes' (article ids in log order), the next
+            'cursor', 'reset' (client must drop its local copy first) and 'has_more'.
+        """
+        with self._lock:
+            conn = self._connect()
+            generation = conn.execute("SELECT value FROM meta WHERE key='generation'").fetchone()['value']
+            seq, reset = 0, True
+            if cursor:
+                gen, _, raw_seq = str(cursor).rpartition('-')
+                if gen == generation and raw_seq.isdigit():
+                    seq, reset = int(raw_seq), False
+            rows = conn.execute(
+                'SELECT seq, article_id, op FROM changes WHERE seq > ? ORDER BY seq LIMIT ?',
+                (seq, limit + 1),
+            ).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if rows:
+            seq = rows[-1]['seq']
+        return {
+            'cursor': f'{generation}-{seq}',
+            'reset': reset,
+            'has_more': has_more,
+            'upserts': [r['article_id'] for r in rows if r['op'] == 'upsert'],
+            'deletes': [r['article_id'] for r in rows if r['op'] == 'delete'],
+        }
+
+    # -- reads ----------------------------------------------------------------
+
+    def top_articles(self, limit: int = 15) -> List[Dict]:
+        """Return the highest-scored analyzed articles (unscored last)."""
+        return self._stats_rows('', limit)
+
+    def review_candidates(self, limit: Optional[int] = None) -> List[Dict]:
+        """Return articles worth a manual look (mild label or borderline score), by score."""
+        return self._stats_rows(f'WHERE {_REVIEW_WHERE}', limit)
+
+    def _stats_rows(self, where: str, limit: Optional[int]) -> List[Dict]:
+        # filter/limit on article_stats alone so the score indexes are used
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                'SELECT s.article_id, s.source, s.day, s.label, s.score, a.title, a.url '
+                f'FROM (SELECT * FROM article_stats {where} ORDER BY score DESC LIMIT ?) s '
+                'JOIN articles a ON a.id = s.article_id ORDER BY s.score DESC',
+                [-1 if limit is None else limit],
+            ).fetchall()
+        return [
+            {
+                'id': r['article_id'],
+                'source': r['source'],
+                'day': r['day'],
+                'label': r['label'],
+                'score': r['score'],
+                'title': r['title'],
+                'url': r['url'],
+            }
+            for r in rows
+        ]
+
+    def list_titles(self, query: str = '', limit: int = 50, offset: int = 0) -> Tuple[List[Dict], int]:
+        """Return one page of article picker entries plus the total number of matches.
+
+        Analyzed articles come first, newest first, then scraped-only ones. Only
+        the columns needed for a selector are read.
+
+        Args:
+            query: Optional title words (diacritics optional, prefix match).
+            limit: Page size.
+            offset: Number of entries to skip.
+
+        Returns:
+            (entries, total) where each entry has id, source, title, has_analysis
+            and path (analysis file if present, else scraped file).
+        """
+        terms = [stem_token(t) for t in tokenize(query)]
+        terms = [t for t in terms if t]
+        with self._lock:
+            conn = self._connect()  # sets has_fts
+            join, where, params = '', '', []
+            if terms:
+                join = 'JOIN articles_fts f ON f.article_id = a.id'
+                if self.has_fts:
+                    where = 'WHERE articles_fts MATCH ?'
+                    params = ['title : (' + ' AND '.join(f'"{t}"*' for t in terms) + ')']
+                else:
+                    where = 'WHERE ' + ' AND '.join('f.title LIKE ?' for _ in terms)
+                    params = [f'%{t}%' for t in terms]
+            total = conn.execute(f'SELECT COUNT(*) FROM articles a {join} {where}', params).fetchone()[0]
+            rows = conn.execute(
+                f'SELECT a.id, a.source, a.title, a.scraped_path, a.analysis_path FROM articles a {join} {where} '
+                'ORDER BY a.analysis_path IS NULL, CAST(a.id AS INTEGER) DESC LIMIT ? OFFSET ?',
+                params + [limit, offset],
+            ).fetchall()
+        return [self._title_entry(r) for r in rows], total
+
+    def get_title(self, article_id: str) -> Optional[Dict]:
+        """Return the picker entry (see `list_titles`) for one article, or None."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT id, source, title, scraped_path, analysis_path FROM articles WHERE id=?', (str(article_id),)
+            ).fetchone()
+        return self._title_entry(row) if row is not None else None
+
+    def scraped_paths_by_url(self, source: Optional[str] = None) -> Dict[str, str]:
+        """Map article URL -> absolute scraped file path, for articles that have one.
+
+        Args:
+            source: Only articles of this source (case-insensitive).
+        """
+        sql = 'SELECT url, scraped_path FROM articles WHERE url IS NOT NULL AND scraped_path IS NOT NULL'
+        params = ()
+        if source:
+            sql += ' AND lower(source) = ?'
+            params = (source.lower(),)
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(sql, params).fetchall()
+        return {r['url']: self._abs_path(r['scraped_path']) for r in rows}
+
+    def scraped_since(self, fetched_after: str) -> List[Dict]:
+        """Scraped articles fetched at or after `fetched_after` (ISO timestamp), oldest first.
+
+        Each entry has id, source, url, title, content, fetched_at and the
+        absolute scraped path.
+        """
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                'SELECT id, source, url, title, content, fetched_at, scraped_path FROM articles '
+                'WHERE scraped_path IS NOT NULL AND url IS NOT NULL AND fetched_at >= ? ORDER BY fetched_at',
+                (fetched_after,),
+            ).fetchall()
+        return [dict(r, scraped_path=self._abs_path(r['scraped_path'])) for r in rows]
+
+    def scraped_by_url_key(self, keys: List[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Return (article id, absolute scraped path) of the first scraped article with one of
+        the URL keys (see core/urls.py), or (None, None)."""
+        keys = [k for k in keys if k]
+        if not keys:
+            return None, None
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                f'SELECT id, scraped_path FROM articles WHERE url_key IN ({",".join("?" for _ in keys)}) '
+                'AND scraped_path IS NOT NULL ORDER BY CAST(id AS INTEGER) LIMIT 1', keys,
+            ).fetchone()
+        return (row['id'], self._abs_path(row['scraped_path'])) if row else (None, None)
+
+    def _title_entry(self, row) -> Dict:
+        rel = row['analysis_path'] or row['scraped_path']
+        return {
+            'id': row['id'],
+            'source': row['source'],
+            'title': row['title'],
+            'has_analysis': row['analysis_path'] is not None,
+            'path': self._abs_path(rel) if rel else None,
+        }
+
+    def label_counts(self, by: str = 'source') -> List[Dict]:
+        """Return analyzed-article counts per label, grouped by 'source' or 'day'.
+
+        Read from the incrementally maintained rollup, so the cost depends on the
+        number of (source, day, label) cells rather than on the corpus size.
+
+        Returns:
+            List of dicts with the group key under `by`, 'label', 'n', and
+            'avg_score' (None when no article in the cell has a score).
+        """
+        if by not in ('source', 'day'):
+            raise ValueError(f"by must be 'source' or 'day', not {by!r}")
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                f'SELECT {by} AS key, label, SUM(n) AS n, SUM(scored) AS scored, SUM(score_sum) AS score_sum '
+                f'FROM label_counts GROUP BY {by}, label ORDER BY {by}, label'
+            ).fetchall()
+        return [
+            {
+                by: r['key'],
+                'label': r['label'],
+                'n': r['n'],
+                'avg_score': r['score_sum'] / r['scored'] if r['scored'] else None,
+            }
+            for r in rows
+        ]
+
+    def search(self, query: str, limit: Optional[int] = 20, offset: int = 0,
+               analyzed_only: bool = False) -> List[Dict]:
+        """Full-text search over title, content and analysis summary.
+
+        Query words are diacritic-folded and lightly stemmed, then matched as
+        prefixes, so 'wybory' also finds 'wyborach' and 'lodz' finds 'Łódź'.
+
+        Args:
+            query: Free-text query.
+            limit: Maximum number of hits (None for all).
+            offset: Number of hits to skip (pagination).
+            analyzed_only: Only return articles that have an analysis.
+
+        Returns:
+            List of dicts (id, source, title, url, score, label, summary, has_analysis)
+            ordered by relevance.
+        """
+        terms = [stem_token(t) for t in tokenize(query)]
+        terms = [t for t in terms if t]
+        if not terms:
+            return []
+        extra = ' AND a.analysis_path IS NOT NULL' if analyzed_only else ''
+        if limit is None:
+            limit = -1
+        with self._lock:
+            conn = self._connect()
+            if self.has_fts:
+                match = ' AND '.join(f'"{t}"*' for t in terms)
+                sql = (
+                    'SELECT a.* FROM articles_fts f JOIN articles a ON a.id = f.article_id '
+                    f'WHERE articles_fts MATCH ?{extra} '
+                    'ORDER BY bm25(articles_fts, 0.0, 10.0, 1.0, 4.0) LIMIT ? OFFSET ?'
+                )
+                params = [match, limit, offset]
+            else:
+                conds = ' AND '.join("(f.title || ' ' || f.content || ' ' || f.summary) LIKE ?" for _ in terms)
+                sql = (
+                    'SELECT a.* FROM articles_fts f JOIN articles a ON a.id = f.article_id '
+                    f'WHERE {conds}{extra} ORDER BY a.id DESC LIMIT ? OFFSET ?'
+                )
+                params = [f'%{t}%' for t in terms] + [limit, offset]
+            rows = conn.execute(sql, params).fetchall()
+        return [
+            {
+                'id': r['id'],
+                'source': r['source'],
+                'title': r['title'],
+                'url': r['url'],
+                'score': r['score'],
+                'label': r['label'],
+                'summary': r['summary'],
+                'has_analysis': r['analysis_path'] is not None,
+            }
+            for r in rows
+        ]
+
+
+_indexes: Dict[str, CorpusIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(reports_dir: Optional[str] = None) -> CorpusIndex:
+    """Return the shared CorpusIndex for a reports directory."""
+    key = os.path.normpath(os.path.abspath(reports_dir or REPORTS_DIR))
+    with _indexes_lock:
+        idx = _indexes.get(key)
+        if idx is None:
+            idx = _indexes[key] = CorpusIndex(key)
+        return idx
+
+
+def record_report_removed(path):
+    """Update the index after a report file was deleted (or moved out of reports/).
+
+    Best-effort, like `record_report_file`; `sync()` notices removals as well.
+    """
+    try:
+        path = os.path.abspath(str(path))
+        reports_dir = os.path.dirname(os.path.dirname(path))
+        get_index(reports_dir).remove_file(path)
+    except Exception:
+        pass
+
+
+def record_report_file(path, data: Optional[dict] = None):
+    """Update the index after a report file was written.
+
+    Best-effort: indexing errors are swallowed so saving a report never fails
+    because of the index (the next `sync()` will pick the file up).
+    """
+    try:
+        path = os.path.abspath(str(path))
+        reports_dir = os.path.dirname(os.path.dirname(path))
+        get_index(reports_dir).index_file(path, data)
+    except Exception:
+        pass
@@ -0,0 +1,22 @@
+"""Reading and atomically rewriting report JSON files."""
+import json
+import os
+from typing import Optional
+
+
+def read_json(path: str) -> Optional[dict]:
+    """Load a JSON object from `path`; None if the file is missing, unreadable or not an object."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else None
+    except Exception:
+        return None
+
+
+def write_json_atomic(path: str, data: dict):
+    """Write `data` to `path` through a temporary file, so readers never see a partial file."""
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
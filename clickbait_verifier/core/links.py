@@ -0,0 +1,127 @@
+"""Article-link classification for listing pages.
+
+A `LinkClassifier` is built once per source from its config.yaml entry and
+decides which anchors of the source's listing page are article links:
+
+- relative (`/x`) and protocol-relative (`//host/x`) hrefs are made absolute,
+  anything else that is not http(s) is dropped;
+- only links on the listing's host, other than the listing itself;
+- not in a non-article section (BLACKLIST) and not a pagination link (`,nPack,`);
+- when the source sets `article_url_pattern`, the URL must match it, or
+  contain one of FALLBACK_MARKERS (RMF's `,nId,` article ids).
+
+`extract(html)` reads hrefs with lxml directly, which is several times faster
+than a BeautifulSoup pass over a large listing page; a soup that is already
+parsed can be passed instead.
+"""
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# URL fragments of sections that never contain single articles
+BLACKLIST = ('/tylko-w-rmf24', '/galeria', '/wideo', '/video', '/tag/', '/tag-')
+# Listing pagination (RMF `,nPack,<n>`)
+PAGINATION_MARKERS = (',npack,',)
+# Accepted even when `article_url_pattern` does not match
+FALLBACK_MARKERS = (',nid,',)
+
+# Reasons returned by LinkClassifier.reason()
+ACCEPTED = 'article'
+
+
+def _any_of(markers: Iterable[str]) -> Optional['re.Pattern']:
+    markers = list(markers)
+    return re.compile('|'.join(re.escape(m) for m in markers), re.I) if markers else None
+
+
+class LinkClassifier:
+    """Compiled link filter for one source's listing page."""
+
+    def __init__(self, list_url: str, article_url_pattern: Optional[str] = None,
+                 blacklist: Iterable[str] = BLACKLIST, pagination: Iterable[str] = PAGINATION_MARKERS,
+                 fallback: Iterable[str] = FALLBACK_MARKERS):
+        parts = urlsplit(list_url)
+        self.list_url = list_url
+        self.scheme = parts.scheme or 'https'
+        self.host = parts.netloc
+        self._origin = f'{self.scheme}://{self.host}'
+        self._blacklist = _any_of(blacklist)
+        self._pagination = _any_of(pagination)
+        self._fallback = _any_of(fallback)
+        self.pattern = None
+        if article_url_pattern:
+            try:
+                self.pattern = re.compile(article_url_pattern)
+            except re.error as e:
+                print(f"Invalid article_url_pattern {article_url_pattern!r} for {list_url}: {e}; ignoring it")
+
+    @classmethod
+    def for_source(cls, source: dict) -> 'LinkClassifier':
+        """Classifier for a config.yaml source entry (cached per url/pattern)."""
+        key = (source.get('url'), source.get('article_url_pattern'))
+        with _cache_lock:
+            classifier = _cache.get(key)
+            if classifier is None:
+                classifier = _cache[key] = cls(source.get('url'), source.get('article_url_pattern'))
+            return classifier
+
+    def absolute(self, href: str) -> Optional[str]:
+        """Absolute http(s) URL for an href, without fragment; None for other schemes/relative paths."""
+        href = href.strip()
+        if href.startswith('//'):
+            href = 'https:' + href
+        elif href.startswith('/'):
+            href = self._origin + href
+        elif not href.startswith('http'):
+            return None
+        return href.split('#', 1)[0]
+
+    def reason(self, href: str) -> Tuple[Optional[str], str]:
+        """Return (absolute url or None, ACCEPTED or the reason the link was rejected)."""
+        url = self.absolute(href)
+        if url is None:
+            return None, 'not http'
+        if urlsplit(url).netloc != self.host:
+            return url, 'other host'
+        if url == self.list_url:
+            return url, 'listing itself'
+        if self._blacklist and self._blacklist.search(url):
+            return url, 'blacklisted section'
+        if self._pagination and self._pagination.search(url):
+            return url, 'pagination'
+        if self.pattern and not self.pattern.search(url) \
+                and not (self._fallback and self._fallback.search(url)):
+            return url, 'no pattern match'
+        return url, ACCEPTED
+
+    def classify(self, href: str) -> Optional[str]:
+        """Absolute article URL for an href, or None when it is not an article link."""
+        url, why = self.reason(href)
+        return url if why == ACCEPTED else None
+
+    def hrefs(self, html) -> List[str]:
+        """All anchor hrefs of a listing page (HTML text, bytes or a parsed BeautifulSoup)."""
+        if hasattr(html, 'find_all'):
+            return [a['href'] for a in html.find_all('a', href=True)]
+        import lxml.html
+        try:
+            doc = lxml.html.fromstring(html)
+        except ValueError:  # str with an XML encoding declaration
+            doc = lxml.html.fromstring(html.encode('utf-8'))
+        except Exception:  # empty document / parser error
+            return []
+        return doc.xpath('//a/@href')
+
+    def extract(self, html) -> List[str]:
+        """Article links of a listing page, de-duplicated, in page order."""
+        links: Dict[str, None] = {}
+        for href in self.hrefs(html):
+            url = self.classify(href)
+            if url:
+                links.setdefault(url)
+        return list(links)
+
+
+_cache: Dict[tuple, LinkClassifier] = {}
+_cache_lock = threading.Lock()
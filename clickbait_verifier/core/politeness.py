@@ -0,0 +1,349 @@
+"""Per-host request pacing with AIMD backoff (politeness controller).
+
+Every page fetch goes through `slot(url)`, which waits until the host has a
+free concurrency slot and its minimum interval (1 / rate) has passed since the
+previous request started. The outcome reported back adjusts the host:
+
+- healthy responses (no errors, latency not far above the host's best) raise
+  the rate additively towards the configured ceiling and allow one more
+  concurrent request every INCREASE_EVERY successes;
+- 429/503, timeouts and connection errors halve both rate and concurrency and
+  pause the host for Retry-After (or BACKOFF_PAUSE_S when not given).
+
+Ceilings come from config.yaml: the global `rate_limit_per_sec`, optionally
+overridden per source, and `max_concurrency_per_host`. A robots.txt
+`Crawl-delay` (core/robots.py) lowers the rate ceiling further and limits the
+host to one request at a time. The learned state per host is kept in the
+crawl state database, so a run starts from what the previous one found the
+publisher tolerates; `rates()` exposes it.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+
+from .crawl_state import CrawlState, get_crawl_state
+from .deadlines import DeadlineExceeded, remaining as deadline_remaining
+from .fetch_policy import host_of
+
+DEFAULT_RATE_PER_SEC = 1.0
+DEFAULT_MAX_CONCURRENCY = 4
+MIN_RATE_PER_SEC = 0.05
+# Successes needed for one additive increase
+INCREASE_EVERY = 10
+# Rate added per increase, as a fraction of the host's ceiling
+INCREASE_STEP = 0.1
+# A response slower than this multiple of the host's best latency is not "healthy"
+SLOW_FACTOR = 2.0
+BACKOFF_PAUSE_S = 30.0
+MAX_RETRY_AFTER_S = 600.0
+BACKOFF_STATUSES = (429, 503)
+LATENCY_ALPHA = 0.2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS host_politeness (
+    host TEXT PRIMARY KEY,
+    rate REAL NOT NULL,
+    concurrency INTEGER NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0,
+    latency_s REAL,
+    best_latency_s REAL,
+    backoffs INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def parse_retry_after(value, now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+class _Host:
+    def __init__(self, max_rate: float, max_concurrency: int):
+        self.max_rate = max_rate
+        self.max_concurrency = max_concurrency
+        self.rate = max_rate
+        self.concurrency = 1
+        self.in_flight = 0
+        self.next_start = 0.0
+        self.blocked_until = 0.0
+        self.latency_s = None
+        self.best_latency_s = None
+        self.successes = 0
+        self.backoffs = 0
+
+
+class PolitenessController:
+    """Per-host pacing, concurrency limits and AIMD adjustment."""
+
+    def __init__(self, state: Optional[CrawlState] = None, default_rate: float = DEFAULT_RATE_PER_SEC,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.state = state
+        self.default_rate = default_rate
+        self.max_concurrency = max_concurrency
+        self._host_rates: Dict[str, float] = {}
+        self._crawl_delays: Dict[str, float] = {}
+        self._hosts: Dict[str, _Host] = {}
+        self._cond = threading.Condition()
+
+    def configure(self, cfg: Optional[dict]):
+        """Read ceilings from a parsed config.yaml (global and per-source `rate_limit_per_sec`)."""
+        if not isinstance(cfg, dict):
+            return
+        with self._cond:
+            if cfg.get('rate_limit_per_sec'):
+                self.default_rate = float(cfg['rate_limit_per_sec'])
+            if cfg.get('max_concurrency_per_host'):
+                self.max_concurrency = max(1, int(cfg['max_concurrency_per_host']))
+            for s in cfg.get('sources') or []:
+                if not isinstance(s, dict) or not s.get('rate_limit_per_sec'):
+                    continue
+                for key in ('url', 'rss'):
+                    if s.get(key):
+                        self._host_rates[host_of(s[key])] = float(s['rate_limit_per_sec'])
+            for name, h in self._hosts.items():
+                self._apply_ceilings(name, h)
+            self._cond.notify_all()
+
+    def set_crawl_delay(self, url: str, delay_s: Optional[float]):
+        """Apply a robots.txt Crawl-delay (seconds between requests) to the host of `url`."""
+        host = host_of(url if '//' in url else '//' + url)
+        with self._cond:
+            if delay_s and delay_s > 0:
+                self._crawl_delays[host] = float(delay_s)
+            else:
+                self._crawl_delays.pop(host, None)
+            if host in self._hosts:
+                self._apply_ceilings(host, self._hosts[host])
+            self._cond.notify_all()
+
+    def _ceilings(self, host: str):
+        rate = self._host_rates.get(host, self.default_rate)
+        delay = self._crawl_delays.get(host)
+        if delay:
+            return max(MIN_RATE_PER_SEC, min(rate, 1.0 / delay)), 1
+        return rate, self.max_concurrency
+
+    def _apply_ceilings(self, host: str, h: '_Host'):
+        h.max_rate, h.max_concurrency = self._ceilings(host)
+        h.rate = min(h.rate, h.max_rate)
+        h.concurrency = min(h.concurrency, h.max_concurrency)
+
+    def _conn(self):
+        return self.state.ensure_schema(_SCHEMA)
+
+    def _host(self, host: str) -> _Host:
+        """State of `host`, loaded from the crawl state database on first use.
+
+        Called without holding `_cond`: the database read must not stall
+        threads pacing other hosts.
+        """
+        with self._cond:
+            h = self._hosts.get(host)
+        if h is not None:
+            return h
+        row = None
+        if self.state is not None:
+            try:
+                with self.state.lock:
+                    row = self._conn().execute('SELECT * FROM host_politeness WHERE host = ?', (host,)).fetchone()
+            except Exception as e:
+                print(f"Politeness: could not load state for {host}: {e}")
+        with self._cond:
+            h = self._hosts.get(host)
+            if h is not None:  # another thread loaded it meanwhile
+                return h
+            h = self._hosts[host] = _Host(*self._ceilings(host))
+            if row is not None:
+                h.rate = max(MIN_RATE_PER_SEC, min(h.max_rate, row['rate']))
+                h.concurrency = max(1, min(h.max_concurrency, row['concurrency']))
+                h.blocked_until = row['blocked_until']
+                h.latency_s, h.best_latency_s = row['latency_s'], row['best_latency_s']
+                h.backoffs = row['backoffs']
+            return h
+
+    @staticmethod
+    def _snapshot(host: str, h: _Host) -> tuple:
+        """Row to persist for `host`; taken under `_cond`, written by `_save` after releasing it."""
+        return (host, h.rate, h.concurrency, h.blocked_until, h.latency_s, h.best_latency_s, h.backoffs,
+                time.time())
+
+    def _save(self, row: tuple):
+        if self.state is None:
+            return
+        try:
+            with self.state.lock:
+                conn = self._conn()
+                # a snapshot older than the stored row (threads finishing out of order) is dropped
+                conn.execute(
+                    'INSERT INTO host_politeness(host, rate, concurrency, blocked_until, latency_s, '
+                    'best_latency_s, backoffs, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT(host) DO UPDATE SET rate = excluded.rate, concurrency = excluded.concurrency, '
+                    'blocked_until = excluded.blocked_until, latency_s = excluded.latency_s, '
+                    'best_latency_s = excluded.best_latency_s, backoffs = excluded.backoffs, '
+                    'updated_at = excluded.updated_at WHERE excluded.updated_at >= host_politeness.updated_at',
+                    row)
+                conn.commit()
+        except Exception as e:
+            print(f"Politeness: could not save state for {row[0]}: {e}")
+
+    def acquire(self, url: str):
+        """Block until a request to `url`'s host may start; pair with `release`.
+
+        Raises DeadlineExceeded instead of waiting past the current deadline.
+        """
+        host = host_of(url)
+        h = self._host(host)
+        with self._cond:
+            while True:
+                now = time.time()
+                start = max(h.next_start, h.blocked_until)
+                if h.in_flight < h.concurrency and now >= start:
+                    break
+                wait = max(0.01, start - now) if h.in_flight < h.concurrency else None
+                left = deadline_remaining()
+                if left is not None:
+                    if left <= 0 or (wait is not None and start - now >= left):
+                        raise DeadlineExceeded(f'{host} is paused beyond the source time budget')
+                    wait = left if wait is None else wait
+                self._cond.wait(wait)
+            h.in_flight += 1
+            h.next_start = now + 1.0 / h.rate
+
+    def release(self, url: str, status: Optional[int] = None, latency_s: Optional[float] = None,
+                retry_after: Optional[float] = None, error: bool = False):
+        """Report a finished request and adjust the host.
+
+        Args:
+            url: Requested URL.
+            status: HTTP status, if a response arrived.
+            latency_s: Time to response.
+            retry_after: Seconds from the Retry-After header, if any.
+            error: True for timeouts/connection errors (treated like 429/503).
+        """
+        host = host_of(url)
+        h = self._host(host)
+        changed = False
+        with self._cond:
+            h.in_flight = max(0, h.in_flight - 1)
+            if error or status in BACKOFF_STATUSES:
+                changed = self._back_off(host, h, status, retry_after)
+            elif status is not None and status < 500 and latency_s is not None:
+                changed = self._on_success(h, latency_s)
+            row = self._snapshot(host, h) if changed else None
+            self._cond.notify_all()
+        if row is not None:
+            self._save(row)
+
+    def _back_off(self, host: str, h: _Host, status: Optional[int], retry_after: Optional[float]) -> bool:
+        pause = min(MAX_RETRY_AFTER_S, retry_after if retry_after is not None else BACKOFF_PAUSE_S)
+        h.rate = max(MIN_RATE_PER_SEC, h.rate / 2)
+        h.concurrency = max(1, h.concurrency // 2)
+        h.blocked_until = max(h.blocked_until, time.time() + pause)
+        h.successes = 0
+        h.backoffs += 1
+        print(f"Politeness: {host} answered {status or 'error'}; pausing {pause:.0f}s, "
+              f"rate {h.rate:.2f}/s, concurrency {h.concurrency}")
+        return True
+
+    def _on_success(self, h: _Host, latency_s: float) -> bool:
+        """Record a healthy response; True when rate or concurrency went up (state worth persisting)."""
+        h.latency_s = latency_s if h.latency_s is None else h.latency_s + LATENCY_ALPHA * (latency_s - h.latency_s)
+        h.best_latency_s = latency_s if h.best_latency_s is None else min(h.best_latency_s, latency_s)
+        if h.latency_s > SLOW_FACTOR * h.best_latency_s and h.latency_s > 1.0:
+            h.successes = 0
+            return False
+        h.successes += 1
+        if h.successes < INCREASE_EVERY:
+            return False
+        h.successes = 0
+        rate = min(h.max_rate, h.rate + INCREASE_STEP * h.max_rate)
+        concurrency = min(h.max_concurrency, h.concurrency + 1)
+        if (rate, concurrency) == (h.rate, h.concurrency):
+            return False
+        h.rate, h.concurrency = rate, concurrency
+        return True
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold a request slot for `url`; the yielded dict takes 'status' and 'retry_after'.
+
+        An exception inside the block counts as a connection error unless a
+        status was set; a request cancelled by the caller's deadline does not
+        count against the host.
+        """
+        self.acquire(url)
+        outcome = {'status': None, 'retry_after': None}
+        t0 = time.time()
+        try:
+            yield outcome
+        except DeadlineExceeded:
+            self.release(url, outcome['status'])
+            raise
+        except Exception:
+            self.release(url, outcome['status'], time.time() - t0, outcome['retry_after'],
+                         error=outcome['status'] is None)
+            raise
+        self.release(url, outcome['status'], time.time() - t0, outcome['retry_after'])
+
+    def wait_time(self, url: str) -> float:
+        """Seconds until the host of `url` accepts requests again (0 when not paused)."""
+        h = self._host(host_of(url))
+        with self._cond:
+            return max(0.0, h.blocked_until - time.time())
+
+    def rates(self) -> List[Dict]:
+        """Current per-host state: this process's hosts plus those persisted by earlier runs."""
+        result = {}
+        if self.state is not None:
+            try:
+                with self.state.lock:
+                    for row in self._conn().execute('SELECT * FROM host_politeness ORDER BY host'):
+                        result[row['host']] = dict(row)
+            except Exception:
+                pass
+        with self._cond:
+            for host, h in self._hosts.items():
+                result[host] = {'host': host, 'rate': h.rate, 'concurrency': h.concurrency,
+                                'blocked_until': h.blocked_until, 'latency_s': h.latency_s,
+                                'best_latency_s': h.best_latency_s, 'backoffs': h.backoffs,
+                                'max_rate': h.max_rate, 'in_flight': h.in_flight}
+        for row in result.values():
+            row['paused_until'] = (datetime.fromtimestamp(row['blocked_until']).isoformat(timespec='seconds')
+                                   if row.get('blocked_until', 0) > time.time() else None)
+        return [result[k] for k in sorted(result)]
+
+
+_controllers: Dict[str, PolitenessController] = {}
+_controllers_lock = threading.Lock()
+
+
+def get_politeness(reports_dir: Optional[str] = None) -> PolitenessController:
+    """Return the shared PolitenessController, configured from config.yaml on first use."""
+    state = get_crawl_state(reports_dir)
+    with _controllers_lock:
+        controller = _controllers.get(state.db_path)
+        if controller is None:
+            controller = _controllers[state.db_path] = PolitenessController(state)
+            try:
+                import yaml
+                with open('config.yaml', encoding='utf-8') as f:
+                    controller.configure(yaml.safe_load(f))
+            except Exception:
+                pass
+        return controller
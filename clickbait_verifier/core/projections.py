@@ -0,0 +1,89 @@
+"""API response shapes for analyzed articles.
+
+The list card and detail view served by api_server are built here from the
+analysis JSON (plus the image resolved from the scraped file). The corpus index
+calls these when an analysis is indexed and stores the result, so request
+handlers only have to serialize precomputed rows.
+"""
+from typing import Any, Dict, Optional
+
+PLACEHOLDER_IMAGE_URL = "https://via.placeholder.com/400x250/5E35B1/FFFFFF?text={source}"
+# Local thumbnails (core/images.py) are served by api_server under this path
+THUMB_URL_PREFIX = "/thumbs/"
+
+
+def scraped_image_url(scraped: Optional[dict]) -> Optional[str]:
+    """Return the lead image stored in a scraped file (new or legacy format)."""
+    if not scraped:
+        return None
+    image_url = scraped.get('image_url') or scraped.get('lead_image_url') or scraped.get('image')
+    if not image_url:
+        meta = scraped.get('meta', {})
+        if isinstance(meta, dict):
+            image_url = meta.get('og:image') or meta.get('twitter:image')
+    return image_url or None
+
+
+def placeholder_image_url(analysis: dict) -> str:
+    source_name = analysis.get("source", "nieznane") or "nieznane"
+    return PLACEHOLDER_IMAGE_URL.format(source=source_name.upper())
+
+
+def build_card(article_id: str, analysis: dict, image_url: Optional[str] = None,
+               thumbnail_url: Optional[str] = None) -> Dict[str, Any]:
+    """Build the list-view article dict (GET /api/articles)."""
+    score = float(analysis.get("score", analysis.get("clickbait_score", 0)))
+    suggestions = analysis.get("suggestions", {})
+    return {
+        "id": article_id,
+        "title": analysis.get("title", "Brak tytułu"),
+        "url": analysis.get("url", ""),
+        "source": analysis.get("source", "nieznane"),
+        "imageUrl": image_url or placeholder_image_url(analysis),
+        "thumbnailUrl": thumbnail_url,
+        "publishedAt": analysis.get("published", analysis.get("date", "")),
+        "content": analysis.get("content", "")[:500] + "...",  # First 500 chars
+        "analysis": {
+            "clickbaitScore": score,
+            "hasClickbait": score > 50,
+            "emotionalTone": analysis.get("emotional_tone", "neutral"),
+            "sensationalism": analysis.get("sensationalism_level", analysis.get("label", "low")),
+            "summary": analysis.get("summary", analysis.get("content", "")[:200] + "..."),  # Short article summary
+            "reasoning": "\n".join(analysis.get("rationale_user_friendly", analysis.get("rationale", ["Brak uzasadnienia"]))),
+            "manipulationTechniques": analysis.get("manipulation_techniques", analysis.get("signals", {}).get("title_hits", [])),
+            "factualBasis": analysis.get("factual_basis", "nieznana"),
+            "suggestedTitle": suggestions.get("rewrite_title_neutral", None),
+            # the article was revised after this analysis; a new one is queued
+            "needsReanalysis": bool(analysis.get("needs_reanalysis"))
+        }
+    }
+
+
+def build_detail(article_id: str, analysis: dict, image_url: Optional[str] = None,
+                 thumbnail_url: Optional[str] = None) -> Dict[str, Any]:
+    """Build the detail-view article dict (GET /api/articles/{id})."""
+    score = float(analysis.get("score", analysis.get("clickbait_score", 0)))
+    suggestions = analysis.get("suggestions", {})
+    return {
+        "id": article_id,
+        "title": analysis.get("title", "Brak tytułu"),
+        "url": analysis.get("url", ""),
+        "source": analysis.get("source", "nieznane"),
+        "imageUrl": analysis.get("image_url") or image_url or placeholder_image_url(analysis),
+        "thumbnailUrl": thumbnail_url,
+        "publishedAt": analysis.get("published", analysis.get("date", "")),
+        "content": analysis.get("content", ""),
+        "analysis": {
+            "clickbaitScore": score,
+            "hasClickbait": score > 50,
+            "emotionalTone": analysis.get("emotional_tone", "neutral"),
+            "sensationalism": analysis.get("sensationalism_level", analysis.get("label", "low")),
+            "summary": analysis.get("summary", "\n".join(analysis.get("rationale_user_friendly", ["Brak podsumowania"]))),
+            "reasoning": "\n".join(analysis.get("rationale", analysis.get("reasoning", ["Brak uzasadnienia"]))),
+            "manipulationTechniques": analysis.get("manipulation_techniques", analysis.get("signals", {}).get("title_hits", [])),
+            "factualBasis": analysis.get("factual_basis", "nieznana"),
+            "suggestedTitle": suggestions.get("rewrite_title_neutral", None),
+            "needsReanalysis": bool(analysis.get("needs_reanalysis")),
+            # editorNotes intentionally omitted from list response
+        }
+    }
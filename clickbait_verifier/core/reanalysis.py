@@ -0,0 +1,66 @@
+"""Analyses that are out of date because their article was revised.
+
+When a revisit (clickbait_verifier/revisit.py) stores a new revision of an
+article, the article's analysis stays in place and is still served by the
+API, feed and dashboard, but it is flagged with STALE_FLAG. Analysis runs
+treat a flagged analysis like a missing one (`needs_analysis`); before the
+fresh analysis is written, `retire_stale` moves the flagged file to
+reports/analysis/superseded/ so the new one takes its place.
+"""
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+from .index import record_report_file
+from .jsonio import read_json, write_json_atomic
+
+STALE_FLAG = 'needs_reanalysis'
+SUPERSEDED_DIRNAME = 'superseded'
+
+
+def needs_analysis(analysis: Optional[dict]) -> bool:
+    """True if an article with this analysis (None: none yet) should be analysed."""
+    return analysis is None or bool(analysis.get(STALE_FLAG))
+
+
+def analysis_path(analysis_dir, article_id) -> str:
+    return os.path.join(str(analysis_dir), f'analysis_{article_id}.json')
+
+
+def mark_stale(path: str, revision: int) -> Optional[Dict]:
+    """Flag the analysis at `path` as analysing an older revision than `revision`.
+
+    Returns {score, label} of the analysis, or None if there is none or it
+    was already flagged (it then belongs to an earlier revision).
+    """
+    data = read_json(path)
+    if data is None or data.get(STALE_FLAG):
+        return None
+    data[STALE_FLAG] = True
+    data['stale_since'] = datetime.now().isoformat()
+    data['analysed_revision'] = revision - 1
+    write_json_atomic(path, data)
+    record_report_file(path, data)
+    return {'score': data.get('score'), 'label': data.get('label')}
+
+
+def retire_stale(path) -> Optional[str]:
+    """Move a flagged analysis at `path` to superseded/ before its replacement is written.
+
+    Returns the new path, or None when `path` holds no flagged analysis.
+    """
+    path = str(path)
+    data = read_json(path)
+    if not data or not data.get(STALE_FLAG):
+        return None
+    directory, name = os.path.split(path)
+    target_dir = os.path.join(directory, SUPERSEDED_DIRNAME)
+    os.makedirs(target_dir, exist_ok=True)
+    stem = name[:-len('.json')]
+    target = os.path.join(target_dir, f"{stem}_r{data.get('analysed_revision') or 1}.json")
+    i = 1
+    while os.path.exists(target):
+        target = os.path.join(target_dir, f"{stem}_r{data.get('analysed_revision') or 1}_{i}.json")
+        i += 1
+    os.replace(path, target)
+    return target
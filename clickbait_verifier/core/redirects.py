@@ -0,0 +1,131 @@
+"""Persistent URL alias / redirect-resolution cache (crawl state).
+
+Maps the key (see core/urls.py) of every URL an article was reached under -
+the requested URL, the URL after redirects - to the key of the article's
+canonical URL (`<link rel=canonical>` when present, otherwise the final URL).
+Looking a URL up before fetching tells whether the story is already stored
+under another URL.
+
+Links on known URL shorteners (SHORTENER_HOSTS) are resolved with one HEAD
+request the first time they are seen; the result is cached like any other
+redirect.
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from .crawl_state import CrawlState, get_crawl_state
+from .deadlines import DeadlineExceeded, cap_timeout
+from .politeness import get_politeness
+from .urls import strip_host, url_key
+
+SHORTENER_HOSTS = frozenset({
+    'bit.ly', 'buff.ly', 'dlvr.it', 'fb.me', 'feedproxy.google.com', 'goo.gl', 'is.gd', 'ow.ly',
+    't.co', 'tinyurl.com', 'trib.al',
+})
+RESOLVE_TIMEOUT_S = 10
+# Alias chains (a -> b -> c) are followed at most this far
+MAX_HOPS = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS url_aliases (
+    url_key TEXT PRIMARY KEY,
+    canonical_key TEXT NOT NULL,
+    final_url TEXT,
+    canonical_url TEXT,
+    resolved_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_url_aliases_canonical ON url_aliases(canonical_key);
+"""
+
+
+class UrlAliases:
+    """Alias table: URL key -> canonical key of the article it leads to."""
+
+    def __init__(self, state: CrawlState):
+        self.state = state
+
+    def _conn(self):
+        return self.state.ensure_schema(_SCHEMA)
+
+    def record(self, url: str, final_url: Optional[str] = None, canonical_url: Optional[str] = None):
+        """Remember that `url` (redirected to `final_url`) is the article at `canonical_url`."""
+        target = canonical_url or final_url or url
+        target_key = url_key(target)
+        if not target_key:
+            return
+        now = time.time()
+        rows = [(key, target_key, final_url, canonical_url, now)
+                for key in {url_key(url), url_key(final_url)} if key and key != target_key]
+        if not rows:
+            return
+        with self.state.lock:
+            conn = self._conn()
+            conn.executemany(
+                'INSERT OR REPLACE INTO url_aliases(url_key, canonical_key, final_url, canonical_url, resolved_at) '
+                'VALUES (?, ?, ?, ?, ?)', rows)
+            conn.commit()
+
+    def canonical_url(self, url: str) -> Optional[str]:
+        """The canonical URL recorded for `url`, if it differs from it."""
+        with self.state.lock:
+            row = self._conn().execute('SELECT canonical_url, final_url FROM url_aliases WHERE url_key = ?',
+                                       (url_key(url),)).fetchone()
+        return (row['canonical_url'] or row['final_url']) if row else None
+
+    def resolve(self, url: str, follow_shorteners: bool = True) -> Optional[str]:
+        """Canonical key for `url`, following recorded aliases (and resolving short links)."""
+        key = url_key(url)
+        if not key:
+            return None
+        seen = {key}
+        with self.state.lock:
+            conn = self._conn()
+            for _ in range(MAX_HOPS):
+                row = conn.execute('SELECT canonical_key FROM url_aliases WHERE url_key = ?', (key,)).fetchone()
+                if row is None or row['canonical_key'] in seen:
+                    break
+                key = row['canonical_key']
+                seen.add(key)
+        if len(seen) == 1 and follow_shorteners and strip_host(urlsplit(url).netloc) in SHORTENER_HOSTS:
+            final_url = self._resolve_redirect(url)
+            if final_url:
+                self.record(url, final_url)
+                return self.resolve(final_url, follow_shorteners=False)
+        return key
+
+    def keys(self, url: str) -> List[str]:
+        """Keys to look an article up by: the URL's own key and its resolved canonical key."""
+        keys = [k for k in (url_key(url), self.resolve(url)) if k]
+        return list(dict.fromkeys(keys))
+
+    @staticmethod
+    def _resolve_redirect(url: str) -> Optional[str]:
+        try:
+            with get_politeness().slot(url) as outcome:
+                r = requests.head(url, allow_redirects=True, timeout=cap_timeout(RESOLVE_TIMEOUT_S),
+                                  headers={'User-Agent': 'Mozilla/5.0'})
+                outcome['status'] = r.status_code
+            return r.url if r.url and r.url != url else None
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"Could not resolve redirect for {url}: {e}")
+            return None
+
+
+_aliases: Dict[str, UrlAliases] = {}
+_aliases_lock = threading.Lock()
+
+
+def get_url_aliases(reports_dir: Optional[str] = None) -> UrlAliases:
+    """Return the shared UrlAliases of a reports directory."""
+    state = get_crawl_state(reports_dir)
+    with _aliases_lock:
+        aliases = _aliases.get(state.db_path)
+        if aliases is None:
+            aliases = _aliases[state.db_path] = UrlAliases(state)
+        return aliases
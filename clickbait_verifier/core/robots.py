@@ -0,0 +1,234 @@
+"""robots.txt cache and allow checks.
+
+`allowed(url)` answers from memory: each host's robots.txt is fetched once,
+compiled into a rule list and kept for ROBOTS_TTL_S (also persisted in the
+crawl state database, so a new run does not re-download it). After the first
+lookup per host a check is a dict lookup plus a few `startswith` calls.
+
+Matching follows the robots exclusion standard (RFC 9309): the groups whose
+User-agent equals ROBOTS_USER_AGENT or is a prefix of it (case-insensitive,
+`clickbait` matches, `bot` or `clickbait-verifier-extra` do not), else `*`; the longest matching Allow/Disallow path wins,
+Allow on a tie; `*` wildcards and a trailing `$` are supported. A 4xx answer
+means no restrictions. On a 5xx or network error a stale cached copy is used
+if there is one, otherwise the host is treated as unrestricted and asked
+again after ERROR_TTL_S.
+
+`Crawl-delay` of the matching group is passed to the politeness controller
+(core/politeness.py) as the host's rate ceiling.
+"""
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from .crawl_state import CrawlState, get_crawl_state
+from .deadlines import DeadlineExceeded, cap_timeout
+from .politeness import get_politeness
+
+# Product token matched against robots.txt User-agent lines
+ROBOTS_USER_AGENT = 'clickbait-verifier'
+ROBOTS_TTL_S = 24 * 3600
+ERROR_TTL_S = 600
+FETCH_TIMEOUT_S = 10
+MAX_ROBOTS_BYTES = 512 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS robots_cache (
+    origin TEXT PRIMARY KEY,
+    status INTEGER,
+    body TEXT,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class RobotsDisallowed(Exception):
+    """Raised when robots.txt does not allow fetching a URL."""
+
+
+class RobotsRules:
+    """Compiled rules of one robots.txt group."""
+
+    def __init__(self, rules: List[Tuple[str, bool]], crawl_delay: Optional[float] = None,
+                 sitemaps: Optional[List[str]] = None):
+        # longest pattern first, Allow before Disallow on equal length
+        compiled = []
+        for pattern, allow in sorted(rules, key=lambda r: (-len(r[0]), not r[1])):
+            if '*' in pattern or pattern.endswith('$'):
+                regex = re.escape(pattern).replace(r'\*', '.*')
+                if regex.endswith(r'\$'):
+                    regex = regex[:-2] + '$'
+                compiled.append((None, re.compile(regex).match, allow))
+            else:
+                compiled.append((pattern, None, allow))
+        self._rules = compiled
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps or []
+
+    def allows(self, path: str) -> bool:
+        if path == '/robots.txt':
+            return True
+        for prefix, match, allow in self._rules:
+            if (path.startswith(prefix) if prefix is not None else match(path)):
+                return allow
+        return True
+
+
+ALLOW_ALL = RobotsRules([])
+
+
+def parse_robots(text: str, user_agent: str = ROBOTS_USER_AGENT) -> RobotsRules:
+    """Compile the robots.txt group that applies to `user_agent`."""
+    groups: List[Tuple[List[str], List[Tuple[str, bool]], List[Optional[float]]]] = []
+    sitemaps = []
+    agents: List[str] = []
+    current = None
+    for raw in text.splitlines():
+        line = raw.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        field, value = (part.strip() for part in line.split(':', 1))
+        field = field.lower()
+        if field == 'sitemap':
+            sitemaps.append(value)
+            continue
+        if field == 'user-agent':
+            if current is not None:  # a rule line ended the previous group
+                current = None
+                agents = []
+            agents.append(value.split('/', 1)[0].strip().lower())  # 'name/1.0' -> 'name'
+            continue
+        if current is None:
+            if not agents:
+                continue
+            current = (agents, [], [None])
+            groups.append(current)
+        if field in ('allow', 'disallow') and value:
+            current[1].append((value, field == 'allow'))
+        elif field == 'crawl-delay':
+            try:
+                current[2][0] = float(value)
+            except ValueError:
+                pass
+
+    token = user_agent.lower()
+    specific = [g for g in groups if any(a and a != '*' and token.startswith(a) for a in g[0])]
+    chosen = specific or [g for g in groups if '*' in g[0]]
+    rules = [r for g in chosen for r in g[1]]
+    delays = [g[2][0] for g in chosen if g[2][0] is not None]
+    return RobotsRules(rules, max(delays) if delays else None, sitemaps)
+
+
+class RobotsCache:
+    """Per-origin robots.txt rules: in memory, persisted, refreshed after ROBOTS_TTL_S."""
+
+    def __init__(self, state: Optional[CrawlState] = None):
+        self.state = state
+        self._rules: Dict[str, Tuple[RobotsRules, float]] = {}
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+
+    def allowed(self, url: str) -> bool:
+        """True if robots.txt of the URL's site allows fetching it."""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            return True
+        path = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+        return self.rules(f'{parts.scheme}://{parts.netloc.lower()}').allows(path)
+
+    def check(self, url: str):
+        """Raise RobotsDisallowed if robots.txt does not allow `url`."""
+        if not self.allowed(url):
+            raise RobotsDisallowed(f'robots.txt nie pozwala na pobranie {url}')
+
+    def rules(self, origin: str) -> RobotsRules:
+        entry = self._rules.get(origin)
+        if entry is not None and entry[1] > time.time():
+            return entry[0]
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(origin, threading.Lock())
+        with fetch_lock:  # one download per origin, other threads wait for it
+            entry = self._rules.get(origin)
+            if entry is not None and entry[1] > time.time():
+                return entry[0]
+            rules, expires_at = self._load(origin)
+            self._rules[origin] = (rules, expires_at)
+            get_politeness().set_crawl_delay(origin, rules.crawl_delay)
+            return rules
+
+    def _conn(self):
+        return self.state.ensure_schema(_SCHEMA)
+
+    def _load(self, origin: str) -> Tuple[RobotsRules, float]:
+        cached = None
+        if self.state is not None:
+            try:
+                with self.state.lock:
+                    cached = self._conn().execute('SELECT * FROM robots_cache WHERE origin = ?', (origin,)).fetchone()
+            except Exception as e:
+                print(f"robots.txt cache unavailable: {e}")
+        if cached is not None and cached['expires_at'] > time.time():
+            return self._compile(cached['status'], cached['body']), cached['expires_at']
+
+        now = time.time()
+        try:
+            with get_politeness().slot(origin + '/robots.txt') as outcome:
+                r = requests.get(origin + '/robots.txt', timeout=cap_timeout(FETCH_TIMEOUT_S),
+                                 headers={'User-Agent': f'Mozilla/5.0 (compatible; {ROBOTS_USER_AGENT})'})
+                outcome['status'] = r.status_code
+            status, body = r.status_code, r.content[:MAX_ROBOTS_BYTES].decode('utf-8', errors='replace')
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            status, body = None, None
+            print(f"Could not fetch {origin}/robots.txt: {e}")
+        if status is None or status >= 500:
+            if cached is not None:  # keep using the stale copy
+                return self._compile(cached['status'], cached['body']), now + ERROR_TTL_S
+            return ALLOW_ALL, now + ERROR_TTL_S
+
+        expires_at = now + ROBOTS_TTL_S
+        if self.state is not None:
+            try:
+                with self.state.lock:
+                    conn = self._conn()
+                    conn.execute('INSERT OR REPLACE INTO robots_cache(origin, status, body, fetched_at, expires_at) '
+                                 'VALUES (?, ?, ?, ?, ?)', (origin, status, body, now, expires_at))
+                    conn.commit()
+            except Exception as e:
+                print(f"Could not cache {origin}/robots.txt: {e}")
+        return self._compile(status, body), expires_at
+
+    def entries(self) -> List[Dict]:
+        """Persisted robots.txt entries with their Crawl-delay, for inspection."""
+        if self.state is None:
+            return []
+        with self.state.lock:
+            rows = self._conn().execute('SELECT * FROM robots_cache ORDER BY origin').fetchall()
+        return [{'origin': r['origin'], 'status': r['status'], 'fetched_at': r['fetched_at'],
+                 'expires_at': r['expires_at'], 'crawl_delay': self._compile(r['status'], r['body']).crawl_delay}
+                for r in rows]
+
+    @staticmethod
+    def _compile(status: Optional[int], body: Optional[str]) -> RobotsRules:
+        if status is None or status >= 400 or not body:
+            return ALLOW_ALL
+        return parse_robots(body)
+
+
+_caches: Dict[str, RobotsCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_robots(reports_dir: Optional[str] = None) -> RobotsCache:
+    """Return the shared RobotsCache of a reports directory."""
+    state = get_crawl_state(reports_dir)
+    with _caches_lock:
+        cache = _caches.get(state.db_path)
+        if cache is None:
+            cache = _caches[state.db_path] = RobotsCache(state)
+        return cache
@@ -0,0 +1,149 @@
+"""Scrape run journal for resuming interrupted runs.
+
+`run_scraper` records every URL it has dealt with (saved, already stored,
+skipped or failed) and every source it has finished, in the crawl state
+database. When a run dies half-way (crash, Ctrl+C, killed CI job) the next run
+continues the same journal: finished sources are skipped and URLs already
+dealt with are not fetched again. A run that completes is closed, so the next
+one starts a fresh journal.
+
+Only runs started within RESUME_MAX_AGE_S are resumed; an older unfinished run
+(e.g. a crashed CI job days ago) is abandoned and the next run starts fresh.
+Failed URLs, and sources whose time budget ran out, stay retryable on resume.
+Only the last KEEP_RUNS runs are kept.
+"""
+import time
+import uuid
+from typing import Dict, List, Optional, Set
+
+from .crawl_state import CrawlState, get_crawl_state
+
+KEEP_RUNS = 20
+# Older unfinished runs are abandoned instead of resumed
+RESUME_MAX_AGE_S = 6 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS scrape_run_sources (
+    run_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    PRIMARY KEY (run_id, source)
+);
+CREATE TABLE IF NOT EXISTS scrape_journal (
+    run_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL,
+    detail TEXT,
+    at REAL NOT NULL,
+    PRIMARY KEY (run_id, url)
+);
+"""
+
+
+class RunJournal:
+    """Progress of one scrape run."""
+
+    def __init__(self, state: CrawlState, run_id: str, resumed: bool = False):
+        self.state = state
+        self.run_id = run_id
+        self.resumed = resumed
+        self._seen: Set[str] = set()
+        self._finished: Set[str] = set()
+        if resumed:
+            with state.lock:
+                conn = self._conn()
+                self._seen = {r['url'] for r in conn.execute(
+                    "SELECT url FROM scrape_journal WHERE run_id = ? AND status != 'failed'", (run_id,))}
+                self._finished = {r['source'] for r in conn.execute(
+                    "SELECT source FROM scrape_run_sources WHERE run_id = ? AND status = 'done'", (run_id,))}
+
+    @classmethod
+    def start(cls, reports_dir: Optional[str] = None, resume: bool = True) -> 'RunJournal':
+        """Continue the last unfinished run younger than RESUME_MAX_AGE_S (if `resume`), else start a new one."""
+        state = get_crawl_state(reports_dir)
+        with state.lock:
+            conn = state.ensure_schema(_SCHEMA)
+            row = conn.execute('SELECT run_id FROM scrape_runs WHERE finished_at IS NULL AND started_at >= ? '
+                               'ORDER BY started_at DESC LIMIT 1', (time.time() - RESUME_MAX_AGE_S,)).fetchone()
+            if resume and row is not None:
+                return cls(state, row['run_id'], resumed=True)
+            # unfinished runs that are not resumed (too old, or resume=False) are abandoned
+            conn.execute('UPDATE scrape_runs SET finished_at = ? WHERE finished_at IS NULL', (time.time(),))
+            run_id = time.strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+            conn.execute('INSERT INTO scrape_runs(run_id, started_at) VALUES (?, ?)', (run_id, time.time()))
+            cls._prune(conn)
+            conn.commit()
+        return cls(state, run_id)
+
+    @staticmethod
+    def _prune(conn):
+        old = [r['run_id'] for r in conn.execute(
+            'SELECT run_id FROM scrape_runs ORDER BY started_at DESC LIMIT -1 OFFSET ?', (KEEP_RUNS,))]
+        for table in ('scrape_journal', 'scrape_run_sources', 'scrape_runs'):
+            conn.executemany(f'DELETE FROM {table} WHERE run_id = ?', [(r,) for r in old])
+
+    def _conn(self):
+        return self.state.ensure_schema(_SCHEMA)
+
+    def seen(self, url: str) -> bool:
+        """True if this run has already dealt with `url`."""
+        return url in self._seen
+
+    def record(self, source: str, url: str, status: str, detail: Optional[str] = None):
+        self._seen.add(url)
+        with self.state.lock:
+            conn = self._conn()
+            conn.execute('INSERT OR REPLACE INTO scrape_journal(run_id, source, url, status, detail, at) '
+                         'VALUES (?, ?, ?, ?, ?, ?)',
+                         (self.run_id, source, url, status, (detail or '')[:500] or None, time.time()))
+            conn.commit()
+
+    def source_finished(self, source: str) -> bool:
+        return source in self._finished
+
+    def finish_source(self, source: str, status: str = 'done'):
+        """Mark a source as dealt with ('done', or 'deadline' when its budget ran out)."""
+        self._finished.add(source)
+        with self.state.lock:
+            conn = self._conn()
+            conn.execute('INSERT OR REPLACE INTO scrape_run_sources(run_id, source, status, finished_at) '
+                         'VALUES (?, ?, ?, ?)', (self.run_id, source, status, time.time()))
+            conn.commit()
+
+    def finish(self):
+        """Close the run; the next run starts a new journal."""
+        with self.state.lock:
+            conn = self._conn()
+            conn.execute('UPDATE scrape_runs SET finished_at = ? WHERE run_id = ?', (time.time(), self.run_id))
+            conn.commit()
+
+    def summary(self) -> Dict:
+        """Per-status URL counts and per-source status of this run."""
+        with self.state.lock:
+            conn = self._conn()
+            counts = {r['status']: r['n'] for r in conn.execute(
+                'SELECT status, COUNT(*) AS n FROM scrape_journal WHERE run_id = ? GROUP BY status', (self.run_id,))}
+            sources = {r['source']: r['status'] for r in conn.execute(
+                'SELECT source, status FROM scrape_run_sources WHERE run_id = ?', (self.run_id,))}
+        return {'run_id': self.run_id, 'urls': counts, 'sources': sources}
+
+
+def recent_runs(reports_dir: Optional[str] = None, limit: int = 5) -> List[Dict]:
+    """Latest runs with their URL counts, newest first (for inspection)."""
+    state = get_crawl_state(reports_dir)
+    with state.lock:
+        conn = state.ensure_schema(_SCHEMA)
+        rows = conn.execute('SELECT * FROM scrape_runs ORDER BY started_at DESC LIMIT ?', (limit,)).fetchall()
+    runs = []
+    for r in rows:
+        info = RunJournal(state, r['run_id']).summary()
+        info.update(started_at=r['started_at'], finished_at=r['finished_at'])
+        runs.append(info)
+    return runs
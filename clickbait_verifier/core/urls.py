@@ -0,0 +1,146 @@
+"""URL canonicalization for de-duplicating articles.
+
+The same story reaches the scraper under many URLs: with tracking parameters,
+#fragments, http vs https, with and without `www.`, as an AMP variant or via a
+redirecting short link. `url_key(url)` maps all of them to one comparison key:
+
+- scheme is always https, host lowercase without `www.` / `m.` / `amp.`;
+- fragment dropped, trailing slash dropped, AMP path/query markers removed;
+- tracking parameters (TRACKING_PARAMS, utm_*) dropped and the rest sorted.
+
+Per-source rules come from the source entries in config.yaml (matched by the
+host of `url`/`rss`):
+
+  url_keep_params: [id]        # only these query parameters identify an article
+  url_drop_params: [src, ref]  # additional parameters to drop
+
+The key is only used for comparisons; articles keep the URL they were
+fetched from. `canonical_link(html, url)` reads `<link rel="canonical">`,
+which the scraper stores next to the fetched URL (see core/redirects.py).
+"""
+import re
+import threading
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', 'ocid', 'srcc',
+    '_ga', 'ref', 'ref_src', 'share', 'amp', 'outputtype', 'utm',
+})
+_HOST_PREFIXES = ('www.', 'm.', 'amp.')
+_AMP_PATH_RE = re.compile(r'(/amp/?$|\.amp$|\.amp(?=\.html?$)|^/amp(?=/))', re.I)
+_LINK_TAG_RE = re.compile(rb'<link\b[^>]*>', re.I)
+_ATTR_RE = re.compile(rb'''([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))''')
+# <link rel=canonical> is only looked for in the first part of the page
+CANONICAL_SNIFF_BYTES = 64 * 1024
+
+_rules: Dict[str, dict] = {}
+_rules_loaded = False
+_rules_lock = threading.Lock()
+
+
+def strip_host(host: str) -> str:
+    host = (host or '').lower().split('@')[-1]
+    if host.endswith(':443') or host.endswith(':80'):
+        host = host.rsplit(':', 1)[0]
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix):
+            return host[len(prefix):]
+    return host
+
+
+def configure(cfg: Optional[dict]):
+    """Load per-source URL rules from a parsed config.yaml."""
+    global _rules_loaded
+    rules = {}
+    sources = cfg.get('sources') or [] if isinstance(cfg, dict) else []
+    for s in sources:
+        if not isinstance(s, dict) or not (s.get('url_keep_params') or s.get('url_drop_params')):
+            continue
+        rule = {'keep': frozenset(p.lower() for p in s.get('url_keep_params') or []) or None,
+                'drop': frozenset(p.lower() for p in s.get('url_drop_params') or [])}
+        for key in ('url', 'rss'):
+            if s.get(key):
+                rules[strip_host(urlsplit(s[key]).netloc)] = rule
+    with _rules_lock:
+        _rules.clear()
+        _rules.update(rules)
+        _rules_loaded = True
+
+
+def _rules_for(host: str) -> Optional[dict]:
+    if not _rules_loaded:
+        try:
+            import yaml
+            with open('config.yaml', encoding='utf-8') as f:
+                configure(yaml.safe_load(f))
+        except Exception:
+            configure(None)
+    return _rules.get(host)
+
+
+def _keep_param(name: str, rule: Optional[dict]) -> bool:
+    low = name.lower()
+    if rule and rule['keep'] is not None:
+        return low in rule['keep']
+    if low in TRACKING_PARAMS or low.startswith('utm_') or (rule and low in rule['drop']):
+        return False
+    return True
+
+
+def url_key(url: Optional[str]) -> Optional[str]:
+    """Comparison key of an article URL (see module docstring); None for empty input."""
+    if not url:
+        return None
+    url = url.strip()
+    if url.startswith('//'):
+        url = 'https:' + url
+    parts = urlsplit(url)
+    if not parts.netloc:
+        return url
+    host = strip_host(parts.netloc)
+    rule = _rules_for(host)
+    path = _AMP_PATH_RE.sub('', parts.path) or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if _keep_param(k, rule))
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def same_site(a: str, b: str) -> bool:
+    return strip_host(urlsplit(a).netloc) == strip_host(urlsplit(b).netloc)
+
+
+def canonical_link(html, url: str) -> Optional[str]:
+    """The page's `<link rel="canonical">` as an absolute URL, or None.
+
+    Ignored when it points to another site or to the site's front page (a
+    common template mistake), since either would merge unrelated articles.
+    """
+    if not html:
+        return None
+    head = html[:CANONICAL_SNIFF_BYTES]
+    if isinstance(head, str):
+        head = head.encode('utf-8', errors='ignore')
+    for tag in _LINK_TAG_RE.findall(head):
+        attrs = {m.group(1).lower(): (m.group(2) or m.group(3) or m.group(4) or b'') for m in _ATTR_RE.finditer(tag)}
+        if b'canonical' not in attrs.get(b'rel', b'').lower().split():
+            continue
+        href = attrs.get(b'href', b'').decode('utf-8', errors='ignore').strip()
+        if not href:
+            return None
+        canonical = urljoin(url, href)
+        if not same_site(canonical, url) or urlsplit(canonical).path in ('', '/'):
+            return None
+        return canonical
+    return None
+
+
+def url_keys(urls: Iterable[Optional[str]]) -> list:
+    """Distinct keys of several URLs (e.g. fetched, final and canonical), in order."""
+    keys = []
+    for url in urls:
+        key = url_key(url)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
@@ -4,7 +4,10 @@ import json
 import os
 from pathlib import Path
 from .scraper import run_scraper, fetch_and_save_url
+from .revisit import run_revisits
 from .analyzer import GPTAnalyzer
+from .core.index import record_report_file
+from .core.reanalysis import needs_analysis, retire_stale
 import logging
 
 # Configure logging
@@ -33,6 +36,9 @@ def analyze_scraped_file(file_path: str, analyzer: GPTAnalyzer) -> bool:
             aid = article.get('id')
             analysis_path = analysis_dir / f"analysis_{aid}.json"
             
+            # A stale analysis (article revised since) is replaced, not suffixed
+            retire_stale(analysis_path)
+            
             # Handle existing files
             counter = 1
             while analysis_path.exists():
@@ -41,6 +47,7 @@ def analyze_scraped_file(file_path: str, analyzer: GPTAnalyzer) -> bool:
             
             with open(analysis_path, 'w', encoding='utf-8') as f:
                 json.dump(result, f, ensure_ascii=False, indent=2)
+            record_report_file(analysis_path, result)
             
             logger.info(f"✅ Analysis saved to: {analysis_path}")
             logger.info(f"   Score: {result.get('score')}, Label: {result.get('label')}")
@@ -54,7 +61,8 @@ def analyze_scraped_file(file_path: str, analyzer: GPTAnalyzer) -> bool:
         return False
 
 
-def run_with_analysis(scrape_args=None, analyze_all=False, auto_analyze=False, api_key=None, model="gpt-4o-mini"):
+def run_with_analysis(scrape_args=None, analyze_all=False, auto_analyze=False, api_key=None, model="gpt-4o-mini",
+                      resume=True):
     """
     Run scraper with optional automatic analysis.
     
@@ -64,6 +72,7 @@ def run_with_analysis(scrape_args=None, analyze_all=False, auto_analyze=False, a
         auto_analyze: If True, automatically analyze newly scraped content
         api_key: OpenAI API key
         model: OpenAI model to use
+        resume: Continue an interrupted scrape run instead of starting over
     """
     
     # Initialize analyzer if needed
@@ -82,7 +91,9 @@ def run_with_analysis(scrape_args=None, analyze_all=False, auto_analyze=False, a
         url, source, method = scrape_args
         scrape_result = fetch_and_save_url(url, source_name=source, fetch_method=method)
     else:
-        run_scraper()
+        run_scraper(resume=resume)
+        # re-check recent articles for edited titles/text (config.yaml: revisit)
+        run_revisits()
     
     # Auto-analyze newly scraped content
     if auto_analyze and analyzer and scrape_result and not scrape_result.get('existed'):
@@ -111,7 +122,7 @@ def run_with_analysis(scrape_args=None, analyze_all=False, auto_analyze=False, a
                 try:
                     with open(analysis_file, 'r', encoding='utf-8') as f:
                         data = json.load(f)
-                        if 'id' in data:
+                        if 'id' in data and not needs_analysis(data):
                             existing_analyses.add(str(data['id']))
                 except Exception:
                     continue
@@ -159,6 +170,9 @@ Examples:
   # Scrape single URL with auto-analysis
   python -m clickbait_verifier.main --url "https://example.com/article" --analyze
   
+  # Scrape all sources, ignoring the progress of an interrupted run
+  python -m clickbait_verifier.main --fresh-run
+
   # Analyze all unanalyzed scraped content
   python -m clickbait_verifier.main --analyze-all
   
@@ -172,6 +186,8 @@ Examples:
     parser.add_argument('--source', default='CLI', help='Source name (default: CLI)')
     parser.add_argument('--method', default='auto', choices=['auto', 'requests', 'playwright'], 
                        help='Fetch method (default: auto)')
+    parser.add_argument('--fresh-run', action='store_true',
+                       help='Start a new scrape run instead of resuming an interrupted one')
     
     # Analysis options
     parser.add_argument('--analyze', action='store_true', 
@@ -206,7 +222,8 @@ Examples:
         analyze_all=args.analyze_all,
         auto_analyze=args.analyze,
         api_key=args.api_key,
-        model=args.model
+        model=args.model,
+        resume=not args.fresh_run
     )
     
     return 0 if success else 1
@@ -0,0 +1,142 @@
+"""Offline re-extraction over the raw HTML archive.
+
+Runs the current `extract_content_and_title` (with the extractor YAML of each
+source) over every archived page that has a scraped file, diffs title /
+content / published against what is stored and optionally writes the changes
+back. Pages are parsed on a process pool; nothing is fetched.
+
+Usage (CLI wrapper): python scripts/reextract.py --source onet --show 5
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .content_extractor import load_extractor_for_source
+from .core.archive import get_archive, read_record
+from .core.index import REPORTS_DIR, get_index
+from .core.jsonio import write_json_atomic
+from .scraper import _format_datetime_for_json, extract_content_and_title
+
+REEXTRACT_FIELDS = ('title', 'content', 'published')
+
+# extractor YAMLs per source, loaded once per worker process
+_extractors: Dict[str, Optional[dict]] = {}
+
+
+def _extractor(source: Optional[str]) -> Optional[dict]:
+    if not source:
+        return None
+    if source not in _extractors:
+        _extractors[source] = load_extractor_for_source(source)
+    return _extractors[source]
+
+
+def _published_after_fetch(published: Optional[str], fetched_at: Optional[str]) -> bool:
+    """True if `published` is later than the fetch time.
+
+    Relative dates ('5 minut temu') resolve against the current time, so an
+    offline run dates them after the page was fetched; such values are ignored.
+    """
+    try:
+        return datetime.fromisoformat(published).replace(tzinfo=None) > datetime.fromisoformat(fetched_at)
+    except (TypeError, ValueError):
+        return False
+
+
+def diff_page(entry: Dict, scraped_path: str, fields: Iterable[str] = REEXTRACT_FIELDS) -> Optional[Dict]:
+    """Re-extract one archived page and compare it with its scraped file.
+
+    Args:
+        entry: Archive index row (see `HtmlArchive.entries()`).
+        scraped_path: Path of the scraped JSON for the page URL.
+        fields: Fields to compare.
+
+    Returns:
+        {'path', 'id', 'source', 'url', 'changes': {field: (old, new)}}, or None
+        when nothing differs. New values that came out empty are reported but
+        marked as not applicable (see `apply_changes`).
+    """
+    with open(scraped_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    page = read_record(entry['path'], entry['offset'], entry['length'])
+    content, title, published, _ = extract_content_and_title(page.html, _extractor(data.get('source')))
+    new = {'title': title, 'content': content or '', 'published': _format_datetime_for_json(published)}
+    if new['published'] and _published_after_fetch(new['published'], page.get('fetched_at')):
+        new['published'] = data.get('published')
+    changes = {f: (data.get(f), new[f]) for f in fields if (data.get(f) or None) != (new[f] or None)}
+    if not changes:
+        return None
+    return {'path': scraped_path, 'id': data.get('id'), 'source': data.get('source'), 'url': data.get('url'),
+            'changes': changes}
+
+
+def _diff_task(args: Tuple[Dict, str, Tuple[str, ...]]):
+    entry, scraped_path, fields = args
+    try:
+        return diff_page(entry, scraped_path, fields), None
+    except Exception as e:
+        return None, f"{entry.get('url')}: {e}"
+
+
+def reextract(reports_dir: Optional[str] = None, fields: Iterable[str] = REEXTRACT_FIELDS,
+              source: Optional[str] = None, workers: Optional[int] = None,
+              limit: Optional[int] = None) -> Tuple[List[Dict], List[str], int]:
+    """Diff the archived corpus against the stored scraped files.
+
+    Returns:
+        (diffs, errors, pages_checked).
+    """
+    reports_dir = os.path.abspath(reports_dir or REPORTS_DIR)
+    fields = tuple(fields)
+    index = get_index(reports_dir)
+    index.sync()
+    by_url = index.scraped_paths_by_url(source)
+    tasks = []
+    for entry in get_archive(reports_dir).entries():
+        path = by_url.get(entry['url'])
+        if path is None:
+            continue
+        tasks.append((entry, path, fields))
+    if limit:
+        tasks = tasks[:limit]
+
+    diffs, errors = [], []
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for diff, error in ex.map(_diff_task, tasks, chunksize=16):
+            if error:
+                errors.append(error)
+            elif diff:
+                diffs.append(diff)
+    return diffs, errors, len(tasks)
+
+
+def apply_changes(diffs: List[Dict], reports_dir: Optional[str] = None, batch_size: int = 200) -> int:
+    """Write re-extracted values back to the scraped files (in index batches).
+
+    Empty new values are skipped so a broken selector never wipes stored text.
+
+    Returns:
+        Number of files updated.
+    """
+    index = get_index(reports_dir)
+    batch, updated = [], 0
+    for diff in diffs:
+        values = {f: new for f, (_, new) in diff['changes'].items() if new}
+        if not values:
+            continue
+        with open(diff['path'], 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data.update(values)
+        if 'content' in values:
+            data['content_preview'] = values['content'][:300]
+        write_json_atomic(diff['path'], data)
+        batch.append((diff['path'], data))
+        updated += 1
+        if len(batch) >= batch_size:
+            index.index_files(batch)
+            batch = []
+    if batch:
+        index.index_files(batch)
+    return updated
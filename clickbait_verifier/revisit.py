@@ -0,0 +1,394 @@
+"""Revisits of recently scraped articles to catch headline and body edits.
+
+The scraper stores each URL once, so a title that the publisher edits (or A/B
+tests) after publication was never seen. A revisit pass re-fetches recent
+articles on a decaying schedule and keeps a new revision only when the title or
+the article text actually changed:
+
+- every scraped article younger than `revisit_max_age_hours` (config.yaml,
+  default DEFAULT_MAX_AGE_HOURS) is scheduled, first FIRST_INTERVAL_S after it
+  was fetched; while it stays unchanged the interval doubles (up to
+  MAX_INTERVAL_S), a change resets it;
+- fetches are conditional (If-None-Match / If-Modified-Since from the last
+  response, or from the HTML archive on the first revisit), so an unchanged
+  page usually costs a 304; they go through the usual robots.txt and
+  politeness checks;
+- title and text are compared by hash; a text change also has to differ by
+  more than MIN_CONTENT_CHANGE of its words, so rotating widgets and
+  relative dates picked up by the extractor do not count;
+- on a change the scraped file is updated in place (same id, same
+  `fetched_at`, the time of the change in `revised_at`) and the previous
+  version is appended to its `revisions` list; the article's analysis keeps
+  being served but is flagged `needs_reanalysis` (core/reanalysis.py), which
+  puts the article back in the analysis queue of main --analyze-all /
+  analyze_today.py until the new analysis replaces it.
+
+The schedule lives in the crawl state database (reports/crawl.sqlite3).
+
+Usage (CLI wrapper): python scripts/revisit.py --limit 50
+"""
+import difflib
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import yaml
+
+from .content_extractor import load_extractor_for_source
+from .core.archive import archive_response, get_archive
+from .core.crawl_state import CrawlState, get_crawl_state
+from .core.deadlines import DeadlineExceeded, deadline
+from .core.fetch_policy import MIN_CONTENT_CHARS
+from .core.fetcher import BROWSER_HEADERS, decode_html, fetch_bytes, header_value
+from .core.index import REPORTS_DIR, get_index, record_report_file
+from .core.jsonio import read_json, write_json_atomic
+from .core.reanalysis import analysis_path, mark_stale
+from .core.robots import RobotsDisallowed
+from .scraper import (DEFAULT_SOURCE_DEADLINE_S, _format_datetime_for_json, extract_content_and_title,
+                      fetch_html_with_method)
+
+DEFAULT_MAX_AGE_HOURS = 72
+FIRST_INTERVAL_S = 30 * 60
+MAX_INTERVAL_S = 12 * 3600
+BACKOFF_FACTOR = 2
+# Share of words that must differ before a text change counts as a new revision
+MIN_CONTENT_CHANGE = 0.03
+# Longest differing span (in words) that is aligned with SequenceMatcher
+MAX_DIFF_WORDS = 2000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS revisits (
+    article_id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    source TEXT,
+    fetched_at REAL NOT NULL,
+    title_hash TEXT,
+    content_hash TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    interval_s REAL NOT NULL,
+    next_visit REAL,
+    visits INTEGER NOT NULL DEFAULT 0,
+    revisions INTEGER NOT NULL DEFAULT 0,
+    last_result TEXT,
+    visited_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_revisits_next ON revisits(next_visit) WHERE next_visit IS NOT NULL;
+"""
+
+
+def text_hash(text: Optional[str]) -> str:
+    """Hash of a title or article text, insensitive to whitespace differences."""
+    return hashlib.sha1(' '.join((text or '').split()).encode('utf-8')).hexdigest()[:16]
+
+
+def _shingles(words: List[str], n: int = 3) -> set:
+    return {tuple(words[i:i + n]) for i in range(max(1, len(words) - n + 1))}
+
+
+def content_changed(old: Optional[str], new: Optional[str]) -> bool:
+    """True if more than MIN_CONTENT_CHANGE of the words of the article text differ.
+
+    Cheap checks run first: equal hashes, then the word-count bound of
+    SequenceMatcher.quick_ratio(). Only the span between the common prefix and
+    suffix is aligned, and only if it is at most MAX_DIFF_WORDS long; longer
+    rewrites are compared by their 3-word shingles instead.
+    """
+    if text_hash(old) == text_hash(new):
+        return False
+    a, b = (old or '').split(), (new or '').split()
+    total = len(a) + len(b)
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    # quick_ratio() is linear and never below ratio()
+    if 1.0 - matcher.quick_ratio() > MIN_CONTENT_CHANGE:
+        return True
+    prefix = 0
+    while prefix < min(len(a), len(b)) and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < min(len(a), len(b)) - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    mid_a, mid_b = a[prefix:len(a) - suffix], b[prefix:len(b) - suffix]
+    if max(len(mid_a), len(mid_b)) > MAX_DIFF_WORDS:
+        sa, sb = _shingles(a), _shingles(b)
+        return 1.0 - len(sa & sb) / len(sa | sb) > MIN_CONTENT_CHANGE
+    matcher.set_seqs(mid_a, mid_b)
+    matched = prefix + suffix + sum(m.size for m in matcher.get_matching_blocks())
+    return 1.0 - 2.0 * matched / total > MIN_CONTENT_CHANGE
+
+
+def _epoch(iso: Optional[str]) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(iso).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class RevisitSchedule:
+    """Per-article revisit state: validators, content hashes and the next visit time."""
+
+    def __init__(self, state: CrawlState):
+        self.state = state
+
+    def _conn(self):
+        return self.state.ensure_schema(_SCHEMA)
+
+    def seed(self, articles: List[Dict]) -> int:
+        """Schedule scraped articles (index entries) that are not scheduled yet."""
+        with self.state.lock:
+            conn = self._conn()
+            known = {r['article_id'] for r in conn.execute('SELECT article_id FROM revisits')}
+            rows = []
+            for a in articles:
+                fetched_at = _epoch(a.get('fetched_at'))
+                if a['id'] in known or fetched_at is None:
+                    continue
+                rows.append((a['id'], a['url'], a.get('source'), fetched_at, text_hash(a.get('title')),
+                             text_hash(a.get('content')), FIRST_INTERVAL_S, fetched_at + FIRST_INTERVAL_S))
+            conn.executemany('INSERT INTO revisits(article_id, url, source, fetched_at, title_hash, content_hash, '
+                             'interval_s, next_visit) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            conn.commit()
+        return len(rows)
+
+    def retire(self, older_than: float) -> int:
+        """Stop revisiting articles first fetched before `older_than` (epoch seconds)."""
+        with self.state.lock:
+            conn = self._conn()
+            n = conn.execute('UPDATE revisits SET next_visit = NULL WHERE next_visit IS NOT NULL AND fetched_at < ?',
+                             (older_than,)).rowcount
+            conn.commit()
+        return n
+
+    def due(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Scheduled articles whose next visit has come, most overdue first."""
+        with self.state.lock:
+            rows = self._conn().execute(
+                'SELECT * FROM revisits WHERE next_visit IS NOT NULL AND next_visit <= ? ORDER BY next_visit LIMIT ?',
+                (now or time.time(), -1 if limit is None else limit),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def visited(self, entry: Dict, result: str, etag: Optional[str] = None, last_modified: Optional[str] = None,
+                title_hash: Optional[str] = None, content_hash: Optional[str] = None):
+        """Record a visit and schedule the next one.
+
+        'changed' resets the interval to FIRST_INTERVAL_S, any other result
+        doubles it; 'gone' stops revisiting.
+        """
+        now = time.time()
+        if result == 'changed':
+            interval = FIRST_INTERVAL_S
+        else:
+            interval = min(MAX_INTERVAL_S, entry['interval_s'] * BACKOFF_FACTOR)
+        next_visit = None if result == 'gone' else now + interval
+        with self.state.lock:
+            conn = self._conn()
+            conn.execute(
+                'UPDATE revisits SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified), '
+                'title_hash = COALESCE(?, title_hash), content_hash = COALESCE(?, content_hash), '
+                'interval_s = ?, next_visit = ?, visits = visits + 1, revisions = revisions + ?, '
+                'last_result = ?, visited_at = ? WHERE article_id = ?',
+                (etag, last_modified, title_hash, content_hash, interval, next_visit,
+                 1 if result == 'changed' else 0, result, now, entry['article_id']),
+            )
+            conn.commit()
+
+    def stats(self) -> Dict:
+        """Scheduled / retired article counts and visit results, for inspection."""
+        with self.state.lock:
+            conn = self._conn()
+            row = conn.execute('SELECT COUNT(*) AS n, SUM(next_visit IS NOT NULL) AS scheduled, '
+                               'SUM(next_visit <= ?) AS due, SUM(visits) AS visits, SUM(revisions) AS revisions '
+                               'FROM revisits', (time.time(),)).fetchone()
+            results = {r['last_result']: r['n'] for r in conn.execute(
+                'SELECT last_result, COUNT(*) AS n FROM revisits WHERE last_result IS NOT NULL GROUP BY last_result')}
+        stats = {k: row[k] or 0 for k in ('n', 'scheduled', 'due', 'visits', 'revisions')}
+        stats['last_results'] = results
+        return stats
+
+
+_schedules: Dict[str, RevisitSchedule] = {}
+_schedules_lock = threading.Lock()
+
+
+def get_revisit_schedule(reports_dir: Optional[str] = None) -> RevisitSchedule:
+    """Return the shared RevisitSchedule of a reports directory."""
+    state = get_crawl_state(reports_dir)
+    with _schedules_lock:
+        schedule = _schedules.get(state.db_path)
+        if schedule is None:
+            schedule = _schedules[state.db_path] = RevisitSchedule(state)
+        return schedule
+
+
+def _load_config() -> Dict:
+    try:
+        with open('config.yaml', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    except Exception:
+        return {}
+
+
+class RevisitJob:
+    """One revisit pass over the due articles of a reports directory."""
+
+    def __init__(self, reports_dir: Optional[str] = None, max_age_hours: Optional[float] = None,
+                 limit: Optional[int] = None, time_budget_s: Optional[float] = None):
+        """
+        Args:
+            reports_dir: Reports directory (default: repository reports/).
+            max_age_hours: Revisit articles fetched within this many hours
+                (default: revisit_max_age_hours from config.yaml).
+            limit: Visit at most N due articles.
+            time_budget_s: Wall-clock budget of the pass (default: the
+                per-source budget, source_deadline_s).
+        """
+        cfg = _load_config()
+        self.reports_dir = os.path.abspath(reports_dir or REPORTS_DIR)
+        self.max_age_hours = float(max_age_hours or cfg.get('revisit_max_age_hours') or DEFAULT_MAX_AGE_HOURS)
+        self.limit = limit
+        self.time_budget_s = time_budget_s or cfg.get('source_deadline_s', DEFAULT_SOURCE_DEADLINE_S)
+        self.fetch_methods = {(s.get('name') or '').lower(): s.get('fetch_method', 'auto')
+                              for s in cfg.get('sources', []) if isinstance(s, dict)}
+        self.schedule = get_revisit_schedule(self.reports_dir)
+
+    def prepare(self) -> List[Dict]:
+        """Schedule new recent articles, retire old ones and return the due entries."""
+        cutoff = datetime.now() - timedelta(hours=self.max_age_hours)
+        index = get_index(self.reports_dir)
+        index.sync()
+        self.schedule.seed(index.scraped_since(cutoff.isoformat()))
+        self.schedule.retire(cutoff.timestamp())
+        return self.schedule.due(limit=self.limit)
+
+    def run(self) -> Dict[str, int]:
+        """Visit the due articles; returns the number of visits per result."""
+        counts: Dict[str, int] = {}
+        due = self.prepare()
+        if not due:
+            return counts
+        print(f"Rewizyty: {len(due)} artykułów do sprawdzenia")
+        try:
+            with deadline(self.time_budget_s):
+                for entry in due:
+                    result = self.visit(entry)
+                    counts[result] = counts.get(result, 0) + 1
+        except DeadlineExceeded:
+            print(f"Przekroczono limit czasu rewizyt ({self.time_budget_s} s) — reszta przy następnym uruchomieniu")
+        return counts
+
+    def visit(self, entry: Dict) -> str:
+        """Re-fetch one article; returns 'not_modified', 'unchanged', 'changed', 'gone' or 'failed'."""
+        url = entry['url']
+        try:
+            fetched = self._fetch(entry)
+        except DeadlineExceeded:
+            raise
+        except RobotsDisallowed:
+            self.schedule.visited(entry, 'gone')
+            return 'gone'
+        except Exception as e:
+            print(f"Błąd rewizyty {url}: {e}")
+            self.schedule.visited(entry, 'failed')
+            return 'failed'
+        status, html, etag, last_modified = fetched
+        if status == 304:
+            self.schedule.visited(entry, 'not_modified', etag, last_modified)
+            return 'not_modified'
+        if status in (404, 410):
+            self.schedule.visited(entry, 'gone')
+            return 'gone'
+
+        content, title, _, _ = extract_content_and_title(html, load_extractor_for_source(entry['source'])
+                                                         if entry.get('source') else None)
+        path = self._scraped_path(entry['article_id'])
+        data = read_json(path) if path else None
+        if data is None:
+            self.schedule.visited(entry, 'gone')
+            return 'gone'
+        if len(content or '') < MIN_CONTENT_CHARS <= len(data.get('content') or ''):
+            # a blocked or JS-only response, not an edit
+            self.schedule.visited(entry, 'failed', etag, last_modified)
+            return 'failed'
+        changed = []
+        if title and text_hash(title) != text_hash(data.get('title')):
+            changed.append('title')
+        if content_changed(data.get('content'), content):
+            changed.append('content')
+        if not changed:
+            self.schedule.visited(entry, 'unchanged', etag, last_modified)
+            return 'unchanged'
+        # the new version is stored whole (minor text differences come along with a real change)
+        self.write_revision(path, data, title or data.get('title'), content, changed)
+        print(f"Zmiana w artykule ({', '.join(changed)}): {url}")
+        self.schedule.visited(entry, 'changed', etag, last_modified, text_hash(title or data.get('title')),
+                              text_hash(content))
+        return 'changed'
+
+    def _fetch(self, entry: Dict):
+        """Conditional GET of an article; returns (status, html, etag, last_modified)."""
+        url = entry['url']
+        method = self.fetch_methods.get((entry.get('source') or '').lower(), 'auto')
+        if method == 'playwright':  # rendered pages have no validators
+            return 200, fetch_html_with_method(url, method), None, None
+        headers = dict(BROWSER_HEADERS)
+        etag, modified = entry.get('etag'), entry.get('last_modified')
+        if not etag and not modified and entry['visits'] == 0:
+            archived = get_archive(self.reports_dir).headers(url)
+            etag, modified = header_value(archived, 'ETag'), header_value(archived, 'Last-Modified')
+        if etag:
+            headers['If-None-Match'] = etag
+        if modified:
+            headers['If-Modified-Since'] = modified
+        r, body, _ = fetch_bytes(url, headers=headers, timeout=10)
+        validators = (header_value(r.headers, 'ETag'), header_value(r.headers, 'Last-Modified'))
+        if r.status_code in (304, 404, 410):
+            return (r.status_code, None) + validators
+        r.raise_for_status()
+        html, enc = decode_html(body, r.headers.get('Content-Type'), r.url)
+        if len(html) < 1000 and method == 'auto':  # probably a JS shell; render it like the scraper would
+            return (200, fetch_html_with_method(url, method)) + validators
+        archive_response(url, body, headers=r.headers, status=r.status_code, encoding=enc)
+        return (r.status_code, html) + validators
+
+    def _scraped_path(self, article_id: str) -> Optional[str]:
+        path = os.path.join(self.reports_dir, 'scraped', f'scraped_{article_id}.json')
+        return path if os.path.exists(path) else None
+
+    def write_revision(self, path: str, data: Dict, title: Optional[str], content: Optional[str],
+                       changed: List[str]):
+        """Store the new version in the scraped file and flag the article's analysis as stale."""
+        revision = int(data.get('revision') or 1)
+        previous = {
+            'revision': revision,
+            'title': data.get('title'),
+            'content_hash': text_hash(data.get('content')),
+            'content_preview': data.get('content_preview'),
+            'fetched_at': data.get('revised_at') or data.get('fetched_at'),
+            'changed': changed,
+            # score/label of the analysis of this version, if it was analysed
+            'analysis': mark_stale(analysis_path(os.path.join(self.reports_dir, 'analysis'), data.get('id')),
+                                   revision + 1),
+        }
+        data['revisions'] = (data.get('revisions') or []) + [previous]
+        data['revision'] = revision + 1
+        data['title'] = title
+        data['content'] = content or ''
+        data['content_preview'] = data['content'][:300]
+        # fetched_at stays the first fetch, so the article keeps its place in feeds and day buckets
+        data['revised_at'] = _format_datetime_for_json(datetime.now())
+        write_json_atomic(path, data)
+        record_report_file(path, data)
+
+
+def run_revisits(reports_dir: Optional[str] = None, limit: Optional[int] = None) -> Optional[Dict[str, int]]:
+    """Revisit pass after a scrape run, if `revisit: true` is set in config.yaml."""
+    if not _load_config().get('revisit', False):
+        return None
+    counts = RevisitJob(reports_dir, limit=limit).run()
+    if counts:
+        print('Rewizyty: ' + ', '.join(f'{k} {v}' for k, v in sorted(counts.items())))
+    return counts
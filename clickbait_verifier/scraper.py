@@ -6,6 +6,7 @@ import time
 from urllib.parse import urlparse
 import json
 import os
+import threading
 import yaml
 
 try:
@@ -15,6 +16,19 @@ except Exception:
     PLAYWRIGHT_AVAILABLE = False
 
 from .content_extractor import load_extractor_for_source
+from .core.index import get_index, record_report_file
+from .core.archive import archive_response
+from .core.fetch_policy import MIN_CONTENT_CHARS, get_fetch_policy
+from .core.deadlines import DeadlineExceeded, cap_timeout, deadline, timed_out
+from .core.fetcher import BROWSER_HEADERS, decode_html, fetch_bytes
+from .core.images import schedule_image
+from .core.links import LinkClassifier
+from .core.politeness import get_politeness, parse_retry_after
+from .core.redirects import get_url_aliases
+from .core.robots import get_robots
+from .core.run_journal import RunJournal
+from .core.sitemaps import commit_watermark as commit_sitemap_watermark, discover as discover_sitemap
+from .core.urls import canonical_link
 import re
 
 
@@ -125,66 +139,143 @@ def fetch_rss(url):
 def fetch_html_playwright(url, timeout_ms=30000):
     if not PLAYWRIGHT_AVAILABLE:
         raise RuntimeError('Playwright not installed')
-    with sync_playwright() as p:
+    get_robots().check(url)
+    with get_politeness().slot(url) as outcome, sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
-        page.goto(url, timeout=timeout_ms)
+        capped_ms = cap_timeout(timeout_ms / 1000) * 1000
+        try:
+            response = page.goto(url, timeout=capped_ms)
+        except Exception as e:
+            timed_out(timeout_ms, capped_ms, e)
+            raise
+        if response is not None:
+            outcome['status'] = response.status
+            outcome['retry_after'] = parse_retry_after(response.headers.get('retry-after'))
         content = page.content()
         browser.close()
+        archive_response(url, content)
         return content
 
 
+def _fetch_html_requests(url, archive=True):
+    """GET a page (streamed, capped at MAX_PAGE_BYTES) and decode it.
+
+    Returns (text, response, body bytes, encoding).
+    """
+    r, body, _ = fetch_bytes(url, headers=BROWSER_HEADERS, timeout=10)
+    r.raise_for_status()
+    # requests falls back to ISO-8859-1 for text/* without a charset, which
+    # turns Polish characters into mojibake (e.g. \u00c4\u0099 sequences);
+    # decode_html checks header, <meta charset> and UTF-8 validity instead.
+    text, enc = decode_html(body, r.headers.get('Content-Type'), r.url)
+    if archive:
+        archive_response(url, body, headers=r.headers, status=r.status_code, encoding=enc)
+    return text, r, body, enc
+
+
+# Method that produced the last page fetched on this thread, so the extracted
+# content can be credited to it (see fetch_article)
+_last_fetch = threading.local()
+
+
+def _fetch_timed(url, method, archive=True):
+    """Fetch with one method, recording failures/latency for the adaptive policy.
+
+    Returns (text, response, body, encoding); response/body/encoding are None
+    for Playwright.
+    """
+    policy = get_fetch_policy()
+    t0 = time.perf_counter()
+    try:
+        if method == 'playwright':
+            result = fetch_html_playwright(url), None, None, None
+        else:
+            result = _fetch_html_requests(url, archive=archive)
+    except Exception:
+        policy.record(url, method, False, time.perf_counter() - t0, playwright_available=PLAYWRIGHT_AVAILABLE)
+        raise
+    _last_fetch.url, _last_fetch.method, _last_fetch.latency = url, method, time.perf_counter() - t0
+    _record_aliases(url, result[1].url if result[1] is not None else None, result[0])
+    return result
+
+
+def _record_aliases(url, final_url, html):
+    """Remember redirects and <link rel=canonical> of a fetched page for de-duplication."""
+    try:
+        canonical = canonical_link(html, final_url or url)
+        if canonical or (final_url and final_url != url):
+            get_url_aliases().record(url, final_url, canonical)
+    except Exception as e:
+        print(f"Could not record URL aliases for {url}: {e}")
+
+
 def fetch_html_with_method(url, method='auto'):
     """Fetch HTML using a specified method.
-    method: 'requests', 'playwright', or 'auto' (try requests, fallback to playwright)
+    method: 'requests', 'playwright', or 'auto' (adaptive per host, see
+    core/fetch_policy.py: the method that has worked for the host is tried
+    first, with the other one as fallback)
+
+    With CLICKBAIT_ARCHIVE_HTML=1 the raw response is also stored in the
+    HTML archive (see core/archive.py).
     """
     method = (method or 'auto').lower()
     if method == 'playwright':
-        return fetch_html_playwright(url)
+        return _fetch_timed(url, 'playwright')[0]
     if method == 'requests':
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36',
-                'Accept-Language': 'en-US,en;q=0.9,pl;q=0.8'
-            }
-            r = requests.get(url, timeout=10, headers=headers)
-            r.raise_for_status()
-            # Some sites may send bytes that requests decodes with the wrong
-            # encoding. Decode explicitly using apparent_encoding when available
-            # (fallback to detected r.encoding or utf-8) to avoid mojibake
-            # (e.g. Polish characters turning into \u00c4\u0099 sequences).
-            enc = getattr(r, 'apparent_encoding', None) or r.encoding or 'utf-8'
-            try:
-                return r.content.decode(enc, errors='replace')
-            except Exception:
-                # worst-case fallback to requests' .text
-                return r.text
+            return _fetch_timed(url, 'requests')[0]
         except Exception:
             # allow fallback to playwright if available
             if PLAYWRIGHT_AVAILABLE:
-                return fetch_html_playwright(url)
+                return _fetch_timed(url, 'playwright')[0]
             raise
     # auto
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9,pl;q=0.8'
-        }
-        r = requests.get(url, timeout=10, headers=headers)
-        r.raise_for_status()
-        # See note above: prefer decoding from bytes using apparent_encoding
-        enc = getattr(r, 'apparent_encoding', None) or r.encoding or 'utf-8'
+    first, _ = get_fetch_policy().choose(url, PLAYWRIGHT_AVAILABLE)
+    if first == 'playwright':
         try:
-            text = r.content.decode(enc, errors='replace')
+            return _fetch_timed(url, 'playwright')[0]
         except Exception:
-            text = r.text
-        if len(text) < 1000 and PLAYWRIGHT_AVAILABLE:
-            return fetch_html_playwright(url)
-        return text
+            return _fetch_timed(url, 'requests')[0]
+    try:
+        text, r, body, enc = _fetch_timed(url, 'requests', archive=False)
+    except DeadlineExceeded:
+        raise
     except Exception:
         if PLAYWRIGHT_AVAILABLE:
-            return fetch_html_playwright(url)
+            return _fetch_timed(url, 'playwright')[0]
         raise
+    # outside the try: a failing Playwright fallback must not be retried by the handler above
+    if len(text) < 1000 and PLAYWRIGHT_AVAILABLE:
+        get_fetch_policy().record(url, 'requests', False, _last_fetch.latency, len(text), PLAYWRIGHT_AVAILABLE)
+        return _fetch_timed(url, 'playwright')[0]
+    archive_response(url, body, headers=r.headers, status=r.status_code, encoding=enc)
+    return text
+
+
+def record_extraction(url, content):
+    """Credit the extracted article length to the method that fetched `url`.
+
+    An empty or very short extraction counts as a failure of that method, which
+    is how the adaptive `auto` policy notices JS-only pages.
+    """
+    if getattr(_last_fetch, 'url', None) != url:
+        return
+    chars = len(content or '')
+    try:
+        get_fetch_policy().record(url, _last_fetch.method, chars >= MIN_CONTENT_CHARS, _last_fetch.latency,
+                                  chars, PLAYWRIGHT_AVAILABLE)
+    except Exception as e:
+        print(f"Fetch policy: could not record {url}: {e}")
+    _last_fetch.url = None
+
+
+def fetch_article(url, fetch_method, extractor):
+    """Fetch and extract an article page; returns (content, title, published, image_url)."""
+    html = fetch_html_with_method(url, fetch_method)
+    content, title, published, image_url = extract_content_and_title(html, extractor)
+    record_extraction(url, content)
+    return content, title, published, image_url
 
 
 def extract_content_and_title(html, extractor_config=None):
@@ -474,7 +565,20 @@ def _format_datetime_for_json(val):
 
 
 def find_existing_scraped_by_url(url):
-    """Search reports/scraped for a file with matching URL. Return (id, path) or (None, None)."""
+    """Find a scraped article for `url`. Return (id, path) or (None, None).
+
+    URLs are compared by their canonical key (core/urls.py) through the corpus
+    index, so tracking parameters, fragments, www/AMP variants and URLs known
+    to redirect or declare a canonical URL (core/redirects.py) match the stored
+    article. Falls back to scanning reports/scraped if the index is unavailable.
+    """
+    try:
+        idx = get_index()
+        idx.sync(max_age=30)
+        eid, path = idx.scraped_by_url_key(get_url_aliases().keys(url))
+        return (int(eid), path) if eid else (None, None)
+    except Exception as e:
+        print(f"Index lookup failed for {url} ({e}); scanning reports/scraped")
     scraped_dir = os.path.join(os.path.dirname(__file__), '..', 'reports', 'scraped')
     scraped_dir = os.path.normpath(scraped_dir)
     if not os.path.isdir(scraped_dir):
@@ -496,7 +600,22 @@ def find_existing_scraped_by_url(url):
 def save_article_file(rec):
     """Save article summary JSON to reports/scraped and return generated id and path.
     Does not touch DB.
+
+    If the fetch showed that the URL is another URL of an article that is
+    already stored (redirect or <link rel=canonical>), nothing is written and
+    the existing (id, path) is returned.
     """
+    canonical_url = None
+    if rec.get('url'):
+        try:
+            canonical_url = get_url_aliases().canonical_url(rec['url'])
+        except Exception:
+            canonical_url = None
+        if canonical_url:
+            eid, existing_path = find_existing_scraped_by_url(canonical_url)
+            if eid:
+                print(f"Pomijam zapis — {rec['url']} to ten sam artykuł co {canonical_url} (id={eid})")
+                return eid, existing_path
     ensure_reports_dir()
     now = datetime.now()
     new_id = int(now.timestamp() * 1000)
@@ -511,7 +630,15 @@ def save_article_file(rec):
         'content_preview': (rec.get('content') or '')[:300],
         'image_url': rec.get('image_url')
     }
+    if canonical_url and canonical_url != rec.get('url'):
+        article_dict['canonical_url'] = canonical_url
     path = write_summary_json(article_dict)
+    # resolve/thumbnail the lead image in the background (cached by article URL)
+    try:
+        schedule_image(article_dict['url'], article_dict['image_url'],
+                       os.path.dirname(os.path.dirname(os.path.abspath(path))))
+    except Exception:
+        pass
     return new_id, path
 
 
@@ -542,6 +669,8 @@ def write_summary_json(article_dict):
          'content_preview': (article_dict.get('content') or '')[:300],
          'image_url': article_dict.get('image_url')
      }
+    if article_dict.get('canonical_url'):
+        summary['canonical_url'] = article_dict['canonical_url']
     # Use only the id in the filename (avoid timestamp). If file exists, add numeric suffix to avoid overwriting.
     filename = f"scraped_{id_}.json"
     path = os.path.join("reports", "scraped", filename)
@@ -557,6 +686,7 @@ def write_summary_json(article_dict):
             i += 1
     with open(path, 'w', encoding='utf-8') as f:
          json.dump(summary, f, ensure_ascii=False, indent=2)
+    record_report_file(path, summary)
     return path
 
 
@@ -578,169 +708,168 @@ def write_analysis_json(analysis_dict):
             i += 1
     with open(path, 'w', encoding='utf-8') as f:
         json.dump(analysis_dict, f, ensure_ascii=False, indent=2)
+    record_report_file(path, analysis_dict)
     return path
 
 
-def run_scraper():
+# Wall-clock budget per source in seconds (config.yaml: source_deadline_s, or deadline_s per source)
+DEFAULT_SOURCE_DEADLINE_S = 600
+
+
+def _scrape_url(s, url, extractor, fetch_method, journal=None, title=None, published=None,
+                only_today=False, label='', error_label=None):
+    """Fetch and save one article of source `s`, journalling the outcome.
+
+    `title`/`published` are fallbacks from the feed or sitemap (the feed title
+    wins over the extracted one when `label` is 'RSS'). Returns 'saved',
+    'exists', 'not_today', 'journal' (already dealt with in this run) or
+    'failed'. DeadlineExceeded is re-raised so the caller can stop the source.
+    """
+    if journal is not None and journal.seen(url):
+        return 'journal'
+    try:
+        eid, existing_path = find_existing_scraped_by_url(url)
+        if eid:
+            print(f'Pomijam — URL już zapisany w plikach: {url} (id={eid}, file={existing_path})')
+            status, detail = 'exists', str(eid)
+        else:
+            content, ext_title, ext_published, image_url = fetch_article(url, fetch_method, extractor)
+            if not isinstance(ext_published, datetime) and published:
+                ext_published = published
+            if only_today and isinstance(ext_published, datetime) and ext_published.date() != datetime.now().date():
+                print(f"Pominięto (nie z dzisiaj): {url} (published={ext_published})")
+                status, detail = 'not_today', None
+            else:
+                new_id, path = save_article_file({
+                    "source": s["name"],
+                    "title": (title or ext_title) if label == 'RSS' else (ext_title or title),
+                    "url": url,
+                    "content": content,
+                    "published": ext_published or published or datetime.now(),
+                    "image_url": image_url
+                })
+                print(f"Zescrapowano: {url} -> zapisano plik {path}")
+                status, detail = 'saved', path
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        print(f"Błąd pobierania {error_label or ''}{url} dla {s['name']}: {e}")
+        status, detail = 'failed', str(e)
+    if journal is not None:
+        journal.record(s["name"], url, status, detail)
+    return status
+
+
+def run_scraper(resume=True):
+    """Scrape all enabled sources from config.yaml.
+
+    Each source runs under a wall-clock budget (`source_deadline_s`, default
+    DEFAULT_SOURCE_DEADLINE_S, or the source's own `deadline_s`); work still
+    outstanding when it runs out is cancelled and the run moves on to the next
+    source. Progress is journalled (core/run_journal.py), so with `resume` an
+    interrupted run continues where it stopped.
+    """
     cfg = yaml.safe_load(open("config.yaml"))
     sources = cfg.get("sources", [])
+    journal = RunJournal.start(resume=resume)
+    if journal.resumed:
+        print(f"Wznawiam przerwany przebieg {journal.run_id}")
     for s in sources:
         if not s.get("enabled", True):
             continue
+        if journal.source_finished(s["name"]):
+            print(f"Pomijam {s['name']} — zakończone we wznawianym przebiegu")
+            continue
         extractor = load_extractor_for_source(s["name"])
         fetch_method = s.get("fetch_method", "auto")
 
-        # If source is configured to ask user for URL(s), prompt now
+        # If source is configured to ask user for URL(s), prompt now (outside the time budget)
+        urls = None
         if s.get("ask_for_url", False):
             prompt = f"Podaj link(i) do artykułu dla '{s['name']}' (oddziel przecinkami jeśli więcej niż jeden), lub wpisz 'skip': "
             user_input = input(prompt).strip()
             if not user_input or user_input.lower() == 'skip':
                 continue
             urls = [u.strip() for u in user_input.split(",") if u.strip()]
-            for url in urls:
-                try:
-                    # skip if URL already exists as a scraped file
-                    eid, existing_path = find_existing_scraped_by_url(url)
-                    if eid:
-                        print(f'Pomijam — URL już zapisany w plikach: {url} (id={eid}, file={existing_path})')
-                        continue
-                    html = fetch_html_with_method(url, fetch_method)
-                    content, title, published, image_url = extract_content_and_title(html, extractor)
-                    new_id, path = save_article_file({
-                        "source": s["name"],
-                        "title": title,
-                        "url": url,
-                        "content": content,
-                        "published": published or datetime.now(),
-                        "image_url": image_url
-                    })
-                    print(f"Zescrapowano: {url} -> zapisano plik {path}")
-                except Exception as e:
-                    print(f"Błąd pobierania {url} dla {s['name']}: {e}")
-            continue
 
-        # Listing page scraping (collect article links from a listing page)
-        if s.get("scrape_listing", False) and s.get("url"):
-            list_url = s.get("url")
-            try:
-                html = fetch_html_with_method(list_url, fetch_method)
-                soup = BeautifulSoup(html, "lxml")
-                base_host = urlparse(list_url).netloc
-                links = set()
-                # Support per-source URL pattern to identify article links (regex string in config.yaml)
-                pattern = s.get('article_url_pattern')
-
-                for a in soup.find_all('a', href=True):
-                    href = a['href']
-                    if href.startswith('//'):
-                        href = 'https:' + href
-                    elif href.startswith('/'):
-                        href = f"{urlparse(list_url).scheme}://{base_host}{href}"
-                    if not href.startswith('http'):
-                        continue
-                    # only same-host links
-                    if urlparse(href).netloc != base_host:
-                        continue
-                    if href == list_url:
-                        continue
-                    low = href.lower()
-                    # basic blacklist to skip common non-article sections
-                    if any(x in low for x in ['/tylko-w-rmf24', '/galeria', '/wideo', '/video', '/tag/', '/tag-']):
-                        continue
-                    # skip pagination/listing links (nPack)
-                    if ',npack,' in low:
-                        continue
-                    # if a per-source regex is provided, require it to match; if it doesn't,
-                    # accept articles containing ',nId,' as a safe fallback (RMF article IDs)
-                    if pattern:
-                        try:
-                            import re
-                            if not re.search(pattern, href):
-                                # fallback: accept URLs containing ',nId,' even if regex failed
-                                if ',nid,' in low:
-                                    pass
-                                else:
-                                    continue
-                        except Exception:
-                            pass
-                    links.add(href.split('#')[0])
-
-                print(f"Znaleziono {len(links)} linków na stronie listingu {list_url}")
-                for url in sorted(links):
-                    try:
-                        eid, existing_path = find_existing_scraped_by_url(url)
-                        if eid:
-                            print(f'Pomijam — URL już zapisany: {url}')
-                            continue
-                        article_html = fetch_html_with_method(url, fetch_method)
-                        content, title, published, image_url = extract_content_and_title(article_html, extractor)
-                        # if configured, only keep articles published today
-                        if s.get("only_today", False) and isinstance(published, datetime):
-                            if published.date() != datetime.now().date():
-                                print(f"Pominięto (nie z dzisiaj): {url} (published={published})")
-                                continue
-                        new_id, path = save_article_file({
-                            "source": s["name"],
-                            "title": title,
-                            "url": url,
-                            "content": content,
-                            "published": published or datetime.now(),
-                            "image_url": image_url
-                        })
-                        print(f"Zescrapowano: {url} -> zapisano plik {path}")
-                    except Exception as e:
-                        print(f"Błąd pobierania z listingu {url} dla {s['name']}: {e}")
-            except Exception as e:
-                print(f"Błąd pobierania listingu {list_url} dla {s['name']}: {e}")
+        budget = s.get("deadline_s", cfg.get("source_deadline_s", DEFAULT_SOURCE_DEADLINE_S))
+        try:
+            with deadline(budget):
+                _scrape_source(s, extractor, fetch_method, journal, urls)
+        except DeadlineExceeded:
+            print(f"Przekroczono limit czasu ({budget} s) dla {s['name']} — przechodzę do następnego źródła")
+            journal.finish_source(s["name"], 'deadline')
             continue
+        journal.finish_source(s["name"])
+    journal.finish()
 
-        # RSS handling stays the same but respects fetch_method when fetching html
-        if s.get("rss") and s.get("enabled", True):
-            for item in fetch_rss(s["rss"]):
-                url = item["url"]
-                try:
-                    # skip if URL already exists as a scraped file
-                    eid, existing_path = find_existing_scraped_by_url(url)
-                    if eid:
-                        print(f'Pomijam — URL już zapisany w plikach: {url} (id={eid}, file={existing_path})')
-                        continue
-                    html = fetch_html_with_method(url, fetch_method)
-                    content, title, published, image_url = extract_content_and_title(html, extractor)
-                    new_id, path = save_article_file({
-                        "source": s["name"],
-                        "title": item.get("title") or title,
-                        "url": url,
-                        "content": content,
-                        "published": published or item.get("published"),
-                        "image_url": image_url
-                    })
-                    print(f"Zescrapowano: {url} -> zapisano plik {path}")
-                except Exception as e:
-                    print(f"Błąd pobierania RSS item {url} dla {s['name']}: {e}")
-        else:
-            # single URL from config (if present)
-            url = s.get("url")
-            if not url:
+
+def _scrape_source(s, extractor, fetch_method, journal, urls=None):
+    """Scrape one config.yaml source (`urls`: links given at the ask_for_url prompt)."""
+    if urls is not None:
+        for url in urls:
+            _scrape_url(s, url, extractor, fetch_method, journal)
+        return
+
+    # News-sitemap discovery (one XML fetch, only entries newer than the watermark)
+    if s.get("sitemap"):
+        scrape_sitemap_source(s, extractor, fetch_method, journal)
+        return
+
+    # Listing page scraping (collect article links from a listing page)
+    if s.get("scrape_listing", False) and s.get("url"):
+        list_url = s.get("url")
+        try:
+            html = fetch_html_with_method(list_url, fetch_method)
+            robots = get_robots()
+            links = [u for u in LinkClassifier.for_source(s).extract(html) if robots.allowed(u)]
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"Błąd pobierania listingu {list_url} dla {s['name']}: {e}")
+            return
+        print(f"Znaleziono {len(links)} linków na stronie listingu {list_url}")
+        for url in links:
+            _scrape_url(s, url, extractor, fetch_method, journal,
+                        only_today=s.get("only_today", False), error_label='z listingu ')
+        return
+
+    # RSS handling stays the same but respects fetch_method when fetching html
+    if s.get("rss"):
+        for item in fetch_rss(s["rss"]):
+            _scrape_url(s, item["url"], extractor, fetch_method, journal, title=item.get("title"),
+                        published=item.get("published"), label='RSS', error_label='RSS item ')
+    elif s.get("url"):
+        # single URL from config
+        _scrape_url(s, s["url"], extractor, fetch_method, journal)
+
+
+def scrape_sitemap_source(s, extractor, fetch_method, journal=None):
+    """Scrape the new entries of a source's news sitemap (see core/sitemaps.py)."""
+    try:
+        items = discover_sitemap(s)
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        print(f"Błąd pobierania sitemapy {s['sitemap']} dla {s['name']}: {e}")
+        return
+    pattern = re.compile(s['article_url_pattern']) if s.get('article_url_pattern') else None
+    print(f"Sitemapa {s['sitemap']}: {len(items)} nowych wpisów")
+    robots = get_robots()
+    handled, failed = [], []
+    try:
+        for item in items:
+            url = item['url']
+            if (pattern and not pattern.search(url)) or not robots.allowed(url):
+                handled.append(item)
                 continue
-            try:
-                # skip if URL already exists as a scraped file
-                eid, existing_path = find_existing_scraped_by_url(url)
-                if eid:
-                    print(f'Pomijam — URL już zapisany w plikach: {url} (id={eid}, file={existing_path})')
-                    continue
-                html = fetch_html_with_method(url, fetch_method)
-                content, title, published, image_url = extract_content_and_title(html, extractor)
-                new_id, path = save_article_file({
-                    "source": s["name"],
-                    "title": title,
-                    "url": url,
-                    "content": content,
-                    "published": published or datetime.now(),
-                    "image_url": image_url
-                })
-                print(f"Zescrapowano: {url} -> zapisano plik {path}")
-            except Exception as e:
-                print(f"Błąd pobierania {url} dla {s['name']}: {e}")
+            published = item['published'].astimezone().replace(tzinfo=None) if item['published'] else None
+            status = _scrape_url(s, url, extractor, fetch_method, journal, title=item.get('title'),
+                                 published=published, error_label='z sitemapy ')
+            (failed if status == 'failed' else handled).append(item)
+    finally:
+        # also when the source budget runs out: the watermark covers what was handled
+        commit_sitemap_watermark(s, handled, failed)
 
 
 def fetch_and_save_url(url, source_name='CLI', fetch_method='auto'):
@@ -810,6 +939,7 @@ def fetch_and_save_url(url, source_name='CLI', fetch_method='auto'):
                     save_source = save_source[4:]
 
         content, title, published, image_url = extract_content_and_title(html, extractor)
+        record_extraction(url, content)
         # Use save_source if we have it, else fall back to provided source_name
         final_source = save_source or source_name
 
@@ -855,45 +985,11 @@ def scrape_listing_for_source(source_name):
     except Exception as e:
         raise RuntimeError(f'Błąd pobierania listingu {list_url}: {e}')
 
-    soup = BeautifulSoup(html, 'lxml')
-    base_host = urlparse(list_url).netloc
-    links = set()
-    # Support per-source URL pattern to identify article links (regex string in config.yaml)
-    pattern = None
-    try:
-        pattern = target.get('article_url_pattern')
-    except Exception:
-        pattern = None
-
-    for a in soup.find_all('a', href=True):
-        href = a['href']
-        if href.startswith('//'):
-            href = 'https:' + href
-        elif href.startswith('/'):
-            href = f"{urlparse(list_url).scheme}://{base_host}{href}"
-        if not href.startswith('http'):
-            continue
-        # only same-host links
-        if urlparse(href).netloc != base_host:
-            continue
-        if href == list_url:
-            continue
-        low = href.lower()
-        # basic blacklist to skip common non-article sections
-        if any(x in low for x in ['/tylko-w-rmf24', '/galeria', '/wideo', '/video', '/tag/', '/tag-']):
-            continue
-        # if a per-source regex is provided, require it to match
-        if pattern:
-            try:
-                import re
-                if not re.search(pattern, href):
-                    continue
-            except Exception:
-                pass
-        links.add(href.split('#')[0])
+    robots = get_robots()
+    links = [u for u in LinkClassifier.for_source(target).extract(html) if robots.allowed(u)]
 
     results = []
-    for url in sorted(links):
+    for url in links:
         rec = {'source': source_name, 'url': url, 'id': None, 'path': None, 'skipped': False, 'reason': None}
         try:
             eid, existing_path = find_existing_scraped_by_url(url)
@@ -904,8 +1000,7 @@ def scrape_listing_for_source(source_name):
                 rec['path'] = existing_path
                 results.append(rec)
                 continue
-            article_html = fetch_html_with_method(url, fetch_method)
-            content, title, published, image_url = extract_content_and_title(article_html, load_extractor_for_source(source_name))
+            content, title, published, image_url = fetch_article(url, fetch_method, load_extractor_for_source(source_name))
             # if configured, only keep articles published today
             if target.get('only_today', False) and isinstance(published, datetime):
                 if published.date() != datetime.now().date():
@@ -15,13 +15,10 @@ from ui.analysis_view import render_analysis_view
 from ui.feed_view import render_feed
 from ui.dashboard_view import render_dashboard
 from ui.scraper_view import render_scraper_view
+from ui.article_selector import render_article_selector
 from utils.file_loader import (
     FileConfig,
-    get_analysis_files,
-    get_scraped_files,
-    build_display_map,
     load_analysis_data,
-    get_candidates_for_feed,
 )
 
 
@@ -46,32 +43,7 @@ def get_file_config() -> FileConfig:
     return FileConfig(reports_dir)
 
 
-def get_selection_index(choices: list, display_map: dict) -> int:
-    """Determine default selection index based on last scraped path.
-    
-    Args:
-        choices: List of display choices.
-        display_map: Map of display names to file info.
-        
-    Returns:
-        Index of the selection to use as default.
-    """
-    default_index = 0
-    last_path = st.session_state.get('last_scraped_path')
-    
-    if last_path:
-        for idx, key in enumerate(choices):
-            info = display_map.get(key)
-            if info and info.get('path'):
-                if os.path.normpath(info.get('path')) == os.path.normpath(last_path):
-                    default_index = idx
-                    break
-    
-    return default_index
-
-
-
-def render_analytics_view_full(analysis, scraped_path, analysis_name, config, analysis_files, scraped_files):
+def render_analytics_view_full(analysis, scraped_path, analysis_name, config):
     """Render the full analytics view with all controls and prompt generator."""
     # --- MAIN ANALYSIS VIEW ---
     # (Scraper controls were moved to a dedicated 'Scraper' view.)
@@ -85,24 +57,6 @@ def main():
     # Get file configuration
     config = get_file_config()
 
-    # Load files
-    analysis_files = get_analysis_files(config.analysis_dir)
-    scraped_files = get_scraped_files(config.scraped_dir)
-
-    # Build display map
-    display_map = build_display_map(analysis_files, scraped_files)
-
-    # Handle empty state
-    if not display_map:
-        st.warning(
-            'Brak plików analizy ani zeskrapowanych artykułów w katalogu reports/. '
-            'Możesz użyć panelu poniżej, aby zescrapować URL.'
-        )
-        display_map['(brak plików) Użyj panelu scrapowania poniżej'] = {
-            'type': 'none', 
-            'path': None
-        }
-
     # Move view selection to sidebar (render a header above the radio)
     view_options = ['Article View', 'Dashboard', 'Feed View', 'Scraper']
     default_view = st.session_state.get('selected_view', view_options[0])
@@ -122,17 +76,14 @@ def main():
     st.session_state['selected_view'] = view
 
     if view == 'Article View':
-        choices = list(display_map.keys())
-
-        # Analysis view: allow selecting analysis/scraped file
-        default_index = get_selection_index(choices, display_map)
-        sel = st.selectbox(
-            'Wybierz analizę / zescrapowany artykuł',
-            choices,
-            index=default_index,
-            key='main_analysis_select'
-        )
-        sel_info = display_map[sel]
+        # Analysis view: searchable, paginated picker over the corpus index
+        sel_info = render_article_selector(config.reports_dir)
+        if sel_info is None:
+            try:
+                render_sidebar()
+            except Exception:
+                pass
+            return
 
         analysis, scraped_path, analysis_name = load_analysis_data(sel_info, config.scraped_dir)
 
@@ -144,7 +95,7 @@ def main():
         except Exception:
             pass
 
-        render_analytics_view_full(analysis, scraped_path, analysis_name, config, analysis_files, scraped_files)
+        render_analytics_view_full(analysis, scraped_path, analysis_name, config)
     elif view == 'Dashboard':
         # Render sidebar for dashboard (no per-article prompts)
         try:
@@ -152,8 +103,8 @@ def main():
         except Exception:
             pass
 
-        # Render dashboard using available analysis files
-        render_dashboard(analysis_files)
+        # Render dashboard from the corpus index aggregates
+        render_dashboard(config.reports_dir)
     elif view == 'Scraper':
         # Dedicated Scraper view: render scrapers in the main area (not sidebar)
         try:
@@ -164,8 +115,7 @@ def main():
         render_scraper_view(config.scraped_dir)
 
     else:
-        # Build feed candidates and render feed (no analysis selector in Feed view)
-        candidates = get_candidates_for_feed(analysis_files, scraped_files)
+        # Render feed from the shared corpus cache (no analysis selector in Feed view)
         # For the Feed view we show scrapers in the sidebar but hide the prompt
         # generator (it only applies to per-article Analysis view).
         try:
@@ -173,7 +123,7 @@ def main():
         except Exception:
             pass
 
-        render_feed(candidates)
+        render_feed(config.reports_dir)
 
 
 if __name__ == "__main__":
@@ -9,7 +9,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from streamlit_app import initialize_app, get_file_config  # Reuse shared setup helpers
 from ui.feed_view import render_feed
-from utils.file_loader import get_analysis_files, get_scraped_files, get_candidates_for_feed
 
 
 def main():
@@ -20,15 +19,7 @@ def main():
     )
 
     config = get_file_config()
-    analysis_files = get_analysis_files(config.analysis_dir)
-    scraped_files = get_scraped_files(config.scraped_dir)
-    candidates = get_candidates_for_feed(analysis_files, scraped_files)
-
-    if not candidates:
-        st.info("Brak danych do wyświetlenia w widoku feedu.")
-        return
-
-    render_feed(candidates)
+    render_feed(config.reports_dir)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+"""Searchable, paginated article picker for the Article View.
+
+Entries come from the corpus index title listing (id, source, title,
+has_analysis), one page at a time, instead of opening every report file to
+build a single selectbox with thousands of options.
+"""
+
+import os
+from typing import Optional
+
+import streamlit as st
+
+from core.index import get_index, article_id_from_path
+
+# Options shown per selector page
+SELECTOR_PAGE_SIZE = 50
+
+# Rescan reports/ at most this often; reruns in between reuse the index as is
+INDEX_SYNC_INTERVAL_S = 2.0
+
+
+def format_article_option(entry: dict) -> str:
+    """Selectbox label for an entry (same format as the former display map)."""
+    src = entry.get('source') or 'unknown'
+    title = entry.get('title') or os.path.basename(entry.get('path') or '')
+    title = title if len(title) <= 120 else title[:117] + '...'
+    display = f"{src} — {title}"
+    return display if entry.get('has_analysis') else f"SCRAPED — {display}"
+
+
+def render_article_selector(reports_dir: str) -> Optional[dict]:
+    """Render the article picker and return selection info for `load_analysis_data`.
+
+    Args:
+        reports_dir: Reports directory (with analysis/ and scraped/ subfolders).
+
+    Returns:
+        Dict with 'type' ('analysis', 'scraped' or 'none') and 'path', or None
+        when the search matched nothing.
+    """
+    index = get_index(reports_dir)
+    index.sync(max_age=INDEX_SYNC_INTERVAL_S)
+
+    if 'article_select_page' not in st.session_state:
+        st.session_state['article_select_page'] = 1
+
+    query = st.text_input('🔎 Szukaj artykułu (tytuł)', key='article_select_query',
+                          placeholder='np. wybory, Łódź')
+    if query != st.session_state.get('article_select_last_query', ''):
+        st.session_state['article_select_last_query'] = query
+        st.session_state['article_select_page'] = 1
+
+    page = st.session_state['article_select_page']
+    entries, total = index.list_titles(query, limit=SELECTOR_PAGE_SIZE, offset=(page - 1) * SELECTOR_PAGE_SIZE)
+
+    if total == 0:
+        if query.strip():
+            st.info('Brak artykułów pasujących do wyszukiwania.')
+            return None
+        st.warning(
+            'Brak plików analizy ani zeskrapowanych artykułów w katalogu reports/. '
+            'Możesz użyć panelu poniżej, aby zescrapować URL.'
+        )
+        return {'type': 'none', 'path': None}
+
+    total_pages = ((total - 1) // SELECTOR_PAGE_SIZE) + 1
+    if page > total_pages:
+        st.session_state['article_select_page'] = page = total_pages
+        entries, _ = index.list_titles(query, limit=SELECTOR_PAGE_SIZE, offset=(page - 1) * SELECTOR_PAGE_SIZE)
+
+    # A freshly scraped article is preselected even if it is not on this page
+    last_path = st.session_state.get('last_scraped_path')
+    if last_path and not query.strip():
+        _, last_id = article_id_from_path(last_path)
+        if last_id and all(e['id'] != last_id for e in entries):
+            last_entry = index.get_title(last_id)
+            if last_entry:
+                entries = [last_entry] + entries
+        default_index = next((i for i, e in enumerate(entries) if e['id'] == last_id), 0)
+    else:
+        default_index = 0
+
+    select_col, nav_col = st.columns([4, 1])
+    with select_col:
+        sel = st.selectbox(
+            f'Wybierz analizę / zescrapowany artykuł ({total})',
+            range(len(entries)),
+            index=default_index,
+            format_func=lambda i: format_article_option(entries[i]),
+            key=f'main_analysis_select_{page}_{query}',
+        )
+    with nav_col:
+        st.markdown("<div style='height:4px;'></div>", unsafe_allow_html=True)
+        prev_col, next_col = st.columns(2)
+        with prev_col:
+            if st.button('◀', key='article_select_prev', disabled=page <= 1, use_container_width=True):
+                st.session_state['article_select_page'] = page - 1
+                st.rerun()
+        with next_col:
+            if st.button('▶', key='article_select_next', disabled=page >= total_pages, use_container_width=True):
+                st.session_state['article_select_page'] = page + 1
+                st.rerun()
+        st.caption(f'Strona {page} / {total_pages}')
+
+    entry = entries[sel]
+    return {'type': 'analysis' if entry['has_analysis'] else 'scraped', 'path': entry['path']}
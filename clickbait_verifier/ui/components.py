@@ -217,7 +217,11 @@ def render_score_card(score_val: Optional[float], label_val: Optional[str]) -> s
     return textwrap.dedent(score_card)
 
 
+# Badge images live in clickbait_verifier/static/ (served at app/static/ when enabled)
+STATIC_DIR = Path(__file__).resolve().parents[1] / 'static'
+
 _BADGE_IMAGE_CACHE: dict[str, Optional[str]] = {}
+_STATIC_FILE_EXISTS: dict[str, bool] = {}
 
 
 def _sanitize_badge_text(value: Optional[str]) -> str:
@@ -242,8 +246,7 @@ def _get_badge_image_data_uri(image_path: Optional[str]) -> Optional[str]:
     try:
         path = Path(image_path)
         if not path.is_absolute():
-            repo_root = Path(__file__).resolve().parents[2]
-            path = (repo_root / path).resolve()
+            path = (STATIC_DIR / path).resolve()
 
         if not path.exists():
             _BADGE_IMAGE_CACHE[image_path] = None
@@ -259,6 +262,49 @@ def _get_badge_image_data_uri(image_path: Optional[str]) -> Optional[str]:
         return None
 
 
+def _get_static_image_url(image_path: str, cache_exists: bool = True) -> Optional[str]:
+    """Return the app/static/ URL for a file if Streamlit static serving can serve it.
+
+    Set cache_exists=False for files that may appear later (e.g. thumbnails).
+    """
+    try:
+        if not st.get_option('server.enableStaticServing'):
+            return None
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        if ctx is None:
+            return None
+        # Streamlit serves the static/ folder next to the entry script
+        static_dir = Path(ctx.main_script_path).resolve().parent / 'static'
+    except Exception:
+        return None
+
+    key = str(static_dir / image_path)
+    if not cache_exists:
+        return f"app/static/{image_path}" if (static_dir / image_path).is_file() else None
+    if key not in _STATIC_FILE_EXISTS:
+        _STATIC_FILE_EXISTS[key] = (static_dir / image_path).is_file()
+    return f"app/static/{image_path}" if _STATIC_FILE_EXISTS[key] else None
+
+
+def get_thumbnail_src(thumb: Optional[str]) -> Optional[str]:
+    """Return the static URL of a locally generated article thumbnail, if servable."""
+    if not thumb:
+        return None
+    return _get_static_image_url(f"thumbs/{thumb}", cache_exists=False)
+
+
+def get_badge_image_src(image_path: Optional[str]) -> Optional[str]:
+    """Return an <img> src for a badge: static URL when served, otherwise a data URI."""
+    if not image_path:
+        return None
+    if not Path(image_path).is_absolute():
+        static_url = _get_static_image_url(image_path)
+        if static_url:
+            return static_url
+    return _get_badge_image_data_uri(image_path)
+
+
 def render_badges_card(badges: Sequence[dict], max_items: int = 3) -> str:
     """Generate HTML card showcasing up to `max_items` badges.
 
@@ -274,7 +320,7 @@ def render_badges_card(badges: Sequence[dict], max_items: int = 3) -> str:
     else:
         rendered = []
         for badge in list(badges)[:max_items]:
-            image_uri = _get_badge_image_data_uri(badge.get('image'))
+            image_uri = get_badge_image_src(badge.get('image'))
             icon = _sanitize_badge_text(badge.get('icon') or '•')
             name = _sanitize_badge_text(badge.get('name') or badge.get('id') or '')
             description = _sanitize_badge_text(badge.get('description') or '')
@@ -355,10 +401,10 @@ def render_score_card_with_rationale(score_val: Optional[float], label_val: Opti
     
     badge_path = badge_map.get(label_val.lower() if label_val else '', None)
     
-    # Get badge image as data URI
+    # Badge image (static URL, or data URI when static serving is off)
     badge_html = ''
     if badge_path:
-        badge_uri = _get_badge_image_data_uri(badge_path)
+        badge_uri = get_badge_image_src(badge_path)
         if badge_uri:
             badge_html = f'<img src="{badge_uri}" alt="{label_text}" style="width:48px;height:48px;margin-bottom:8px;" />'
     
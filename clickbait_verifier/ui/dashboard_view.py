@@ -2,6 +2,7 @@
 
 This view provides three sections:
 - Ranking: top-N articles sorted by score (descending) showing title, source, score and label.
+- Trends: daily article counts per label and daily mean score.
 - Portal counts: simple bar chart of number of 'strong' clickbait articles per source/portal.
 - Review list: plain one-line-per-article list of candidates "warto się przyjrzeć" obok wykresu.
 """
@@ -10,64 +11,68 @@ from typing import List, Dict, Any
 
 import streamlit as st
 
-from utils.file_loader import load_json_if_exists
+from core.index import get_index
 
+# Rescan reports/ at most this often; reruns in between read the cached aggregates
+INDEX_SYNC_INTERVAL_S = 2.0
 
-def _load_all_analyses(analysis_files: List[str]) -> List[Dict[str, Any]]:
-    results = []
-    for p in analysis_files:
-        a = load_json_if_exists(p)
-        if not a:
-            continue
-        # ensure stable fields
-        results.append(a)
-    return results
+TIME_RANGES = {'Ostatnie 30 dni': 30, 'Ostatnie 90 dni': 90, 'Wszystko': None}
 
 
-def _top_ranking(analyses: List[Dict[str, Any]], top_n: int = 15) -> List[Dict[str, Any]]:
-    # Sort by score (None treated as -inf)
-    def key_fn(a):
-        s = a.get('score')
-        return s if isinstance(s, (int, float)) else -999999
+def _portal_counts_strong(by_source: List[Dict[str, Any]]) -> Dict[str, int]:
+    return {r['source']: r['n'] for r in by_source if r['label'] == 'strong'}
 
-    sorted_list = sorted(analyses, key=key_fn, reverse=True)
-    return sorted_list[:top_n]
 
+def _render_time_series(by_day: List[Dict[str, Any]]):
+    """Daily article counts per label and daily mean score, from the per-day rollup."""
+    import pandas as pd
 
-def _portal_counts_strong(analyses: List[Dict[str, Any]]) -> Dict[str, int]:
-    counts = {}
-    for a in analyses:
-        label = a.get('label')
-        if label == 'strong':
-            src = a.get('source') or 'unknown'
-            counts[src] = counts.get(src, 0) + 1
-    return counts
+    if not by_day:
+        st.info('Brak danych do wykresów czasowych.')
+        return
+    df = pd.DataFrame(by_day)
+    df = df[df['day'] != '']
+    df['day'] = pd.to_datetime(df['day'], format='%Y-%m-%d', errors='coerce')
+    df = df.dropna(subset=['day'])
+
+    range_name = st.selectbox('Zakres', list(TIME_RANGES.keys()), key='dashboard_time_range')
+    days = TIME_RANGES[range_name]
+    if days is not None and not df.empty:
+        df = df[df['day'] >= df['day'].max() - pd.Timedelta(days=days - 1)]
+    if df.empty:
+        st.info('Brak danych w wybranym zakresie.')
+        return
 
+    counts = df.pivot_table(index='day', columns='label', values='n', aggfunc='sum', fill_value=0)
+    scored = df.dropna(subset=['avg_score']).assign(score_sum=lambda d: d['avg_score'] * d['n'])
+    daily = scored.groupby('day')[['score_sum', 'n']].sum()
+    mean_score = (daily['score_sum'] / daily['n']).rename('średni score').to_frame()
 
-def _review_candidates(analyses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    candidates = []
-    for a in analyses:
-        label = a.get('label')
-        score = a.get('score')
-        # Heuristic: include mild-labelled OR borderline scores (30-49)
-        if label == 'mild' or (isinstance(score, (int, float)) and 30 <= score <= 49):
-            candidates.append(a)
-    # keep stable order (by score desc)
-    candidates.sort(key=lambda x: x.get('score') or 0, reverse=True)
-    return candidates
+    counts_col, score_col = st.columns(2)
+    with counts_col:
+        st.caption('Liczba przeanalizowanych artykułów dziennie wg etykiety')
+        st.bar_chart(counts)
+    with score_col:
+        st.caption('Średni score dziennie')
+        st.line_chart(mean_score)
 
 
-def render_dashboard(analysis_files: List[str]):
+def render_dashboard(reports_dir: str):
     """Render the Dashboard view.
 
+    Rankings and counts come from aggregates the corpus index maintains
+    incrementally as analyses are written, so a rerun does not reload files.
+
     Args:
-        analysis_files: list of analysis file paths (from FileConfig)
+        reports_dir: Reports directory (from FileConfig)
     """
     st.header('Dashboard — ranking clickbait')
 
-    analyses = _load_all_analyses(analysis_files)
+    index = get_index(reports_dir)
+    index.sync(max_age=INDEX_SYNC_INTERVAL_S)
+    by_source = index.label_counts('source')
 
-    if not analyses:
+    if not by_source:
         st.info('Brak analiz w katalogu reports/analysis — najpierw zescrapuj i przeanalizuj artykuły.')
         return
 
@@ -80,10 +85,11 @@ def render_dashboard(analysis_files: List[str]):
 
     # Ranking
     st.subheader(f'Top {top_n} najbardziej clickbaitowych artykułów (wg score)')
-    top = _top_ranking(analyses, top_n)
+    top = index.top_articles(int(top_n))
 
     for idx, a in enumerate(top, start=1):
         score = a.get('score')
+        score = f"{score:g}" if isinstance(score, float) else score
         label = a.get('label') or '-'
         src = a.get('source') or 'unknown'
         title = a.get('title') or a.get('url') or f"(id {a.get('id')})"
@@ -96,9 +102,13 @@ def render_dashboard(analysis_files: List[str]):
 
     st.markdown('---')
 
+    # Time series
+    st.subheader('Trendy w czasie')
+    _render_time_series(index.label_counts('day'))
+
     # Portal counts
-    counts = _portal_counts_strong(analyses)
-    candidates = _review_candidates(analyses)
+    counts = _portal_counts_strong(by_source)
+    candidates = index.review_candidates()
 
     st.markdown('---')
     st.subheader('Portale vs lista artykułów do weryfikacji (obok wykresu)')
@@ -1,6 +1,7 @@
 """Feed view for end-user display."""
 
 import streamlit as st
+import pandas as pd
 import os
 import sys
 import html
@@ -10,8 +11,9 @@ from typing import List, Tuple, Optional
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.file_loader import load_json_if_exists
-from utils.helpers import fetch_image_from_page
+from core.index import get_index
+from utils.feed_corpus import get_feed_corpus
+from core.images import lookup_image, schedule_image
 from ui.components import (
     render_simple_header_card_with_suggestion,
     render_image_block_compact,
@@ -19,11 +21,16 @@ from ui.components import (
     render_badges_card,
     get_score_color,
     format_score_display,
-    _get_badge_image_data_uri,
+    get_badge_image_src,
+    get_thumbnail_src,
     get_label_display_name,
 )
 
 
+# With page size 'All' cards are rendered in chunks of this many, with a "show more" button
+FEED_ALL_CHUNK = 25
+
+
 def _get_label_badge_html(label: Optional[str], size: int = 48) -> str:
     """Get HTML for label badge image.
     
@@ -44,7 +51,7 @@ def _get_label_badge_html(label: Optional[str], size: int = 48) -> str:
     badge_path = badge_map.get(label.lower() if label else '', None)
     
     if badge_path:
-        badge_uri = _get_badge_image_data_uri(badge_path)
+        badge_uri = get_badge_image_src(badge_path)
         if badge_uri:
             return f'<img src="{badge_uri}" alt="{label}" style="width:{size}px;height:{size}px;" />'
     
@@ -91,6 +98,7 @@ def _render_pagination_controls(filtered_total: int):
             if sel != st.session_state['feed_page_size']:
                 st.session_state['feed_page_size'] = sel
                 st.session_state['feed_page'] = 1  # Reset to first page on page size change
+                st.session_state['feed_all_visible'] = FEED_ALL_CHUNK
                 st.rerun()
         
         with col2:
@@ -150,11 +158,11 @@ def _render_pagination_controls(filtered_total: int):
                 st.markdown("<div style='height:74px;'></div>", unsafe_allow_html=True)
 
 
-def render_feed(candidates: List[Tuple[float, str]], max_items: int = 10):
+def render_feed(reports_dir: str, max_items: int = 10):
     """Render a simple feed of articles with pagination controls.
 
     Args:
-        candidates: List of (mtime, path) tuples sorted by mtime descending.
+        reports_dir: Reports directory (with analysis/ and scraped/ subfolders).
         max_items: (deprecated) kept for compatibility but feed now uses pagination controls.
     """
     # --- Initialize session state FIRST (before any callbacks can be triggered) ---
@@ -173,92 +181,13 @@ def render_feed(candidates: List[Tuple[float, str]], max_items: int = 10):
         except (ValueError, TypeError):
             pass
     
-    # --- Load all data first for filtering and stats ---
-    all_articles = []
-    for _, p in candidates:
-        data = load_json_if_exists(p)
-        if data is None:
-            continue
-            
-        is_analysis = os.path.basename(p).startswith('analysis_')
-        
-        if is_analysis:
-            a = data
-            src = a.get('source')
-            title = a.get('title') or '-'
-            url = a.get('url')
-            score = a.get('score')
-            label = a.get('label')
-            
-            scraped_id = a.get('id')
-            scraped_dir = os.path.join(os.path.dirname(p), '..', 'scraped')
-            scraped_path = os.path.join(scraped_dir, f'scraped_{scraped_id}.json')
-            scraped_data = load_json_if_exists(scraped_path)
-        else:
-            s = data
-            scraped_data = data
-            a = {
-                'id': s.get('id'),
-                'source': s.get('source'),
-                'title': s.get('title') or os.path.basename(p),
-                'url': s.get('url'),
-                'score': None,
-                'label': None,
-                'suggestions': {},
-                'rationale': [],
-                'signals': {}
-            }
-            src = a.get('source')
-            title = a.get('title')
-            url = a.get('url')
-            score = a.get('score')
-            label = a.get('label')
-        
-        # Get article date
-        current_date = ''
-        try:
-            date_source = None
-            if scraped_data and isinstance(scraped_data, dict):
-                for key in ('fetched_at', 'fetched', 'added', 'created_at', 'published'):
-                    if scraped_data.get(key):
-                        date_source = scraped_data.get(key)
-                        break
-
-            if not date_source and isinstance(a, dict):
-                for key in ('fetched_at', 'fetched', 'added', 'created_at', 'published', 'analyzed_at'):
-                    if a.get(key):
-                        date_source = a.get(key)
-                        break
-
-            if date_source:
-                if isinstance(date_source, (int, float)):
-                    current_date = datetime.fromtimestamp(float(date_source)).strftime('%Y-%m-%d')
-                else:
-                    try:
-                        current_date = datetime.fromisoformat(str(date_source)).strftime('%Y-%m-%d')
-                    except Exception:
-                        try:
-                            current_date = datetime.strptime(str(date_source)[:10], '%Y-%m-%d').strftime('%Y-%m-%d')
-                        except Exception:
-                            current_date = ''
-
-            if not current_date:
-                current_date = datetime.fromtimestamp(os.path.getmtime(p)).strftime('%Y-%m-%d')
-        except Exception:
-            current_date = ''
-        
-        all_articles.append({
-            'path': p,
-            'data': a,
-            'scraped_data': scraped_data,
-            'source': src,
-            'title': title,
-            'url': url,
-            'score': score,
-            'label': label,
-            'date': current_date,
-            'mtime': os.path.getmtime(p) if os.path.exists(p) else 0
-        })
+    # --- Shared, incrementally refreshed corpus; filters are vectorized masks over its frame ---
+    corpus = get_feed_corpus(reports_dir)
+    frame = corpus.frame()
+    if frame.empty:
+        st.info("Brak danych do wyświetlenia w widoku feedu.")
+        return
+    mask = pd.Series(True, index=frame.index)
     
     # --- Filters and Sorting in Expander ---
     with st.expander("🔍 Filtry i sortowanie", expanded=True):
@@ -302,6 +231,21 @@ def render_feed(candidates: List[Tuple[float, str]], max_items: int = 10):
         </style>
         """, unsafe_allow_html=True)
         
+        # Full-text search (title, content, summary) backed by the corpus index
+        search_query = st.text_input('🔎 Szukaj', value=st.session_state.get('feed_search', ''),
+                                     placeholder='np. wybory, Łódź, szczepionki', key='feed_search_input')
+        if search_query != st.session_state.get('feed_search', ''):
+            st.session_state['feed_search'] = search_query
+            st.session_state['feed_page'] = 1
+            st.session_state['feed_all_visible'] = FEED_ALL_CHUNK
+        if search_query.strip():
+            try:
+                # the corpus refresh above already synced the index
+                hit_ids = {h['id'] for h in get_index(reports_dir).search(search_query, limit=None)}
+                mask &= frame['id'].isin(hit_ids)
+            except Exception as e:
+                st.warning(f'Wyszukiwanie niedostępne: {e}')
+
         # Initialize date filter in session state
         if 'feed_date_filter' not in st.session_state:
             st.session_state['feed_date_filter'] = 'Dzisiaj'
@@ -321,21 +265,22 @@ def render_feed(candidates: List[Tuple[float, str]], max_items: int = 10):
             st.session_state['feed_date_filter'] = selected_date_filter
             
             if selected_date_filter == 'Dzisiaj':
-                all_articles = [art for art in all_articles if art['date'] == today_str]
+                mask &= frame['day'] == pd.Timestamp(today_str)
             elif selected_date_filter == 'Ostatnie 7 dni':
                 from datetime import timedelta
                 cutoff_date = (dt.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-                all_articles = [art for art in all_articles if art['date'] >= cutoff_date]
+                mask &= frame['day'] >= pd.Timestamp(cutoff_date)
             elif selected_date_filter == 'Ostatnie 30 dni':
                 from datetime import timedelta
                 cutoff_date = (dt.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-                all_articles = [art for art in all_articles if art['date'] >= cutoff_date]
+                mask &= frame['day'] >= pd.Timestamp(cutoff_date)
         
         with filter_col1:
-            sources = sorted(list(set([art['source'] for art in all_articles if art['source']])))
+            visible_sources = frame.loc[mask, 'source'].dropna()
+            sources = sorted(visible_sources[visible_sources != ''].unique())
             selected_sources = st.multiselect('📰 Źródło', ['Wszystkie'] + sources, default=['Wszystkie'])
             if 'Wszystkie' not in selected_sources and selected_sources:
-                all_articles = [art for art in all_articles if art['source'] in selected_sources]
+                mask &= frame['source'].isin(selected_sources)
         
         with filter_col2:
             labels = ['not_clickbait', 'mild', 'strong', 'extreme']
@@ -349,26 +294,27 @@ def render_feed(candidates: List[Tuple[float, str]], max_items: int = 10):
             if 'Wszystkie' not in selected_labels and selected_labels:
                 reverse_map = {v: k for k, v in label_display.items()}
                 selected_label_keys = [reverse_map.get(l, l) for l in selected_labels]
-                all_articles = [art for art in all_articles if art['label'] in selected_label_keys]
+                mask &= frame['label'].isin(selected_label_keys)
         
         with filter_col3:
             min_score = st.number_input('📊 Min. wynik', min_value=0, max_value=100, value=0, step=5)
             max_score = st.number_input('📊 Max. wynik', min_value=0, max_value=100, value=100, step=5)
-            all_articles = [art for art in all_articles if art['score'] is not None and min_score <= art['score'] <= max_score or art['score'] is None]
+            mask &= frame['score'].isna() | frame['score'].between(min_score, max_score)
         
         with filter_col4:
+            # Each option maps the frame to an ascending sort key (stable, ties keep newest first)
             sort_options = {
-                'Data (najnowsze)': lambda x: -x['mtime'],
-                'Data (najstarsze)': lambda x: x['mtime'],
-                'Wynik (malejąco)': lambda x: -(x['score'] if x['score'] is not None else -1),
-                'Wynik (rosnąco)': lambda x: (x['score'] if x['score'] is not None else 999),
-                'Źródło (A-Z)': lambda x: x['source'] or 'zzz',
+                'Data (najnowsze)': lambda f: -f['mtime'],
+                'Data (najstarsze)': lambda f: f['mtime'],
+                'Wynik (malejąco)': lambda f: -f['score'].fillna(-1),
+                'Wynik (rosnąco)': lambda f: f['score'].fillna(999),
+                'Źródło (A-Z)': lambda f: f['source'].where(f['source'].notna() & (f['source'] != ''), 'zzz'),
             }
             selected_sort = st.selectbox('🔃 Sortowanie', list(sort_options.keys()))
-            all_articles = sorted(all_articles, key=sort_options[selected_sort])
     
-    filtered_total = len(all_articles)
-    original_total = len(candidates)
+    filtered = frame.loc[mask]
+    filtered = filtered.loc[sort_options[selected_sort](filtered).sort_values(kind='stable').index]
+    filtered_total = len(filtered)
     if filtered_total == 0:
         st.info("Brak artykułów spełniających kryteria filtrowania.")
         return
@@ -381,22 +327,24 @@ def render_feed(candidates: List[Tuple[float, str]], max_items: int = 10):
     
     # --- Pagination controls removed from top, only at bottom now ---
 
-    # Determine slice of candidates to show based on pagination
+    # Determine slice of candidates to show based on pagination; card HTML is
+    # only built for this slice ('All' grows chunk by chunk via "show more")
     if st.session_state['feed_page_size'] == 'All':
-        page_articles = all_articles
+        all_visible = st.session_state.get('feed_all_visible', FEED_ALL_CHUNK)
+        page_ids = filtered['id'].iloc[:all_visible]
     else:
         page_size = int(st.session_state['feed_page_size'])
         page = max(1, int(st.session_state.get('feed_page', 1)))
         start = (page - 1) * page_size
         end = start + page_size
-        page_articles = all_articles[start:end]
+        page_ids = filtered['id'].iloc[start:end]
+    page_articles = [art for art in map(corpus.get, page_ids) if art is not None]
 
     shown = 0
     last_date = None
     
     for art in page_articles:
         a = art['data']
-        scraped_data = art['scraped_data']
         current_date = art['date']
         
         if current_date and current_date != last_date:
@@ -417,22 +365,16 @@ def render_feed(candidates: List[Tuple[float, str]], max_items: int = 10):
         # Header card
         suggested = a.get('suggestions', {}).get('rewrite_title_neutral') if isinstance(a.get('suggestions'), dict) else None
         rationale = a.get('rationale_user_friendly', [])
-        image_url_local = None
-        
-        if scraped_data:
-            meta = scraped_data.get('meta') if isinstance(scraped_data.get('meta'), dict) else {}
-            image_url_local = (
-                scraped_data.get('lead_image_url') or 
-                scraped_data.get('image') or 
-                meta.get('og:image') or 
-                meta.get('twitter:image')
-            )
+        image_url_local = art['image_url']
         
-        if not image_url_local and art['url']:
+        # Prefer the local thumbnail; never fetch third-party pages while rendering
+        if art['url']:
             try:
-                candidate = fetch_image_from_page(art['url'])
-                if candidate:
-                    image_url_local = candidate
+                cached = lookup_image(art['url'], reports_dir)
+                if cached is None:
+                    schedule_image(art['url'], image_url_local, reports_dir)
+                else:
+                    image_url_local = get_thumbnail_src(cached['thumb']) or image_url_local or cached['image_url']
             except Exception:
                 pass
 
@@ -545,6 +487,13 @@ def render_feed(candidates: List[Tuple[float, str]], max_items: int = 10):
             st.markdown("<div style='margin-bottom:24px;'></div>", unsafe_allow_html=True)
         st.session_state['__feed_row_buffer'] = []
     
+    if st.session_state['feed_page_size'] == 'All' and all_visible < filtered_total:
+        remaining = filtered_total - all_visible
+        if st.button(f'Pokaż więcej ({min(FEED_ALL_CHUNK, remaining)} z {remaining} pozostałych)',
+                     use_container_width=True, key='feed_show_more'):
+            st.session_state['feed_all_visible'] = all_visible + FEED_ALL_CHUNK
+            st.rerun()
+
     # --- Pagination controls (bottom) ---
     st.markdown("<hr style='margin:32px 0;border:none;border-top:2px solid #e5e7eb;'>", unsafe_allow_html=True)
     _render_pagination_controls(filtered_total)
@@ -0,0 +1,160 @@
+"""Cached, incrementally refreshed corpus for the feed view.
+
+Every Streamlit rerun used to re-read all analysis files and their paired
+scraped files. The corpus below is shared across sessions via
+``st.cache_resource`` and follows the corpus index change log, so a rerun only
+re-reads articles whose analysis or scraped file actually changed.
+"""
+
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+from core.index import get_index
+from core.projections import scraped_image_url
+from utils.file_loader import load_json_if_exists
+
+# Rescan reports/ at most this often; reruns in between reuse the current records
+REFRESH_INTERVAL_S = 2.0
+
+_DATE_KEYS_SCRAPED = ('fetched_at', 'fetched', 'added', 'created_at', 'published')
+_DATE_KEYS_ANALYSIS = _DATE_KEYS_SCRAPED + ('analyzed_at',)
+
+
+def article_date(analysis: dict, scraped: Optional[dict], mtime: float) -> str:
+    """Return the article date as 'YYYY-MM-DD' (scraped fields, then analysis, then file mtime).
+
+    Args:
+        analysis: Analysis dictionary.
+        scraped: Paired scraped dictionary, if any.
+        mtime: Modification time of the analysis file (fallback).
+
+    Returns:
+        Date string, or '' if nothing could be parsed.
+    """
+    date_source = None
+    if scraped and isinstance(scraped, dict):
+        date_source = next((scraped[k] for k in _DATE_KEYS_SCRAPED if scraped.get(k)), None)
+    if not date_source and isinstance(analysis, dict):
+        date_source = next((analysis[k] for k in _DATE_KEYS_ANALYSIS if analysis.get(k)), None)
+
+    try:
+        if isinstance(date_source, (int, float)):
+            return datetime.fromtimestamp(float(date_source)).strftime('%Y-%m-%d')
+        if date_source:
+            try:
+                return datetime.fromisoformat(str(date_source)).strftime('%Y-%m-%d')
+            except ValueError:
+                try:
+                    return datetime.strptime(str(date_source)[:10], '%Y-%m-%d').strftime('%Y-%m-%d')
+                except ValueError:
+                    pass
+        return datetime.fromtimestamp(mtime).strftime('%Y-%m-%d') if mtime else ''
+    except (OverflowError, OSError, ValueError):
+        return ''
+
+
+class FeedCorpus:
+    """Normalized feed records for every analyzed article in a reports directory."""
+
+    def __init__(self, reports_dir: str):
+        self.reports_dir = os.path.normpath(os.path.abspath(reports_dir))
+        self.analysis_dir = os.path.join(self.reports_dir, 'analysis')
+        self.scraped_dir = os.path.join(self.reports_dir, 'scraped')
+        self._records: Dict[str, dict] = {}
+        self._ordered: Optional[List[dict]] = None
+        self._frame: Optional[pd.DataFrame] = None
+        self._cursor: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _load_record(self, article_id: str) -> Optional[dict]:
+        path = os.path.join(self.analysis_dir, f'analysis_{article_id}.json')
+        a = load_json_if_exists(path)
+        if not isinstance(a, dict):
+            return None
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = 0
+        scraped = load_json_if_exists(os.path.join(self.scraped_dir, f'scraped_{article_id}.json'))
+        return {
+            'id': article_id,
+            'path': path,
+            'data': a,
+            'source': a.get('source'),
+            'title': a.get('title') or '-',
+            'url': a.get('url'),
+            'score': a.get('score'),
+            'label': a.get('label'),
+            'image_url': scraped_image_url(scraped) if isinstance(scraped, dict) else None,
+            'date': article_date(a, scraped, mtime),
+            'mtime': mtime,
+        }
+
+    def records(self, max_age: float = REFRESH_INTERVAL_S) -> List[dict]:
+        """Return feed records, newest analysis first, after applying pending changes.
+
+        The returned list is shared; filter into new lists rather than mutating it.
+        """
+        with self._lock:
+            index = get_index(self.reports_dir)
+            index.sync(max_age=max_age)
+            while True:
+                changes = index.changes_since(self._cursor, limit=500)
+                if changes['reset']:
+                    self._records = {}
+                    self._ordered = None
+                for article_id in changes['deletes']:
+                    self._records.pop(article_id, None)
+                for article_id in changes['upserts']:
+                    record = self._load_record(article_id)
+                    if record is None:
+                        self._records.pop(article_id, None)
+                    else:
+                        self._records[article_id] = record
+                if changes['upserts'] or changes['deletes']:
+                    self._ordered = None
+                self._cursor = changes['cursor']
+                if not changes['has_more']:
+                    break
+            if self._ordered is None:
+                self._ordered = sorted(self._records.values(), key=lambda r: r['mtime'], reverse=True)
+                self._frame = None
+            return self._ordered
+
+    def frame(self, max_age: float = REFRESH_INTERVAL_S) -> pd.DataFrame:
+        """Return the records as a columnar frame (same order as `records()`).
+
+        Columns: id, source, title, label (category), score (float, NaN when not
+        scored), day (datetime64, NaT when unknown), date ('YYYY-MM-DD') and mtime.
+        Rebuilt only when the corpus changed; treat it as read-only.
+        """
+        self.records(max_age)
+        with self._lock:
+            if self._frame is None:
+                records = self._ordered
+                self._frame = pd.DataFrame({
+                    'id': [r['id'] for r in records],
+                    'source': [r['source'] for r in records],
+                    'title': [r['title'] for r in records],
+                    'label': pd.Categorical([r['label'] for r in records]),
+                    'score': pd.to_numeric(pd.Series([r['score'] for r in records], dtype=object), errors='coerce').astype('float64'),
+                    'day': pd.to_datetime(pd.Series([r['date'] for r in records], dtype=object), format='%Y-%m-%d', errors='coerce'),
+                    'date': [r['date'] for r in records],
+                    'mtime': pd.Series([r['mtime'] for r in records], dtype='float64'),
+                })
+            return self._frame
+
+    def get(self, article_id: str) -> Optional[dict]:
+        """Return the record for an article id (as of the last refresh)."""
+        return self._records.get(article_id)
+
+
+@st.cache_resource(show_spinner=False)
+def get_feed_corpus(reports_dir: str) -> FeedCorpus:
+    """Return the process-wide FeedCorpus for a reports directory."""
+    return FeedCorpus(reports_dir)
@@ -55,62 +55,6 @@ def get_scraped_files(scraped_dir: str) -> List[str]:
     return sorted(glob.glob(os.path.join(scraped_dir, 'scraped_*.json')))
 
 
-def build_display_map(analysis_files: List[str], scraped_files: List[str]) -> Dict[str, dict]:
-    """Build a map of display names to file information.
-    
-    Args:
-        analysis_files: List of analysis file paths.
-        scraped_files: List of scraped file paths.
-        
-    Returns:
-        Dictionary mapping display names to file info (type and path).
-    """
-    display_map = {}
-    analysis_ids = set()
-
-    # Process analysis files
-    for p in analysis_files:
-        try:
-            with open(p, 'r', encoding='utf-8') as f:
-                a = json.load(f)
-            src = a.get('source', 'unknown')
-            title = a.get('title', '')
-            display = f"{src} — {title if len(title) <= 120 else title[:117] + '...'}"
-            if a.get('id') is not None:
-                analysis_ids.add(a.get('id'))
-        except Exception:
-            display = os.path.basename(p)
-        
-        key = display
-        i = 1
-        while key in display_map:
-            key = f"{display} ({i})"
-            i += 1
-        display_map[key] = {'type': 'analysis', 'path': p}
-
-    # Process scraped files (skip if analysis exists for same id)
-    for p in scraped_files:
-        try:
-            with open(p, 'r', encoding='utf-8') as f:
-                s = json.load(f)
-            if s.get('id') in analysis_ids:
-                continue
-            src = s.get('source', 'unknown')
-            title = s.get('title', os.path.basename(p))
-            display = f"SCRAPED — {src} — {title if len(title) <= 120 else title[:117] + '...'}"
-        except Exception:
-            display = os.path.basename(p)
-        
-        key = display
-        i = 1
-        while key in display_map:
-            key = f"{display} ({i})"
-            i += 1
-        display_map[key] = {'type': 'scraped', 'path': p}
-
-    return display_map
-
-
 def load_analysis_data(sel_info: dict, scraped_dir: str) -> Tuple[Optional[dict], Optional[str], Optional[str]]:
     """Load analysis data based on selection info.
     
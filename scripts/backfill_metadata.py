@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Backfill missing metadata fields in reports/scraped/*.json (parallel, resumable).
+
+Replaces the former add_image_urls_to_scraped.py (sequential, image_url only).
+Pages are loaded concurrently, updated files are written and re-indexed in
+batches, and progress is checkpointed to reports/backfill/<job>.jsonl, so an
+interrupted run continues where it stopped when started again. Pages stored in
+the HTML archive (reports/archive/) are read from disk instead of fetched.
+
+Options:
+  --fields        Comma-separated fields: image_url,published,site_name,summary (default: image_url)
+  --workers       Parallel page loads (default: 8)
+  --batch-size    Articles per write/checkpoint batch (default: 50)
+  --limit         Process at most N candidates (newest first)
+  --overwrite     Replace existing values instead of filling missing ones
+  --revalidate    Re-check archived pages with conditional GETs instead of using them as is
+  --job           Checkpoint name (default: derived from --fields)
+  --reset         Forget the checkpoint and start over
+  --retry-failed  Process articles that failed in a previous run again
+
+Example:
+  python scripts/backfill_metadata.py --fields image_url,published --workers 16
+
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from clickbait_verifier.backfill import BACKFILL_FIELDS, BackfillJob
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Backfill missing metadata in scraped articles')
+    p.add_argument('--fields', default='image_url', help=f"Comma-separated subset of {','.join(BACKFILL_FIELDS)}")
+    p.add_argument('--reports-dir', default=None, help='Reports directory (default: repository reports/)')
+    p.add_argument('--workers', type=int, default=8, help='Parallel page loads')
+    p.add_argument('--batch-size', type=int, default=50, help='Articles per write/checkpoint batch')
+    p.add_argument('--limit', type=int, default=None, help='Process at most N candidates')
+    p.add_argument('--overwrite', action='store_true', help='Replace existing values')
+    p.add_argument('--revalidate', action='store_true', help='Conditional GET for archived pages')
+    p.add_argument('--job', default=None, help='Checkpoint name (default: derived from --fields)')
+    p.add_argument('--reset', action='store_true', help='Discard the checkpoint before running')
+    p.add_argument('--retry-failed', action='store_true', help='Retry articles that failed previously')
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    fields = [f.strip() for f in args.fields.split(',') if f.strip()]
+    try:
+        job = BackfillJob(
+            fields,
+            reports_dir=args.reports_dir,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            overwrite=args.overwrite,
+            revalidate=args.revalidate,
+            name=args.job or '_'.join(sorted(fields)),
+        )
+    except ValueError as e:
+        raise SystemExit(str(e))
+    if args.reset:
+        job.reset_checkpoint()
+    try:
+        stats = job.run(limit=args.limit, retry_failed=args.retry_failed)
+    except KeyboardInterrupt:
+        print('\nInterrupted; progress saved. Run again to resume.')
+        return 1
+    print(f"Done: {stats['updated']} updated, {stats['unchanged']} unchanged, "
+          f"{stats['failed']} failed (of {stats['total']})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
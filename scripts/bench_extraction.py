@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Accuracy and speed benchmark for `extract_content_and_title` over golden fixtures.
+
+Fixtures live in benchmarks/extraction/fixtures/<source>/ as pairs of
+`<name>.html` (saved page, UTF-8) and `<name>.json` with the golden values:
+
+  {"url": ..., "source": "rmf24", "title": ..., "content": ..., "published": ..., "reviewed": true}
+
+`run` extracts every fixture with the source's extractor YAML and reports, per
+source and overall:
+  - title accuracy (exact match after whitespace normalization)
+  - content token F1 against the golden content (folded word tokens)
+  - date accuracy (same minute as the golden `published`)
+  - throughput: docs/sec, p50/p95 ms per document, peak memory (tracemalloc)
+Results are saved as JSON under benchmarks/extraction/results/ and compared
+with the previous run.
+
+`add` saves a page as a new fixture, from the HTML archive (--url) or a local
+file (--html), with golden values prefilled from the current extractor and
+"reviewed": false. Correct the JSON by hand, then set "reviewed" to true.
+
+Options (run):
+  --source      Only fixtures of this source
+  --repeat      Timed extractions per fixture (default: 5)
+  --compare     Result JSON to compare against (default: latest saved run)
+  --no-save     Do not write a result file
+
+Example:
+  python scripts/bench_extraction.py run
+  python scripts/bench_extraction.py add --source rmf24 --url https://www.rmf24.pl/fakty/news-...
+
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from clickbait_verifier.content_extractor import load_extractor_for_source
+from clickbait_verifier.core.index import tokenize
+from clickbait_verifier.scraper import _format_datetime_for_json, extract_content_and_title
+
+BENCH_DIR = Path(__file__).parent.parent / 'benchmarks' / 'extraction'
+FIXTURES_DIR = BENCH_DIR / 'fixtures'
+RESULTS_DIR = BENCH_DIR / 'results'
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Benchmark extract_content_and_title against golden fixtures')
+    sub = p.add_subparsers(dest='command')
+    run = sub.add_parser('run', help='Run the benchmark (default)')
+    run.add_argument('--source', default=None, help='Only fixtures of this source')
+    run.add_argument('--repeat', type=int, default=5, help='Timed extractions per fixture')
+    run.add_argument('--compare', default=None, help='Result JSON to compare against')
+    run.add_argument('--no-save', action='store_true', help='Do not write a result file')
+    add = sub.add_parser('add', help='Add a fixture from the HTML archive or a local file')
+    add.add_argument('--source', required=True, help='Source name (extractor YAML name)')
+    add.add_argument('--url', default=None, help='Article URL (page is read from the HTML archive)')
+    add.add_argument('--html', default=None, help='Local HTML file instead of the archive')
+    add.add_argument('--name', default=None, help='Fixture name (default: derived from the URL/file)')
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in ('run', 'add', '-h', '--help'):
+        argv = ['run'] + argv
+    return p.parse_args(argv)
+
+
+# -- metrics -------------------------------------------------------------------
+
+def _norm(text):
+    return ' '.join(str(text).split()) if text else ''
+
+
+def token_f1(predicted, golden):
+    """Bag-of-words F1 over folded word tokens."""
+    pred, gold = Counter(tokenize(predicted)), Counter(tokenize(golden))
+    if not pred and not gold:
+        return 1.0
+    overlap = sum((pred & gold).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(pred.values())
+    recall = overlap / sum(gold.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def same_minute(predicted, golden):
+    if not golden:
+        return not predicted
+    try:
+        a = datetime.fromisoformat(str(predicted)).replace(tzinfo=None)
+        b = datetime.fromisoformat(str(golden)).replace(tzinfo=None)
+        return a.replace(second=0, microsecond=0) == b.replace(second=0, microsecond=0)
+    except (TypeError, ValueError):
+        return _norm(predicted) == _norm(golden)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+# -- fixtures ------------------------------------------------------------------
+
+def load_fixtures(source=None):
+    fixtures = []
+    for golden_path in sorted(FIXTURES_DIR.glob('*/*.json')):
+        if source and golden_path.parent.name.lower() != source.lower():
+            continue
+        html_path = golden_path.with_suffix('.html')
+        if not html_path.exists():
+            continue
+        golden = json.loads(golden_path.read_text(encoding='utf-8'))
+        fixtures.append({
+            'name': f'{golden_path.parent.name}/{golden_path.stem}',
+            'source': golden.get('source') or golden_path.parent.name,
+            'html': html_path.read_text(encoding='utf-8'),
+            'golden': golden,
+        })
+    return fixtures
+
+
+def extract(html, extractor):
+    content, title, published, _ = extract_content_and_title(html, extractor)
+    return {'title': title, 'content': content or '', 'published': _format_datetime_for_json(published)}
+
+
+# -- run -----------------------------------------------------------------------
+
+def _summarize(rows):
+    times = sorted(t for r in rows for t in r['times_ms'])
+    total_s = sum(times) / 1000.0
+    return {
+        'docs': len(rows),
+        'title_accuracy': round(sum(r['title_ok'] for r in rows) / len(rows), 4),
+        'content_f1': round(sum(r['content_f1'] for r in rows) / len(rows), 4),
+        'date_accuracy': round(sum(r['date_ok'] for r in rows) / len(rows), 4),
+        'docs_per_sec': round(len(times) / total_s, 1) if total_s else None,
+        'p50_ms': round(percentile(times, 50), 2),
+        'p95_ms': round(percentile(times, 95), 2),
+        'peak_mem_kb': max(r['peak_mem_kb'] for r in rows),
+    }
+
+
+def run_benchmark(fixtures, repeat):
+    extractors = {}
+    rows = []
+    for fx in fixtures:
+        source = fx['source']
+        if source not in extractors:
+            extractors[source] = load_extractor_for_source(source)
+        extractor = extractors[source]
+
+        # memory pass (tracemalloc slows extraction down, so it is not timed)
+        tracemalloc.start()
+        result = extract(fx['html'], extractor)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        times = []
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter()
+            extract(fx['html'], extractor)
+            times.append((time.perf_counter() - t0) * 1000.0)
+
+        golden = fx['golden']
+        rows.append({
+            'name': fx['name'],
+            'source': source,
+            'reviewed': bool(golden.get('reviewed')),
+            'title_ok': _norm(result['title']) == _norm(golden.get('title')),
+            'content_f1': round(token_f1(result['content'], golden.get('content')), 4),
+            'date_ok': same_minute(result['published'], golden.get('published')),
+            'times_ms': [round(t, 3) for t in times],
+            'peak_mem_kb': round(peak / 1024),
+        })
+
+    by_source = {}
+    for row in rows:
+        by_source.setdefault(row['source'], []).append(row)
+    return {
+        'overall': _summarize(rows),
+        'sources': {s: _summarize(r) for s, r in sorted(by_source.items())},
+        'fixtures': rows,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).parent.parent, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def print_summary(name, summary, previous=None):
+    def fmt(key, value, digits):
+        text = f'{value:.{digits}f}' if isinstance(value, (int, float)) else str(value)
+        if previous and isinstance(previous.get(key), (int, float)) and isinstance(value, (int, float)):
+            text += f' ({value - previous[key]:+.{digits}f})'
+        return text
+    print(f"{name:<14} docs {summary['docs']:>3}  title {fmt('title_accuracy', summary['title_accuracy'], 3)}  "
+          f"F1 {fmt('content_f1', summary['content_f1'], 3)}  date {fmt('date_accuracy', summary['date_accuracy'], 3)}  "
+          f"| {fmt('docs_per_sec', summary['docs_per_sec'], 1)} docs/s  p50 {fmt('p50_ms', summary['p50_ms'], 2)} ms  "
+          f"p95 {fmt('p95_ms', summary['p95_ms'], 2)} ms  peak {summary['peak_mem_kb']} KB")
+
+
+def latest_result():
+    results = sorted(RESULTS_DIR.glob('*.json'))
+    return results[-1] if results else None
+
+
+def cmd_run(args):
+    fixtures = load_fixtures(args.source)
+    if not fixtures:
+        raise SystemExit(f'No fixtures found in {FIXTURES_DIR}; add some with `bench_extraction.py add`')
+    compare_path = Path(args.compare) if args.compare else latest_result()
+    previous = json.loads(compare_path.read_text(encoding='utf-8')) if compare_path and compare_path.exists() else None
+
+    result = run_benchmark(fixtures, args.repeat)
+    result.update({'created_at': datetime.now().isoformat(timespec='seconds'), 'commit': _git_commit(),
+                   'repeat': args.repeat, 'source_filter': args.source})
+
+    if previous:
+        print(f"Compared with {compare_path.name} (commit {previous.get('commit')})")
+    prev_sources = (previous or {}).get('sources', {})
+    for source, summary in result['sources'].items():
+        print_summary(source, summary, prev_sources.get(source))
+    print_summary('overall', result['overall'], (previous or {}).get('overall'))
+    unreviewed = [r['name'] for r in result['fixtures'] if not r['reviewed']]
+    if unreviewed:
+        print(f'Note: {len(unreviewed)} fixture(s) not reviewed yet: {", ".join(unreviewed[:5])}')
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        out = RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f'Results saved to {out}')
+
+
+# -- add -----------------------------------------------------------------------
+
+def cmd_add(args):
+    if args.html:
+        html = Path(args.html).read_text(encoding='utf-8', errors='replace')
+        url = args.url
+    elif args.url:
+        from clickbait_verifier.core.archive import get_archive
+        page = get_archive().get(args.url)
+        if page is None:
+            raise SystemExit('URL not in the HTML archive; scrape it with CLICKBAIT_ARCHIVE_HTML=1 or pass --html')
+        html, url = page.html, args.url
+    else:
+        raise SystemExit('Pass --url (archived page) or --html (local file)')
+
+    name = args.name or re.sub(r'[^\w-]+', '-', (url or Path(args.html).stem).split('://')[-1]).strip('-')[-80:]
+    target = FIXTURES_DIR / args.source.lower()
+    target.mkdir(parents=True, exist_ok=True)
+    golden = extract(html, load_extractor_for_source(args.source))
+    golden = {'url': url, 'source': args.source, **golden, 'reviewed': False}
+    (target / f'{name}.html').write_text(html, encoding='utf-8')
+    (target / f'{name}.json').write_text(json.dumps(golden, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f'Fixture written to {target / name}.json; review the golden values and set "reviewed": true')
+
+
+def main():
+    args = parse_args()
+    if args.command == 'add':
+        cmd_add(args)
+    else:
+        cmd_run(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -18,8 +18,12 @@ import glob
 import json
 import os
 import shutil
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from clickbait_verifier.core.index import record_report_removed
+
 DEFAULT_PHRASE = "skorzystaj z naszego bota"
 
 
@@ -87,6 +91,8 @@ def main():
                 print(f'Usunięto: {f}')
         except Exception as e:
             print(f'Błąd przy usuwaniu {f}: {e}')
+            continue
+        record_report_removed(f)
 
     # zapis logu usuniętych plików
     try:
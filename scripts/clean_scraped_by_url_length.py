@@ -25,8 +25,12 @@ import argparse
 import json
 import re
 import shutil
+import sys
 from urllib.parse import urlparse
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from clickbait_verifier.core.index import record_report_removed
+
 
 def parse_args():
     p = argparse.ArgumentParser(description='Clean scraped JSON files by URL length/path/blacklist')
@@ -121,6 +125,7 @@ def main():
                 shutil.move(str(p), str(dest))
             else:
                 p.unlink()
+            record_report_removed(p)
             removed_count += 1
         except Exception as e:
             print(f'Failed to remove {p}: {e}')
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Show what the crawler has learned per host (reports/crawl.sqlite3).
+
+Prints the politeness state (current request rate, concurrency, pauses after
+429/503), the cached robots.txt files, the adaptive fetch-method statistics
+for `fetch_method: auto` and the latest scrape runs.
+
+Options:
+  --host        Only this host (e.g. rmf24.pl)
+  --reports-dir Reports directory (default: repository reports/)
+
+Example:
+  python scripts/crawl_state.py
+  python scripts/crawl_state.py --host rmf24.pl
+
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from clickbait_verifier.core.fetch_policy import get_fetch_policy, host_of
+from clickbait_verifier.core.politeness import get_politeness
+from clickbait_verifier.core.robots import get_robots
+from clickbait_verifier.core.run_journal import recent_runs
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Show per-host crawler state')
+    p.add_argument('--host', default=None, help='Only this host')
+    p.add_argument('--reports-dir', default=None, help='Reports directory')
+    return p.parse_args()
+
+
+def _fmt(value, digits=2):
+    return '-' if value is None else f'{value:.{digits}f}'
+
+
+def main():
+    args = parse_args()
+    host = host_of(args.host if '//' in (args.host or '//') else '//' + args.host) if args.host else None
+
+    print('Politeness (rate limit per host)')
+    rows = [r for r in get_politeness(args.reports_dir).rates() if not host or r['host'] == host]
+    for r in rows:
+        paused = f"  paused until {r['paused_until']}" if r.get('paused_until') else ''
+        print(f"  {r['host']:<32} rate {_fmt(r['rate'])}/s  concurrency {r['concurrency']}  "
+              f"latency {_fmt(r['latency_s'])}s  backoffs {r['backoffs']}{paused}")
+    if not rows:
+        print('  (no hosts yet)')
+
+    print('robots.txt')
+    rows = [r for r in get_robots(args.reports_dir).entries() if not host or host_of(r['origin']) == host]
+    for r in rows:
+        delay = f"  crawl-delay {r['crawl_delay']:g}s" if r['crawl_delay'] else ''
+        print(f"  {r['origin']:<40} status {r['status']}  expires "
+              f"{datetime.fromtimestamp(r['expires_at']).isoformat(timespec='minutes')}{delay}")
+    if not rows:
+        print('  (nothing cached)')
+
+    print('Fetch methods (fetch_method: auto)')
+    rows = get_fetch_policy(args.reports_dir).stats(host)
+    for r in rows:
+        chosen = ' *' if r['chosen'] == r['method'] else ''
+        print(f"  {r['host']:<32} {r['method']:<10}{chosen:<2} attempts {r['attempts']:<5} "
+              f"success {_fmt(r['success_rate'])}  content {_fmt(r['content_chars'], 0)} chars  "
+              f"latency {_fmt(r['latency_s'])}s  ({r['reason'] or ''})")
+    if not rows:
+        print('  (no statistics yet)')
+
+    print('Scrape runs (newest first)')
+    runs = recent_runs(args.reports_dir)
+    for r in runs:
+        state = 'finished' if r['finished_at'] else 'unfinished (resumed on next run)'
+        urls = ', '.join(f'{k} {v}' for k, v in sorted(r['urls'].items())) or 'no URLs'
+        timed_out = [name for name, status in r['sources'].items() if status == 'deadline']
+        deadline = f"  deadline hit: {', '.join(timed_out)}" if timed_out else ''
+        print(f"  {r['run_id']}  {state}  {urls}{deadline}")
+    if not runs:
+        print('  (no runs yet)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Show how a page's charset is detected (header, <meta>, BOM, statistical) and decoded.
+
+Compares `decode_html` from the fetch layer with requests' `apparent_encoding`
+(statistical detection over the whole body) and prints a sample of the text
+around Polish characters, to diagnose mojibake.
+
+Options:
+  url           Page to fetch
+  --file        Read the body from a local file instead of fetching
+  --content-type  Content-Type header to assume with --file
+
+The decoding cases themselves are tests: python -m pytest tests/test_encoding.py
+
+Example:
+  python scripts/debug_encoding_for_url.py https://www.rmf24.pl/fakty
+  python scripts/debug_encoding_for_url.py --file page.html --content-type "text/html; charset=ISO-8859-1"
+
+"""
+import argparse
+import codecs
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from clickbait_verifier.core.fetcher import _CT_CHARSET_RE, _META_CHARSET_RE, META_SNIFF_BYTES, decode_html
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Debug charset detection for a page')
+    p.add_argument('url', nargs='?', default=None, help='Page URL')
+    p.add_argument('--file', default=None, help='Local file with the response body')
+    p.add_argument('--content-type', default=None, help='Content-Type to assume with --file')
+    return p.parse_args()
+
+
+def _sample(text):
+    m = re.search(r'[ąćęłńóśźżĄĆĘŁŃÓŚŹŻ]|Ä|Å|Ã', text)
+    start = max(0, (m.start() if m else 0) - 60)
+    return ' '.join(text[start:start + 160].split())
+
+
+def main():
+    args = parse_args()
+    if args.file:
+        body, content_type, url, apparent = Path(args.file).read_bytes(), args.content_type, None, None
+    elif args.url:
+        import requests
+        r = requests.get(args.url, timeout=10, headers={'User-Agent': 'Mozilla/5.0'})
+        body, content_type, url = r.content, r.headers.get('Content-Type'), r.url
+        t0 = time.perf_counter()
+        apparent = r.apparent_encoding
+        print(f'apparent_encoding:   {apparent} ({(time.perf_counter() - t0) * 1000:.1f} ms over {len(body)} bytes)')
+    else:
+        raise SystemExit('Pass a URL or --file')
+
+    m = _CT_CHARSET_RE.search(content_type or '')
+    print(f"Content-Type:        {content_type} -> {m.group(1) if m else '-'}")
+    m = _META_CHARSET_RE.search(body[:META_SNIFF_BYTES])
+    print(f"<meta charset>:      {m.group(1).decode('ascii', 'replace') if m else '-'}")
+    bom = next((b.hex() for b in (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE) if body.startswith(b)), '-')
+    print(f'BOM:                 {bom}')
+    t0 = time.perf_counter()
+    text, encoding = decode_html(body, content_type, url)
+    print(f'decode_html:         {encoding} ({(time.perf_counter() - t0) * 1000:.1f} ms)')
+    print(f'sample:              {_sample(text)}')
+    if apparent and apparent.lower() != encoding:
+        print(f'apparent_encoding sample: {_sample(body.decode(apparent, errors="replace"))}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
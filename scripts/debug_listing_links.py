@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Show which links of a source's listing page are taken as articles, and why the rest are not.
+
+Uses the same `LinkClassifier` as the scraper (built from the source's
+config.yaml entry). The listing is fetched, read from a saved file (--file) or
+from the HTML archive (--archived).
+
+Options:
+  source        Source name from config.yaml (must have `url`)
+  --file        Saved listing page instead of fetching
+  --archived    Read the listing from the HTML archive
+  --rejected    Also print rejected links with the reason
+  --save        Save the listing and its article links as a test fixture
+                (tests/fixtures/listings/<source>.html/.json, `reviewed: false`)
+
+The classification cases and saved listings are tests: python -m pytest tests/test_links.py
+
+Example:
+  python scripts/debug_listing_links.py rmf24 --rejected
+  python scripts/debug_listing_links.py onet --file saved/onet.html
+  python scripts/debug_listing_links.py onet --save
+
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from clickbait_verifier.core.links import ACCEPTED, LinkClassifier
+
+FIXTURES_DIR = Path(__file__).parent.parent / 'tests' / 'fixtures' / 'listings'
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Debug listing link classification for a source')
+    p.add_argument('source', nargs='?', default=None, help='Source name from config.yaml')
+    p.add_argument('--file', default=None, help='Saved listing page')
+    p.add_argument('--archived', action='store_true', help='Read the listing from the HTML archive')
+    p.add_argument('--rejected', action='store_true', help='Also print rejected links')
+    p.add_argument('--save', action='store_true', help='Save the listing as a test fixture')
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.source:
+        raise SystemExit('Pass a source name')
+    with open('config.yaml', encoding='utf-8') as f:
+        cfg = yaml.safe_load(f)
+    source = next((s for s in cfg.get('sources', []) if s.get('name', '').lower() == args.source.lower()), None)
+    if not source or not source.get('url'):
+        raise SystemExit(f'Source {args.source} not found in config.yaml or has no url')
+
+    if args.file:
+        html = Path(args.file).read_bytes()
+    elif args.archived:
+        from clickbait_verifier.core.archive import get_archive
+        page = get_archive().get(source['url'])
+        if page is None:
+            raise SystemExit('Listing not in the HTML archive')
+        html = page.html
+    else:
+        from clickbait_verifier.scraper import fetch_html_with_method
+        html = fetch_html_with_method(source['url'], source.get('fetch_method', 'auto'))
+
+    classifier = LinkClassifier.for_source(source)
+    t0 = time.perf_counter()
+    hrefs = classifier.hrefs(html)
+    verdicts = [classifier.reason(h) for h in hrefs]
+    elapsed = (time.perf_counter() - t0) * 1000
+    articles = classifier.extract(html)
+    for url in articles:
+        print(url)
+    if args.rejected:
+        for (url, why), href in zip(verdicts, hrefs):
+            if why != ACCEPTED:
+                print(f'  - {why:<20} {url or href}')
+    if args.save:
+        FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+        name = source['name']
+        (FIXTURES_DIR / f'{name}.html').write_bytes(html if isinstance(html, bytes) else html.encode('utf-8'))
+        with open(FIXTURES_DIR / f'{name}.json', 'w', encoding='utf-8') as f:
+            json.dump({'url': source['url'], 'source': name, 'articles': articles, 'reviewed': False},
+                      f, ensure_ascii=False, indent=2)
+        print(f'Saved {FIXTURES_DIR / name}.html/.json; check the article list, then set "reviewed": true')
+    counts = Counter(why for _, why in verdicts)
+    print(f"{len(articles)} article links from {len(hrefs)} anchors in {elapsed:.1f} ms "
+          f"({', '.join(f'{k}: {v}' for k, v in counts.most_common())})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
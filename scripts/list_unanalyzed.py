@@ -2,7 +2,8 @@
 """List scraped articles that don't have a corresponding analysis file.
 
 Compares files in `reports/scraped/scraped_*.json` with `reports/analysis/analysis_*.json`.
-By default prints a short summary and a list of scraped files without analysis.
+By default prints a short summary and a list of scraped files without analysis
+(or whose analysis is flagged `needs_reanalysis` after the article was revised).
 
 Options:
   --scraped-dir    Path to scraped files (default: reports/scraped)
@@ -89,6 +90,9 @@ def main():
             continue
         if id_ not in analysis_map:
             unanalyzed.append({'file': str(p), 'id': id_, 'url': data.get('url')})
+        elif (load_json(analysis_map[id_]) or {}).get('needs_reanalysis'):
+            # article revised after its analysis (see clickbait_verifier/core/reanalysis.py)
+            unanalyzed.append({'file': str(p), 'id': id_, 'url': data.get('url'), 'reason': 'revised'})
         else:
             if args.check_contents:
                 a = load_json(analysis_map[id_])
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Load-test the article API (list and detail endpoints) against a local uvicorn.
+
+Opens N keep-alive connections with asyncio (stdlib only, no extra deps) and
+hammers each endpoint for a fixed duration, then reports requests/s and
+latency percentiles per endpoint.
+
+Options:
+  --url          Base URL of a running server (default: http://127.0.0.1:8000)
+  --spawn        Start `uvicorn api_server:app` on --url's port for the run
+  --concurrency  Number of parallel connections (default: 32)
+  --duration     Seconds per endpoint (default: 10)
+  --list-limit   `limit` query param for /api/articles (default: 50)
+
+Example:
+  python scripts/load_test_api.py --spawn --concurrency 64 --duration 15
+
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Load-test the article API list/detail endpoints')
+    p.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the API server')
+    p.add_argument('--spawn', action='store_true', help='Start a local uvicorn for the duration of the test')
+    p.add_argument('--concurrency', type=int, default=32, help='Parallel keep-alive connections')
+    p.add_argument('--duration', type=float, default=10.0, help='Seconds to run each endpoint')
+    p.add_argument('--list-limit', type=int, default=50, help='limit param for /api/articles')
+    return p.parse_args()
+
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive client (Content-Length bodies only)"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def get(self, path: str) -> Tuple[int, bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(f'GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n'.encode('ascii'))
+        await self.writer.drain()
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split()[1])
+        length = 0
+        close = False
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            name = name.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'connection' and value.strip().lower() == 'close':
+                close = True
+        body = await self.reader.readexactly(length) if length else b''
+        if close:
+            self.close()
+        return status, body
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+async def run_endpoint(host: str, port: int, paths: List[str], concurrency: int, duration: float):
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(n: int):
+        nonlocal errors
+        conn = Connection(host, port)
+        i = n
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += concurrency
+            t0 = time.perf_counter()
+            try:
+                status, _ = await conn.get(path)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                conn.close()
+                errors += 1
+                continue
+            if status != 200:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - t0)
+        conn.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def report(name: str, latencies: List[float], errors: int, elapsed: float):
+    lat = sorted(latencies)
+    ms = lambda v: f'{v * 1000:8.2f}'
+    print(f'{name}')
+    print(f'  requests: {len(lat)}  errors: {errors}  rps: {len(lat) / elapsed:.1f}')
+    print(f'  latency ms  p50 {ms(percentile(lat, 50))}  p90 {ms(percentile(lat, 90))}  '
+          f'p99 {ms(percentile(lat, 99))}  max {ms(lat[-1] if lat else 0.0)}')
+
+
+async def wait_for_server(host: str, port: int, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        conn = Connection(host, port)
+        try:
+            status, _ = await conn.get('/')
+            if status == 200:
+                return
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            conn.close()
+        await asyncio.sleep(0.25)
+    raise SystemExit(f'Server at {host}:{port} did not come up within {timeout:.0f}s')
+
+
+async def main_async(args):
+    parts = urlsplit(args.url)
+    host, port = parts.hostname or '127.0.0.1', parts.port or 80
+    await wait_for_server(host, port)
+
+    conn = Connection(host, port)
+    status, body = await conn.get('/api/articles?limit=200')
+    conn.close()
+    if status != 200:
+        raise SystemExit(f'/api/articles returned HTTP {status}')
+    ids = [a['id'] for a in json.loads(body).get('articles', [])]
+    if not ids:
+        raise SystemExit('No analyzed articles to request; run the analysis first')
+
+    print(f'Target {args.url}  concurrency {args.concurrency}  duration {args.duration:.0f}s per endpoint\n')
+    endpoints = [
+        (f'GET /api/articles?limit={args.list_limit}', [f'/api/articles?limit={args.list_limit}']),
+        (f'GET /api/articles/{{id}} ({len(ids)} ids)', [f'/api/articles/{i}' for i in ids]),
+    ]
+    for name, paths in endpoints:
+        latencies, errors, elapsed = await run_endpoint(host, port, paths, args.concurrency, args.duration)
+        report(name, latencies, errors, elapsed)
+
+
+def main():
+    args = parse_args()
+    server = None
+    if args.spawn:
+        port = urlsplit(args.url).port or 8000
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'api_server:app', '--port', str(port), '--log-level', 'warning'],
+            cwd=REPO_ROOT,
+        )
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Re-run content extraction over the raw HTML archive and diff against reports/scraped.
+
+Uses the current `extract_content_and_title` and extractor YAMLs, parses all
+archived pages on a process pool (no network), and reports which stored
+titles / contents / published dates would change. With --apply the new values
+are written back to the scraped files.
+
+Pages are only available if they were fetched with CLICKBAIT_ARCHIVE_HTML=1
+(see clickbait_verifier/core/archive.py).
+
+Options:
+  --source       Only pages of this source (case-insensitive)
+  --fields       Comma-separated fields to compare (default: title,content,published)
+  --workers      Worker processes (default: CPU count)
+  --limit        Check at most N pages
+  --show         Print up to N example diffs (default: 10)
+  --write-json   Write all diffs to a JSON file
+  --apply        Write non-empty new values back to reports/scraped
+
+Example:
+  python scripts/reextract.py --source rmf24 --show 5
+  python scripts/reextract.py --source rmf24 --apply
+
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from clickbait_verifier.reextract import REEXTRACT_FIELDS, apply_changes, reextract
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Re-extract archived pages and diff against scraped files')
+    p.add_argument('--source', default=None, help='Only pages of this source (case-insensitive)')
+    p.add_argument('--fields', default=','.join(REEXTRACT_FIELDS), help='Fields to compare')
+    p.add_argument('--reports-dir', default=None, help='Reports directory (default: repository reports/)')
+    p.add_argument('--workers', type=int, default=None, help='Worker processes')
+    p.add_argument('--limit', type=int, default=None, help='Check at most N pages')
+    p.add_argument('--show', type=int, default=10, help='Example diffs to print')
+    p.add_argument('--write-json', default=None, help='Write all diffs to this JSON file')
+    p.add_argument('--apply', action='store_true', help='Write changes back to the scraped files')
+    return p.parse_args()
+
+
+def _short(value, width=100):
+    text = ' '.join(str(value).split()) if value is not None else '∅'
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+
+def print_diff(diff):
+    print(f"- {diff['source']} {diff['id']} {diff['url']}")
+    for field, (old, new) in diff['changes'].items():
+        if field == 'content':
+            print(f"    content: {len(old or '')} -> {len(new or '')} chars")
+            print(f"      new: {_short(new)}")
+        else:
+            print(f"    {field}: {_short(old)} -> {_short(new)}")
+
+
+def main():
+    args = parse_args()
+    fields = [f.strip() for f in args.fields.split(',') if f.strip()]
+    unknown = set(fields) - set(REEXTRACT_FIELDS)
+    if unknown:
+        raise SystemExit(f"Unknown fields: {', '.join(sorted(unknown))} (allowed: {', '.join(REEXTRACT_FIELDS)})")
+
+    started = time.perf_counter()
+    diffs, errors, checked = reextract(args.reports_dir, fields, source=args.source,
+                                       workers=args.workers, limit=args.limit)
+    elapsed = time.perf_counter() - started
+
+    print(f'Checked {checked} archived pages in {elapsed:.1f}s; {len(diffs)} would change, {len(errors)} errors')
+    by_field = Counter(f for d in diffs for f in d['changes'])
+    by_source = Counter(d['source'] or 'unknown' for d in diffs)
+    emptied = sum(1 for d in diffs for _, new in d['changes'].values() if not new)
+    if by_field:
+        print('  by field:  ' + ', '.join(f'{f} {n}' for f, n in by_field.most_common()))
+        print('  by source: ' + ', '.join(f'{s} {n}' for s, n in by_source.most_common()))
+    if emptied:
+        print(f'  {emptied} field(s) would become empty (never applied)')
+    for diff in diffs[:args.show]:
+        print_diff(diff)
+    for error in errors[:5]:
+        print(f'[ERROR] {error}')
+
+    if args.write_json:
+        with open(args.write_json, 'w', encoding='utf-8') as f:
+            json.dump(diffs, f, ensure_ascii=False, indent=2)
+        print(f'Diffs written to {args.write_json}')
+    if args.apply:
+        print(f'Updated {apply_changes(diffs, args.reports_dir)} scraped files')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,8 +6,12 @@ Zachowuje tylko oryginalne pliki bez sufiksów.
 
 import os
 import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from clickbait_verifier.core.index import record_report_removed
+
 def remove_duplicate_analysis_files():
     """Usuwa pliki analysis z sufiksami _1, _2, _3 itp."""
     analysis_dir = Path("reports/analysis")
@@ -29,6 +33,7 @@ def remove_duplicate_analysis_files():
             # To jest duplikat (ma sufiks _1, _2, itp.)
             try:
                 file_path.unlink()
+                record_report_removed(file_path)
                 print(f"🗑️  Usunięto: {file_path.name}")
                 removed_count += 1
             except Exception as e:
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Re-check recently scraped articles for title/content edits (see clickbait_verifier/revisit.py).
+
+Due articles are re-fetched with conditional GETs; when the title or text
+changed, the scraped file gets a new revision and its analysis is flagged
+needs_reanalysis (still served until replaced), so the next --analyze-all run
+analyses it again.
+`python -m clickbait_verifier.main` runs the same pass after scraping when
+`revisit: true` is set in config.yaml.
+
+Options:
+  --limit          Visit at most N due articles
+  --max-age-hours  Only revisit articles fetched within this many hours (default: config.yaml / 72)
+  --due            Only show the schedule and the number of due articles
+  --reports-dir    Reports directory (default: repository reports/)
+
+Example:
+  python scripts/revisit.py --limit 50
+  python scripts/revisit.py --due
+
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from clickbait_verifier.revisit import RevisitJob
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Revisit recent articles and re-queue changed ones for analysis')
+    p.add_argument('--limit', type=int, default=None, help='Visit at most N due articles')
+    p.add_argument('--max-age-hours', type=float, default=None, help='Only articles fetched within this many hours')
+    p.add_argument('--due', action='store_true', help='Only show the schedule')
+    p.add_argument('--reports-dir', default=None, help='Reports directory')
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    job = RevisitJob(args.reports_dir, max_age_hours=args.max_age_hours, limit=args.limit)
+    if args.due:
+        due = job.prepare()
+        stats = job.schedule.stats()
+        print(f"Articles tracked: {stats['n']}  scheduled: {stats['scheduled']}  due now: {len(due)}  "
+              f"visits: {stats['visits']}  new revisions: {stats['revisions']}")
+        for result, n in sorted(stats['last_results'].items()):
+            print(f"  last visit {result}: {n}")
+        return 0
+    counts = job.run()
+    print('Results: ' + (', '.join(f'{k} {v}' for k, v in sorted(counts.items())) or 'nothing due'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
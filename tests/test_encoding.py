@@ -0,0 +1,120 @@
+"""Charset detection and decoding of fetched pages (core/fetcher.py)."""
+import codecs
+
+import pytest
+
+from clickbait_verifier.core import fetcher
+from clickbait_verifier.core.fetcher import decode_html, detect_encoding
+
+POLISH = 'Zażółć gęślą jaźń — Łódź, Kraków, Gdańsk'
+# encodable in the single-byte Polish codepages
+POLISH_8BIT = 'Zażółć gęślą jaźń, Łódź, Kraków, Gdańsk. Ministerstwo poinformowało, że świąteczne ceny wzrosną.'
+
+
+def page(text, head=''):
+    return f'<html><head>{head}</head><body>{text}</body></html>'
+
+
+@pytest.fixture(autouse=True)
+def no_host_cache(monkeypatch):
+    monkeypatch.setattr(fetcher, '_host_encodings', {})
+
+
+@pytest.mark.parametrize('bom, encoding', [
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+])
+def test_bom_wins_over_header(bom, encoding):
+    body = bom + page(POLISH).encode(encoding)
+    text, _ = decode_html(body, 'text/html; charset=windows-1250')
+    assert POLISH in text
+
+
+def test_header_charset():
+    body = page(POLISH_8BIT).encode('iso8859_2')
+    assert detect_encoding(body, 'text/html; charset=ISO-8859-2') == 'iso8859-2'
+    assert POLISH_8BIT in decode_html(body, 'text/html; charset=ISO-8859-2')[0]
+
+
+@pytest.mark.parametrize('head', [
+    '<meta charset="windows-1250">',
+    '<meta http-equiv="Content-Type" content="text/html; charset=windows-1250">',
+])
+def test_meta_charset(head):
+    body = page(POLISH_8BIT, head).encode('cp1250')
+    assert detect_encoding(body, 'text/html') == 'cp1250'
+    assert POLISH_8BIT in decode_html(body, None)[0]
+
+
+def test_header_charset_takes_precedence_over_meta():
+    body = page(POLISH, '<meta charset="windows-1250">').encode('utf-8')
+    assert detect_encoding(body, 'text/html; charset=utf-8') == 'utf-8'
+
+
+def test_undeclared_utf8():
+    body = page(POLISH).encode('utf-8')
+    assert detect_encoding(body, 'text/html') == 'utf-8'
+
+
+def test_invalid_utf8_declared_as_utf8_falls_through():
+    body = page(' '.join([POLISH_8BIT] * 20)).encode('cp1250')
+    text, encoding = decode_html(body, 'text/html; charset=utf-8')
+    assert encoding == 'cp1250'
+    assert POLISH_8BIT in text
+
+
+def test_declared_utf8_with_stray_byte():
+    body = page(' '.join(['Zażółć gęślą jaźń'] * 200)).encode('utf-8').replace(b'</body>', b'\xa0</body>')
+    text, encoding = decode_html(body, 'text/html; charset=utf-8')
+    assert encoding == 'utf-8'
+    assert 'Zażółć gęślą jaźń' in text
+    assert text.count('\ufffd') == 1
+
+
+def test_declared_utf8_meta_with_stray_byte():
+    body = page('\xa0'.join([POLISH] * 50), '<meta charset="utf-8">').encode('utf-8').replace(b'\xc2\xa0', b'\xa0', 1)
+    text, encoding = decode_html(body, 'text/html')
+    assert encoding == 'utf-8'
+    assert POLISH in text
+
+
+def test_invalid_utf8_undeclared_is_detected():
+    body = page(' '.join([POLISH_8BIT] * 40)).encode('cp1250')
+    text, encoding = decode_html(body, 'text/html', 'http://example.invalid/a')
+    assert encoding == 'cp1250'
+    assert POLISH_8BIT in text
+
+
+def test_latin1_declaration_on_utf8_body():
+    body = page(POLISH).encode('utf-8')
+    text, encoding = decode_html(body, 'text/html; charset=ISO-8859-1')
+    assert encoding == 'utf-8'
+    assert POLISH in text
+
+
+@pytest.mark.parametrize('label', ['ISO-8859-1', 'latin1', 'windows-1252'])
+def test_latin1_declaration_on_cp1250_body(label):
+    body = page(POLISH_8BIT).encode('cp1250')
+    text, encoding = decode_html(body, f'text/html; charset={label}')
+    assert encoding == 'cp1250'
+    assert POLISH_8BIT in text
+
+
+def test_latin1_declaration_on_iso8859_2_body():
+    body = page(POLISH_8BIT).encode('iso8859_2')
+    text, encoding = decode_html(body, 'text/html; charset=ISO-8859-1')
+    assert encoding == 'iso8859-2'
+    assert POLISH_8BIT in text
+
+
+def test_latin1_meta_declaration_on_cp1250_body():
+    body = page(POLISH_8BIT, '<meta charset="iso-8859-1">').encode('cp1250')
+    assert POLISH_8BIT in decode_html(body, 'text/html')[0]
+
+
+def test_latin1_declaration_without_detector(monkeypatch):
+    monkeypatch.setattr(fetcher, '_detect_statistically', lambda sample, candidates=None: None)
+    body = page(POLISH_8BIT).encode('cp1250')
+    assert detect_encoding(body, 'text/html; charset=ISO-8859-1') == fetcher.FALLBACK_ENCODING
+    body = page(POLISH_8BIT).encode('iso8859_2')
+    assert detect_encoding(body, 'text/html; charset=ISO-8859-1') == 'iso8859-2'
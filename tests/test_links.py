@@ -0,0 +1,76 @@
+"""Article-link classification of listing pages (core/links.py)."""
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from clickbait_verifier.core.links import ACCEPTED, LinkClassifier
+
+ROOT = Path(__file__).parent.parent
+LISTINGS = Path(__file__).parent / 'fixtures' / 'listings'
+
+RMF = {'url': 'https://www.rmf24.pl/fakty,nPack,1', 'article_url_pattern': 'news-.*,nId,[0-9]+'}
+ONET = {'url': 'https://wiadomosci.onet.pl/',
+        'article_url_pattern': '/[a-z0-9-]+/[a-z0-9-]+/[0-9a-z]{6,8}(/|$)'}
+
+
+def listing_sources():
+    with open(ROOT / 'config.yaml', encoding='utf-8') as f:
+        cfg = yaml.safe_load(f)
+    return [s for s in cfg.get('sources', []) if s.get('scrape_listing') and s.get('url')]
+
+
+@pytest.mark.parametrize('source, href, expected', [
+    (RMF, '/fakty/polska/news-tytul,nId,7412345', 'https://www.rmf24.pl/fakty/polska/news-tytul,nId,7412345'),
+    (RMF, '/fakty/news-x,nId,1#comments', 'https://www.rmf24.pl/fakty/news-x,nId,1'),
+    (RMF, '/sport/pilka,nId,7412346', 'https://www.rmf24.pl/sport/pilka,nId,7412346'),
+    (RMF, '//www.rmf24.pl/fakty/news-y,nId,9', 'https://www.rmf24.pl/fakty/news-y,nId,9'),
+    (ONET, '/kraj/jakis-tytul/61jnnym', 'https://wiadomosci.onet.pl/kraj/jakis-tytul/61jnnym'),
+])
+def test_article_links(source, href, expected):
+    assert LinkClassifier(source['url'], source['article_url_pattern']).classify(href) == expected
+
+
+@pytest.mark.parametrize('source, href, reason', [
+    (RMF, '/fakty,nPack,2', 'pagination'),
+    (RMF, '/galeria/news-zdjecia,nId,7', 'blacklisted section'),
+    (RMF, '/tylko-w-rmf24', 'blacklisted section'),
+    (RMF, 'https://www.interia.pl/news-x,nId,5', 'other host'),
+    (RMF, 'https://www.rmf24.pl/fakty,nPack,1', 'listing itself'),
+    (RMF, 'javascript:void(0)', 'not http'),
+    (ONET, '/kielce', 'no pattern match'),
+    (ONET, '/autorzy/jan-kowalski', 'no pattern match'),
+    (ONET, '/video/kraj/abc/61jnnym', 'blacklisted section'),
+])
+def test_rejected_links(source, href, reason):
+    url, why = LinkClassifier(source['url'], source['article_url_pattern']).reason(href)
+    assert why == reason != ACCEPTED
+
+
+def test_extract_deduplicates_in_page_order():
+    html = b"""<html><head><meta charset="utf-8"></head><body>
+<a href="/fakty/polska/news-a,nId,1">A</a><a href="/fakty/polska/news-a,nId,1#top">A again</a>
+<a href="/fakty,nPack,2">next</a><a href="/galeria/news-g,nId,2">gallery</a>
+<a href="/fakty/news-b,nId,3">B</a><a>no href</a></body></html>"""
+    assert LinkClassifier(RMF['url'], RMF['article_url_pattern']).extract(html) == [
+        'https://www.rmf24.pl/fakty/polska/news-a,nId,1', 'https://www.rmf24.pl/fakty/news-b,nId,3']
+
+
+@pytest.mark.parametrize('html', [b'', '   ', '<?xml version="1.0" encoding="utf-8"?><html><body></body></html>'])
+def test_extract_empty_pages(html):
+    assert LinkClassifier(RMF['url'], RMF['article_url_pattern']).extract(html) == []
+
+
+@pytest.mark.parametrize('source', listing_sources(), ids=lambda s: s['name'])
+def test_saved_listing(source):
+    """Every listing source in config.yaml has a saved listing page with its expected article links."""
+    html_path = LISTINGS / f"{source['name']}.html"
+    expected_path = LISTINGS / f"{source['name']}.json"
+    assert html_path.exists() and expected_path.exists(), \
+        f"save one with: python scripts/debug_listing_links.py {source['name']} --save"
+    expected = json.loads(expected_path.read_text(encoding='utf-8'))
+    assert expected['reviewed'], f'{expected_path.name}: check the article list by hand, then set reviewed'
+    assert expected['url'] == source['url']
+    classifier = LinkClassifier(source['url'], source.get('article_url_pattern'))
+    assert classifier.extract(html_path.read_bytes()) == expected['articles']
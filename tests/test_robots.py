@@ -0,0 +1,34 @@
+"""robots.txt group selection and path matching (core/robots.py)."""
+import pytest
+
+from clickbait_verifier.core.robots import parse_robots
+
+
+@pytest.mark.parametrize('agent, applies', [
+    ('clickbait-verifier', True),
+    ('Clickbait-Verifier', True),
+    ('clickbait-verifier/2.0', True),
+    ('clickbait', True),
+    ('bot', False),
+    ('verifier', False),
+    ('clickbait-verifier-extra', False),
+])
+def test_group_selection(agent, applies):
+    rules = parse_robots(f'User-agent: {agent}\nDisallow: /own\n\nUser-agent: *\nDisallow: /all\n')
+    assert rules.allows('/own') is not applies
+    assert rules.allows('/all') is applies
+
+
+def test_longest_match_wins_allow_on_tie():
+    rules = parse_robots('User-agent: *\nDisallow: /news\nAllow: /news/public\nAllow: /x\nDisallow: /x\n')
+    assert not rules.allows('/news/1')
+    assert rules.allows('/news/public/1')
+    assert rules.allows('/x')
+
+
+def test_wildcards_and_end_anchor():
+    rules = parse_robots('User-agent: *\nDisallow: /*.pdf$\nDisallow: /*?print=\n')
+    assert not rules.allows('/a/b.pdf')
+    assert rules.allows('/a/b.pdf?x=1')
+    assert not rules.allows('/article?print=1')
+    assert rules.allows('/robots.txt')